@@ -1,6 +1,12 @@
 """
 JWT creation, verification, and password hashing utilities.
+
+bcrypt is deliberately slow (~100 ms+), so request handlers use the *_async
+variants, which run it on a dedicated thread pool capped at
+BCRYPT_CONCURRENCY workers instead of blocking the event loop.
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -11,6 +17,10 @@ from app.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+_bcrypt_pool = ThreadPoolExecutor(
+    max_workers=max(settings.BCRYPT_CONCURRENCY, 1), thread_name_prefix="bcrypt"
+)
+
 
 def hash_password(plain_password: str) -> str:
     return pwd_context.hash(plain_password)
@@ -20,7 +30,19 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def hash_password_async(plain_password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_bcrypt_pool, hash_password, plain_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(
+        _bcrypt_pool, verify_password, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+    if not settings.SECRET_KEY:
+        raise RuntimeError("SECRET_KEY is not configured.")
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
         expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
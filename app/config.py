@@ -4,6 +4,7 @@ Reads from environment variables (or .env file via python-dotenv if installed).
 """
 import os
 from functools import lru_cache
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -14,8 +15,109 @@ class Settings(BaseSettings):
 
     # ── Demo / fallback mode ───────────────────────────────────
     DEMO_MODE: bool = False  # set to True to skip Gemini entirely
+    JD_PARSE_DELAY: float = 0.4       # UI pacing before each JD parse (s)
+    RESUME_PARSE_DELAY: float = 1.6   # UI pacing before each resume parse (s)
+
+    # ── LLM backend ────────────────────────────────────────────
+    LLM_BACKEND: str = "gemini"        # "gemini" | "fake" (load testing, no API calls) | "mock" (= DEMO_MODE)
+    LLM_CASSETTE: str = ""             # record/replay file around the backend; empty → off
+    LLM_CASSETTE_MODE: str = "replay"  # record | replay | auto (replay hits, record misses)
+    FAKE_LLM_URL: str = ""             # fake over HTTP (python -m app.services.fake_llm); empty → in-process
+    FAKE_LLM_LATENCY_MS: float = 800   # median (lognormal) / mean (fixed, uniform)
+    FAKE_LLM_LATENCY_P99_MS: float = 2500
+    FAKE_LLM_LATENCY_DIST: str = "lognormal"   # fixed | uniform | lognormal
+    FAKE_LLM_429_RATE: float = 0.0
+    FAKE_LLM_MALFORMED_RATE: float = 0.0
+    FAKE_LLM_TOKENS_PER_SECOND: float = 0.0    # 0 → no per-token delay
+    FAKE_LLM_SEED: Optional[int] = None
     MAX_UPLOAD_SIZE_MB: int = 10
 
+    # ── LLM deadlines / hedging ────────────────────────────────
+    LLM_DEADLINE_JD_SECONDS: float = 30       # per call, incl. a hedge; 0 → wait indefinitely
+    LLM_DEADLINE_RESUME_SECONDS: float = 30
+    LLM_DEADLINE_EVAL_SECONDS: float = 20
+    LLM_HEDGE_ENABLED: bool = False           # duplicate calls slower than the label's rolling p95
+    LLM_HEDGE_MAX_RATIO: float = 0.05         # hedges per call, at most (extra quota use)
+    LLM_HEDGE_MIN_SAMPLES: int = 20           # latencies needed before hedging starts
+    LLM_CALL_THREADS: int = 32                # threads model calls run on
+
+    # ── Gemini circuit breaker ─────────────────────────────────
+    LLM_BREAKER_THRESHOLD: int = 3            # consecutive 429 / auth failures that open it
+    LLM_BREAKER_RESET_SECONDS: float = 60     # open this long, then one probe call
+    LLM_BREAKER_POLICY: Literal["fail", "local", "mock"] = "fail"   # while open: 503 | keyword scoring | mock data
+
+    # ── LLM scheduling ─────────────────────────────────────────
+    LLM_MAX_CONCURRENCY: int = 16             # model calls in flight process-wide; 0 → unlimited
+    LLM_INTERACTIVE_MAX_RESUMES: int = 10     # batches up to this size use the priority lane
+    LLM_BULK_EVERY: int = 5                   # while both lanes wait, every Nth slot goes to bulk; 0 → never
+
+    # ── Token accounting ───────────────────────────────────────
+    TOKEN_BUDGET_PER_REQUEST: int = 0     # 0 → unlimited; ?token_budget= overrides per request
+    TOKEN_BUDGET_MODE: Literal["local", "stop"] = "local"   # once spent: heuristic scoring | skip remaining resumes
+    TOKEN_USAGE_DAYS: int = 30            # daily roll-ups kept in memory
+    TOKEN_USAGE_SCOPES: int = 10000       # per-session roll-ups kept (least recently used dropped first)
+
+    # ── Database / auth (recruiter accounts) ───────────────────
+    DATABASE_URL: str = "sqlite:///./recruiter.db"
+    ASYNC_DATABASE_URL: str = ""              # empty → DATABASE_URL with asyncpg/aiosqlite
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30               # seconds to wait for a free connection
+    SECRET_KEY: str = ""                      # required to issue tokens
+    ALGORITHM: str = "HS256"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    BCRYPT_CONCURRENCY: int = 4               # hashes/verifies running at once
+    AUTH_CACHE_TTL_SECONDS: float = 30        # token subject → recruiter snapshot
+
+    # ── Multi-JD matching matrix ───────────────────────────────
+    MATRIX_MAX_JOBS: int = 10             # JDs per /analyze/matrix request
+    MATRIX_CONCURRENCY: int = 8           # parse/evaluate calls in flight at once
+
+    # ── Talent pool ────────────────────────────────────────────
+    TALENT_POOL_PATH: str = "talent_pool.jsonl"  # empty → in-memory only
+
+    # ── Analysis job queue / workers ───────────────────────────
+    JOB_QUEUE_PATH: str = "jobs.db"       # SQLite queue shared with `python -m app.worker`; empty → /jobs disabled
+    WORKER_PROCESSES: int = 2             # worker processes `python -m app.worker` starts
+    JOB_POLL_SECONDS: float = 0.5         # idle worker's wait between polls of the queue
+    JOB_LEASE_SECONDS: float = 300        # a job not heard from this long is handed to another worker
+    JOB_MAX_ATTEMPTS: int = 3             # claims per job before it is marked failed
+    JOB_RETENTION_SECONDS: float = 86400  # finished jobs (and their results) kept this long; 0 → forever
+
+    # ── Outbound e-mail (finalize) ─────────────────────────────
+    EMAIL_SENDING_ENABLED: bool = False   # False → finalize only simulates
+    EMAIL_FROM: str = "hiring@example.com"
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 8025                 # e.g. `python -m aiosmtpd -n -l localhost:8025`
+    SMTP_USERNAME: str = ""
+    SMTP_PASSWORD: str = ""
+    SMTP_USE_TLS: bool = False
+    SMTP_START_TLS: bool = False
+    EMAIL_POOL_SIZE: int = 4              # pooled SMTP connections / sender tasks
+    EMAIL_BATCH_SIZE: int = 50            # messages per connection checkout
+    EMAIL_RATE_PER_SECOND: float = 20
+    EMAIL_QUEUE_MAX: int = 10000          # backpressure limit
+    EMAIL_MAX_RETRIES: int = 3
+    EMAIL_STATUS_RETENTION_SECONDS: float = 86400   # finished dispatch statuses kept this long (idempotency window); 0 → forever
+
+    # ── Responses ──────────────────────────────────────────────
+    COMPRESSION_MIN_BYTES: int = 1024   # smaller bodies are sent uncompressed
+    BROTLI_QUALITY: int = 4             # 0-11; used when the client accepts br
+
+    # ── Startup ────────────────────────────────────────────────
+    WARM_UP: Literal["background", "blocking", "off"] = "background"   # preload pdfplumber + Gemini client
+
+    # ── Tracing ────────────────────────────────────────────────
+    TRACING_ENABLED: bool = False
+    TRACE_FILE: str = "traces.jsonl"    # OTLP/JSON, one trace per line; empty → in-memory exporter
+    TRACE_MEMORY_SPANS: int = 10000     # in-memory exporter keeps only the most recent spans
+
+    # ── Profiling ──────────────────────────────────────────────
+    PROFILING_ENABLED: bool = False     # then `X-Profile: 1` / `?profile=1` profiles one request
+    PROFILE_DIR: str = "profiles"       # <id>.folded collapsed stacks (flamegraph.pl / speedscope)
+    PROFILE_INTERVAL_MS: float = 5      # sampling interval
+    PROFILE_MAX_SECONDS: float = 120    # sampler stops after this even if the request hasn't
+
     # ── App meta ───────────────────────────────────────────────
     APP_TITLE: str = "Recruiter AI"
     APP_VERSION: str = "1.0.0"
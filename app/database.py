@@ -1,17 +1,115 @@
 """
 SQLAlchemy database engine and session factory.
+
+Two paths share one DATABASE_URL:
+  • sync   – engine / SessionLocal / get_db (unchanged)
+  • async  – get_async_engine() / get_async_db, using asyncpg for Postgres and
+             aiosqlite for SQLite (override with ASYNC_DATABASE_URL)
+
+Both are pooled with DB_POOL_SIZE / DB_MAX_OVERFLOW / DB_POOL_TIMEOUT;
+pool_stats() reports usage for each engine, and /metrics exports it.
 """
-from sqlalchemy import create_engine
+import threading
+import time
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 from app.config import settings
+from app.metrics import REGISTRY
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite", "mysql": "aiomysql"}
+
+
+def async_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto the matching async driver."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases.")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def _pool_options(url: str) -> dict:
+    options = {"pool_pre_ping": True}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if parsed.database in (None, "", ":memory:"):
+            return options   # single shared connection, no queue pool to size
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
+
+class PoolMetrics:
+    """Checkout counters and wait/hold times, fed by pool events."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.total_hold_seconds = 0.0
+        self.max_hold_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def attach(self, engine: Engine) -> None:
+        @event.listens_for(engine, "connect")
+        def _connect(dbapi_conn, record):
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(engine, "checkout")
+        def _checkout(dbapi_conn, record, proxy):
+            record.info["checked_out_at"] = time.perf_counter()
+            with self._lock:
+                self.checkouts += 1
+
+        @event.listens_for(engine, "checkin")
+        def _checkin(dbapi_conn, record):
+            started = record.info.pop("checked_out_at", None)
+            if started is None:
+                return
+            held = time.perf_counter() - started
+            with self._lock:
+                self.total_hold_seconds += held
+                self.max_hold_seconds = max(self.max_hold_seconds, held)
+
+        @event.listens_for(engine, "invalidate")
+        def _invalidate(dbapi_conn, record, exc):
+            with self._lock:
+                self.invalidations += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "avg_hold_ms": round(1000 * self.total_hold_seconds / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_hold_ms": round(1000 * self.max_hold_seconds, 3),
+            }
+
+
+def _pool_snapshot(engine: Engine, metrics: PoolMetrics) -> dict:
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__, **metrics.as_dict()}
+    for name in POOL_STATES:
+        if hasattr(pool, name):
+            stats[name] = getattr(pool, name)()
+    return stats
+
+
+# ── Sync ──────────────────────────────────────────────────────────────────────
+engine = create_engine(settings.DATABASE_URL, **_pool_options(settings.DATABASE_URL))
+sync_pool_metrics = PoolMetrics()
+sync_pool_metrics.attach(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -27,3 +125,57 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ── Async ─────────────────────────────────────────────────────────────────────
+async_pool_metrics = PoolMetrics()
+
+
+@lru_cache
+def get_async_engine():
+    """Created on first use so the sync path works without an async driver installed."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = settings.ASYNC_DATABASE_URL or async_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(url, **_pool_options(url))
+    async_pool_metrics.attach(async_engine.sync_engine)
+    return async_engine
+
+
+@lru_cache
+def get_async_sessionmaker():
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    return async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncIterator:
+    """FastAPI dependency – yields an AsyncSession and guarantees close."""
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+def pool_stats() -> Dict[str, dict]:
+    """Current usage of each engine's connection pool (async only once created)."""
+    stats = {"sync": _pool_snapshot(engine, sync_pool_metrics)}
+    if get_async_engine.cache_info().currsize:
+        stats["async"] = _pool_snapshot(get_async_engine().sync_engine, async_pool_metrics)
+    return stats
+
+
+POOL_STATES = ("size", "checkedin", "checkedout", "overflow")
+
+
+def _pool_gauge() -> Dict[Tuple[str, str], int]:
+    return {(name, state): stats[state]
+            for name, stats in pool_stats().items() for state in POOL_STATES if state in stats}
+
+
+REGISTRY.gauge(
+    "recruiter_db_pool_connections", "Connection pool size and connections checked in / out / in overflow.",
+    _pool_gauge, ("engine", "state"),
+)
+REGISTRY.gauge(
+    "recruiter_db_pool_checkouts_total", "Connections checked out of each engine's pool.",
+    lambda: {name: stats["checkouts"] for name, stats in pool_stats().items()}, ("engine",), kind="counter",
+)
@@ -1,21 +1,89 @@
 """
 FastAPI dependency injection helpers.
 """
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_async_db
 from app.auth import decode_access_token
 from app import models
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 
-def get_current_recruiter(
+@dataclass(frozen=True)
+class RecruiterSnapshot:
+    """Detached, read-only copy of the Recruiter columns protected routes need."""
+    id: int
+    email: str
+    full_name: Optional[str]
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, recruiter: models.Recruiter) -> "RecruiterSnapshot":
+        return cls(recruiter.id, recruiter.email, recruiter.full_name, recruiter.created_at)
+
+
+class RecruiterCache:
+    """
+    Short-TTL map of token subject (recruiter id) → RecruiterSnapshot, so an
+    authenticated request needs no DB round-trip.  Entries are dropped when
+    the ORM updates or deletes that recruiter (see listeners below); the TTL
+    bounds staleness for changes made outside the ORM unit of work.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[int, Tuple[float, RecruiterSnapshot]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, recruiter_id: int) -> Optional[RecruiterSnapshot]:
+        entry = self._entries.get(recruiter_id)
+        if entry is None:
+            return None
+        expires, snapshot = entry
+        if expires < time.monotonic():
+            self.invalidate(recruiter_id)
+            return None
+        return snapshot
+
+    def put(self, snapshot: RecruiterSnapshot) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[snapshot.id] = (time.monotonic() + self.ttl, snapshot)
+
+    def invalidate(self, recruiter_id: int) -> None:
+        with self._lock:
+            self._entries.pop(recruiter_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+recruiter_cache = RecruiterCache(settings.AUTH_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(models.Recruiter, "after_update")
+@event.listens_for(models.Recruiter, "after_delete")
+def _invalidate_recruiter(mapper, connection, target: models.Recruiter) -> None:
+    recruiter_cache.invalidate(target.id)
+
+
+async def get_current_recruiter(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> models.Recruiter:
+    db: AsyncSession = Depends(get_async_db),
+) -> RecruiterSnapshot:
     credentials_exc = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -25,12 +93,22 @@ def get_current_recruiter(
     if payload is None:
         raise credentials_exc
 
-    recruiter_id: int = payload.get("sub")
+    recruiter_id = payload.get("sub")
     if recruiter_id is None:
         raise credentials_exc
+    try:
+        recruiter_id = int(recruiter_id)
+    except (TypeError, ValueError):
+        raise credentials_exc
+
+    snapshot = recruiter_cache.get(recruiter_id)
+    if snapshot is not None:
+        return snapshot
 
-    recruiter = db.query(models.Recruiter).filter(models.Recruiter.id == int(recruiter_id)).first()
+    recruiter = await db.get(models.Recruiter, recruiter_id)
     if recruiter is None:
         raise credentials_exc
 
-    return recruiter
+    snapshot = RecruiterSnapshot.from_model(recruiter)
+    recruiter_cache.put(snapshot)
+    return snapshot
@@ -0,0 +1,38 @@
+"""
+Deferred imports for heavy optional-at-startup SDKs (google.generativeai,
+pdfplumber).  `mod = LazyModule("pdfplumber")` behaves like the module but
+imports it on first attribute access, so cold starts and /health probes
+don't pay for it.  Attributes can still be patched in tests
+(`patch("app.services.pdf_service.pdfplumber.open")`).
+"""
+import importlib
+import threading
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule:
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def load(self) -> ModuleType:
+        module: Optional[ModuleType] = self.__dict__["_module"]
+        if module is None:
+            with self._lock:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = self.__dict__["_module"] = importlib.import_module(self._name)
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
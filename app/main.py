@@ -2,30 +2,70 @@
 Recruiter AI – DB-free MVP backend.
 
 Architecture:
-  • No database, no auth, no email.
-  • Jobs and results are stored in a per-process in-memory dict (SESSION_STORE).
+  • No database, no auth. E-mail is simulated unless EMAIL_SENDING_ENABLED.
+  • Jobs and results are stored in a per-process in-memory dict (SESSION_STORE)
+    of SessionData objects with columnar candidate tables.
   • Each upload creates a session_id (uuid). The frontend passes that back
     to retrieve results and finalize.
 
 Routes:
   POST /analyze          – Upload JD + resumes, run Gemini, return ranked results
+  POST /analyze/matrix   – Evaluate one resume pool against several JDs at once
+  POST /jobs/analyze     – Queue an /analyze batch for the worker processes (app.worker)
+  GET  /jobs/{id}        – Queued job status; imports the finished session
   POST /override         – Update a candidate's decision in the session
-  POST /finalize/{sid}   – Simulate email sending, return preview data
+  POST /finalize/{sid}   – Simulate email sending, return first page of previews
+  GET  /dispatch/{id}    – Delivery status of a real (non-simulated) finalize
+  GET  /session/{sid}/email-previews – Page through Interview/Hold/Reject letters
+  PUT  /session/{sid}/templates – Per-job e-mail subject/body templates
   GET  /session/{sid}    – Retrieve stored session results
-  GET  /health           – Health check
+  GET  /session/{sid}/export – Stream candidates as CSV / NDJSON / Parquet
+  POST /session/{sid}/resumes – Append resumes to an existing session
+  POST /session/{sid}/rerank – Re-score a session against edited criteria / new JD
+  POST /talent-pool/match – Rank previously parsed candidates against JD criteria
+  GET  /health           – Health check (+ Gemini circuit breaker, LLM scheduler queues)
+  GET  /metrics          – Prometheus metrics (stage / LLM latency, retries, cache, store size)
+  GET  /usage/tokens     – LLM token usage per label / day (?session_id= for one session)
 """
 
+import asyncio
+import json
 import logging
+import math
+import threading
+import time
 import uuid
-from typing import Dict, List, Optional
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile, status
+from fastapi import FastAPI, File, Form, HTTPException, Query, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import ValidationError
 
 from app.config import settings
+from app.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY
+from app.profiling import ProfilingMiddleware
+from app.tracing import (
+    FileExporter, InMemoryExporter, TracingMiddleware, configure as configure_tracing, current_span, span,
+)
+from app.responses import CompressionMiddleware, ORJSONResponse
+from app.schemas.job import JobCriteria
+from app.services import llm_service, pdf_service
+from app.services.analysis import build_candidate, default_decision, parse_criteria, resume_step, score_resume
 from app.services.pdf_service import read_upload_file, extract_text
 from app.services.llm_service import parse_jd, parse_resume, evaluate_candidate, QuotaError
+from app.services.llm_scheduler import SCHEDULER, is_interactive, llm_scope
+from app.services.email_dispatch import (
+    EmailDispatcher, OutboundEmail, QueueFullError, SMTPPool, idempotency_key,
+)
+from app.services.email_templates import TemplateError, templates_for
+from app.services.export import FORMATS, ExportError, export_stream, parse_columns
+from app.services.job_queue import DONE, FAILED, QUEUED, Job, JobQueue
+from app.services.session_store import DECISIONS, VERDICTS, CandidateTable, SessionData
+from app.services.talent_pool import TalentPool
+from app.services.token_usage import LEDGER, BudgetExhausted, TokenBudget, token_scope
 
 logging.basicConfig(
     level=logging.INFO,
@@ -34,15 +74,136 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # ── In-memory session store ────────────────────────────────────────────────────
-# { session_id: { "job_title": str, "criteria": dict, "candidates": [...] } }
-SESSION_STORE: Dict[str, dict] = {}
+# { session_id: SessionData(job_title, criteria, candidates=CandidateTable) }
+SESSION_STORE: Dict[str, SessionData] = {}
+
+# ── Cross-session talent pool (survives sessions, persisted to disk) ──────────
+TALENT_POOL = TalentPool(settings.TALENT_POOL_PATH)
+
+# ── Analysis job queue (run by `python -m app.worker` processes) ──────────────
+JOB_QUEUE: Optional[JobQueue] = (
+    JobQueue(settings.JOB_QUEUE_PATH, settings.JOB_LEASE_SECONDS, settings.JOB_MAX_ATTEMPTS,
+             settings.JOB_RETENTION_SECONDS)
+    if settings.JOB_QUEUE_PATH else None
+)
+_JOB_IMPORT_LOCK = threading.Lock()
+
+# ── Outbound e-mail queue (only used when EMAIL_SENDING_ENABLED) ──────────────
+EMAIL_DISPATCHER = EmailDispatcher(
+    SMTPPool(
+        settings.SMTP_HOST, settings.SMTP_PORT, size=settings.EMAIL_POOL_SIZE,
+        username=settings.SMTP_USERNAME, password=settings.SMTP_PASSWORD,
+        use_tls=settings.SMTP_USE_TLS, start_tls=settings.SMTP_START_TLS,
+    ),
+    sender=settings.EMAIL_FROM,
+    batch_size=settings.EMAIL_BATCH_SIZE,
+    rate_per_second=settings.EMAIL_RATE_PER_SECOND,
+    max_queue=settings.EMAIL_QUEUE_MAX,
+    max_retries=settings.EMAIL_MAX_RETRIES,
+    retention_seconds=settings.EMAIL_STATUS_RETENTION_SECONDS,
+)
+
+# ── Metrics gauges (evaluated on scrape) ──────────────────────────────────────
+REGISTRY.gauge("recruiter_sessions", "Sessions held in SESSION_STORE.", lambda: len(SESSION_STORE))
+REGISTRY.gauge(
+    "recruiter_session_candidates", "Candidate rows across all sessions.",
+    lambda: sum(len(s.candidates) for s in list(SESSION_STORE.values())),
+)
+REGISTRY.gauge("recruiter_talent_pool_size", "Candidates in the talent pool.", lambda: len(TALENT_POOL))
+REGISTRY.gauge("recruiter_email_queue_pending", "E-mails queued for dispatch.",
+               lambda: EMAIL_DISPATCHER.stats()["pending"])
+REGISTRY.gauge("recruiter_jobs", "Analysis jobs in the worker queue by status.",
+               lambda: JOB_QUEUE.counts() if JOB_QUEUE is not None else {}, ("status",))
+
+QUOTA_DETAIL = "⚠️ Gemini API quota exceeded. Your free-tier limit has been reached. Please wait for it to reset (resets daily at midnight Pacific Time) or set DEMO_MODE=true in your .env to use mock results."
+
+# Dropped from candidate rows in ?compact=true responses unless ?include= asks for them
+COMPACT_DROPPED = ("reasoning", "skills")
+
+
+def _excluded_fields(compact: bool, include: Optional[str]) -> frozenset:
+    if not compact:
+        return frozenset()
+    wanted = {f.strip() for f in (include or "").split(",")}
+    return frozenset(f for f in COMPACT_DROPPED if f not in wanted)
+
+
+async def _process_resumes(resumes: List[UploadFile], criteria: dict) -> Tuple[List[dict], List[dict]]:
+    """
+    Extract, parse and evaluate each upload against criteria; per-file
+    failures and budget skips are handled by analysis.resume_step, a quota
+    error aborts the batch.  The blocking work runs on the threadpool, so
+    waiting for a model-call slot never stalls the event loop.
+    """
+    candidates = []
+    errors = []
+    try:
+        for n, upload in enumerate(resumes):
+            with resume_step(n, [u.filename for u in resumes[n:]], errors) as step:
+                content = await read_upload_file(upload)
+                candidates.append(await run_in_threadpool(score_resume, content, upload.filename, criteria))
+            if step.stop:
+                break
+    except QuotaError:
+        raise HTTPException(status_code=503, detail=QUOTA_DETAIL)
+    return candidates, errors
+
+
+def _token_budget(limit: Optional[int]) -> Optional[TokenBudget]:
+    """Budget from ?token_budget= (else TOKEN_BUDGET_PER_REQUEST); 0 → unlimited."""
+    limit = settings.TOKEN_BUDGET_PER_REQUEST if limit is None else limit
+    return TokenBudget(limit, settings.TOKEN_BUDGET_MODE) if limit > 0 else None
+
+
+def _token_report(key: str, budget: Optional[TokenBudget]) -> dict:
+    report = {"token_usage": LEDGER.scope(key)["total"]}
+    if budget is not None:
+        report["token_budget"] = budget.as_dict()
+    return report
+
+
+def _add_to_pool(candidates: List[dict], session_id: str, job_title: str) -> None:
+    """Blocking (appends to the pool's log): async routes run it on the threadpool."""
+    try:
+        TALENT_POOL.add_many(candidates, session_id=session_id, job_title=job_title)
+    except OSError as exc:
+        logger.error(f"talent pool write failed: {exc}")
 
 
 # ── App ────────────────────────────────────────────────────────────────────────
+WARM = {"done": False, "seconds": None}
+
+
+def _warm_up() -> None:
+    """Import pdfplumber / the Gemini SDK and build the model client before the first upload."""
+    start = time.perf_counter()
+    for name, hook in (("pdf", pdf_service.warm_up), ("llm", llm_service.warm_up)):
+        try:
+            hook()
+        except Exception as exc:   # the first real request retries (and falls back) as usual
+            logger.warning(f"warm-up {name} failed: {exc}")
+    WARM.update(done=True, seconds=round(time.perf_counter() - start, 3))
+    logger.info(f"warm-up finished in {WARM['seconds']}s")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # WARM_UP=background lets the process accept /health at once while the SDKs load;
+    # blocking holds startup until they are ready; off defers everything to first use.
+    if settings.WARM_UP == "blocking":
+        await run_in_threadpool(_warm_up)
+    elif settings.WARM_UP == "background":
+        app.state.warm_up = asyncio.create_task(run_in_threadpool(_warm_up))
+    yield
+    await EMAIL_DISPATCHER.stop()
+
+
 app = FastAPI(
     title=settings.APP_TITLE,
     version=settings.APP_VERSION,
     description="Recruiter AI – DB-free MVP. Gemini-powered resume evaluation.",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -51,12 +212,55 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_BYTES,
+    brotli_quality=settings.BROTLI_QUALITY,
+)
+if settings.TRACING_ENABLED:
+    configure_tracing(
+        FileExporter(settings.TRACE_FILE) if settings.TRACE_FILE else InMemoryExporter(settings.TRACE_MEMORY_SPANS)
+    )
+app.add_middleware(TracingMiddleware)   # a single check per request while tracing is off
+if settings.PROFILING_ENABLED:   # not installed at all otherwise
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=settings.PROFILE_DIR,
+        interval_ms=settings.PROFILE_INTERVAL_MS,
+        max_seconds=settings.PROFILE_MAX_SECONDS,
+    )
 
 
 # ── Health ─────────────────────────────────────────────────────────────────────
 @app.get("/health", tags=["Health"])
 def health():
-    return {"status": "ok", "version": settings.APP_VERSION}
+    breaker = llm_service.BREAKER.snapshot()
+    return {
+        "status": "ok" if breaker["state"] == "closed" else "degraded",
+        "version": settings.APP_VERSION,
+        "warm": WARM["done"],
+        "llm_breaker": breaker,
+        "llm_scheduler": SCHEDULER.snapshot(),
+    }
+
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+# ── GET /usage/tokens ─────────────────────────────────────────────────────────
+@app.get("/usage/tokens", tags=["Health"])
+def token_usage(session_id: Optional[str] = Query(None), day: Optional[str] = Query(None)):
+    """
+    LLM token usage: today's (or ?day=YYYY-MM-DD) totals by label, the
+    per-label and per-day roll-ups, or one session's (or matrix batch_id's)
+    usage with ?session_id=.
+    """
+    if session_id is not None:
+        return {"session_id": session_id, **LEDGER.scope(session_id)}
+    return {"today": LEDGER.day(day), **LEDGER.summary()}
 
 
 # ── POST /analyze ──────────────────────────────────────────────────────────────
@@ -65,105 +269,565 @@ async def analyze(
     job_title: str = Form(...),
     jd_pdf: UploadFile = File(...),
     resumes: List[UploadFile] = File(...),
+    compact: bool = Query(False),
+    include: Optional[str] = Query(None),
+    token_budget: Optional[int] = Query(None, ge=0),
 ):
     """
     Upload a JD (PDF) + one or more resume PDFs.
     Parses with Gemini and returns ranked candidates.
     Returns a session_id to use for overrides and finalize.
+    ?compact=true drops reasoning/skills from rows unless named in ?include=.
+    ?token_budget= caps the LLM tokens this request may spend (see TOKEN_BUDGET_MODE).
     """
     logger.info(f"analyze: job_title='{job_title}', resumes={[r.filename for r in resumes]}")
+    session_id = str(uuid.uuid4())
+    current_span().set_attribute("session_id", session_id)
+    current_span().set_attribute("resumes", len(resumes))
+    budget = _token_budget(token_budget)
+
+    with token_scope(session_id, budget), llm_scope(session_id, is_interactive(len(resumes))):
+        # 1. Parse JD
+        try:
+            jd_content = await read_upload_file(jd_pdf)
+            criteria = await run_in_threadpool(parse_criteria, jd_content, jd_pdf.filename)
+        except HTTPException:
+            raise
+        except QuotaError:
+            raise HTTPException(status_code=503, detail=QUOTA_DETAIL)
+        except Exception as exc:
+            raise HTTPException(status_code=502, detail=f"JD processing failed: {exc}")
+
+        # 2. Parse + evaluate each resume
+        candidates, errors = await _process_resumes(resumes, criteria)
+
+    # 3. Store session (table ranks by score desc)
+    table = CandidateTable(candidates)
+    SESSION_STORE[session_id] = SessionData(job_title, criteria, table)
+    await run_in_threadpool(_add_to_pool, candidates, session_id, job_title)
 
-    # 1. Parse JD
+    return ORJSONResponse({
+        "session_id": session_id,
+        "job_title": job_title,
+        "total_candidates": len(table),
+        "candidates": table.to_list(_excluded_fields(compact, include)),
+        "errors": errors,
+        **_token_report(session_id, budget),
+    })
+
+
+# ── POST /analyze/matrix ──────────────────────────────────────────────────────
+async def _bounded(sem: asyncio.Semaphore, fn, *args, **kwargs):
+    """Run a blocking parse/evaluate call on the threadpool, at most sem-many at once."""
+    queued = time.perf_counter()
+    async with sem:
+        current_span().set_attribute("queue_ms", round((time.perf_counter() - queued) * 1000, 1))
+        return await run_in_threadpool(fn, *args, **kwargs)
+
+
+async def _parse_upload(sem: asyncio.Semaphore, filename: str, content: bytes, parse):
+    """extract_text + parse_jd/parse_resume for one upload; returns (parsed, error)."""
     try:
-        jd_content = await read_upload_file(jd_pdf)
-        jd_text = extract_text(jd_content, jd_pdf.filename)
-        criteria = parse_jd(jd_text, filename=jd_pdf.filename)
-    except HTTPException:
-        raise
+        with span("upload", filename=filename, kind="jd" if parse is parse_jd else "resume"):
+            text = await run_in_threadpool(extract_text, content, filename)
+            return await _bounded(sem, parse, text, filename=filename), None
     except QuotaError:
-        raise HTTPException(
-            status_code=503,
-            detail="⚠️ Gemini API quota exceeded. Your free-tier limit has been reached. Please wait for it to reset (resets daily at midnight Pacific Time) or set DEMO_MODE=true in your .env to use mock results."
-        )
+        raise HTTPException(status_code=503, detail=QUOTA_DETAIL)
+    except BudgetExhausted as exc:
+        return None, f"Skipped: {exc}"
+    except HTTPException as exc:
+        return None, exc.detail
     except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"JD processing failed: {exc}")
+        logger.error(f"  {filename} failed: {exc}")
+        return None, str(exc)
+
+
+@app.post("/analyze/matrix", tags=["Analyze"])
+async def analyze_matrix(
+    jd_pdfs: List[UploadFile] = File(...),
+    resumes: List[UploadFile] = File(...),
+    job_titles: Optional[List[str]] = Form(None),
+    compact: bool = Query(False),
+    include: Optional[str] = Query(None),
+    token_budget: Optional[int] = Query(None, ge=0),
+):
+    """
+    Screen one resume pool against several JDs.
+    Each JD and each resume is extracted and parsed exactly once; the M×N
+    evaluations then run concurrently (MATRIX_CONCURRENCY) and share the
+    evaluation cache.  Every JD becomes a normal session (overrides, finalize,
+    export all work on it).  job_titles: one per JD, in order; defaults to the
+    JD file name.  Each candidate also gets a best_fit across the jobs.
+    Parsing is shared across the sessions, so token usage (and
+    ?token_budget=) is accounted per request under batch_id.
+    """
+    if len(jd_pdfs) > settings.MATRIX_MAX_JOBS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.MATRIX_MAX_JOBS} JDs per request.")
+    if job_titles and len(job_titles) != len(jd_pdfs):
+        raise HTTPException(status_code=400, detail="Give one job_title per JD (or none).")
+    titles = job_titles or [jd.filename.rsplit(".", 1)[0] for jd in jd_pdfs]
+    logger.info(f"analyze/matrix: jobs={titles}, resumes={[r.filename for r in resumes]}")
+
+    # 1. Read everything, then extract + parse every JD and resume once, concurrently
+    jd_files = [(jd.filename, await read_upload_file(jd)) for jd in jd_pdfs]
+    errors, resume_files = [], []
+    for upload in resumes:
+        try:
+            resume_files.append((upload.filename, await read_upload_file(upload)))
+        except HTTPException as exc:
+            errors.append({"filename": upload.filename, "error": exc.detail})
+
+    sem = asyncio.Semaphore(max(settings.MATRIX_CONCURRENCY, 1))
+    batch_id = f"matrix:{uuid.uuid4()}"
+    budget = _token_budget(token_budget)
+    interactive = is_interactive(len(resume_files))
+    with token_scope(batch_id, budget), llm_scope(batch_id, interactive):   # tasks / threadpool calls inherit both
+        parsed_jds = await asyncio.gather(*(_parse_upload(sem, f, c, parse_jd) for f, c in jd_files))
+        parsed_resumes = await asyncio.gather(*(_parse_upload(sem, f, c, parse_resume) for f, c in resume_files))
+
+    jobs = []
+    for title, (filename, _), (criteria, error) in zip(titles, jd_files, parsed_jds):
+        if error:
+            errors.append({"filename": filename, "error": f"JD processing failed: {error}"})
+        else:
+            jobs.append((title, filename, criteria))
+    if not jobs:
+        raise HTTPException(status_code=502, detail="JD processing failed for every JD.")
+
+    people = []   # (candidate_id, filename, parsed resume)
+    for (filename, _), (candidate_data, error) in zip(resume_files, parsed_resumes):
+        if error:
+            errors.append({"filename": filename, "error": error})
+        else:
+            people.append((str(uuid.uuid4()), filename, candidate_data))
+
+    # 2. Evaluate the M×N matrix
+    async def evaluate(title, criteria, filename, candidate_data):
+        try:
+            with span("match", filename=filename, job_title=title):
+                return await _bounded(sem, evaluate_candidate, criteria, candidate_data, filename=filename)
+        except QuotaError:
+            raise HTTPException(status_code=503, detail=QUOTA_DETAIL)
+        except BudgetExhausted:
+            return None   # TOKEN_BUDGET_MODE=stop: left out of that job's session
+
+    with token_scope(batch_id, budget), llm_scope(batch_id, interactive):
+        evals = await asyncio.gather(*(
+            evaluate(title, criteria, filename, data) for title, _, criteria in jobs for _, filename, data in people
+        ))
+
+    # 3. One session per job; a candidate keeps the same id in all of them
+    exclude = _excluded_fields(compact, include)
+    job_results, best = [], {}
+    for j, (title, jd_filename, criteria) in enumerate(jobs):
+        rows = []
+        for i, (candidate_id, filename, data) in enumerate(people):
+            eval_data = evals[j * len(people) + i]
+            if eval_data is None:
+                errors.append({"filename": filename, "error": f"Skipped for '{title}': token budget exhausted."})
+                continue
+            candidate = build_candidate(filename, data, eval_data)
+            candidate["candidate_id"] = candidate_id
+            rows.append(candidate)
+            if candidate_id not in best or eval_data["total_score"] > best[candidate_id][0]:
+                best[candidate_id] = (eval_data["total_score"], j, eval_data["verdict"])
+        session_id = str(uuid.uuid4())
+        table = CandidateTable(rows)
+        SESSION_STORE[session_id] = SessionData(title, criteria, table)
+        job_results.append({
+            "session_id": session_id,
+            "job_title": title,
+            "jd_filename": jd_filename,
+            "total_candidates": len(table),
+            "candidates": table.to_list(exclude),
+        })
 
-    # 2. Parse + evaluate each resume
     candidates = []
+    for i, (candidate_id, filename, data) in enumerate(people):
+        if candidate_id not in best:
+            continue
+        score, j, verdict = best[candidate_id]
+        candidates.append({
+            "candidate_id": candidate_id,
+            "filename": filename,
+            "name": data.get("name"),
+            "email": data.get("email"),
+            "best_fit": {
+                "session_id": job_results[j]["session_id"],
+                "job_title": job_results[j]["job_title"],
+                "total_score": score,
+                "verdict": verdict,
+            },
+            "scores": {
+                job["session_id"]: evals[k * len(people) + i]["total_score"]
+                for k, job in enumerate(job_results) if evals[k * len(people) + i] is not None
+            },
+        })
+    candidates.sort(key=lambda c: -c["best_fit"]["total_score"])
+
+    for j, job in enumerate(job_results):
+        rows = [r for r in SESSION_STORE[job["session_id"]].candidates if best[r["candidate_id"]][1] == j]
+        await run_in_threadpool(_add_to_pool, rows, job["session_id"], job["job_title"])
+
+    return ORJSONResponse({
+        "batch_id": batch_id,
+        "jobs": job_results,
+        "candidates": candidates,
+        "errors": errors,
+        **_token_report(batch_id, budget),
+    })
+
+
+# ── POST /jobs/analyze ────────────────────────────────────────────────────────
+def _job_queue() -> JobQueue:
+    if JOB_QUEUE is None:
+        raise HTTPException(status_code=503, detail="Background analysis is disabled (JOB_QUEUE_PATH is empty).")
+    return JOB_QUEUE
+
+
+@app.post("/jobs/analyze", tags=["Jobs"], status_code=202)
+async def enqueue_analysis(
+    job_title: str = Form(...),
+    jd_pdf: UploadFile = File(...),
+    resumes: List[UploadFile] = File(...),
+    token_budget: Optional[int] = Query(None, ge=0),
+):
+    """
+    Same upload as /analyze, but only queued: a worker process
+    (`python -m app.worker`) parses and scores the batch.
+    Poll GET /jobs/{job_id}; its session_id works like /analyze's once done.
+    """
+    queue = _job_queue()
+    files = [(jd_pdf.filename, await read_upload_file(jd_pdf))]
     errors = []
     for upload in resumes:
-        filename = upload.filename
         try:
-            content = await read_upload_file(upload)
-            resume_text = extract_text(content, filename)
-            candidate_data = parse_resume(resume_text, filename=filename)
-            eval_data = evaluate_candidate(criteria, candidate_data, filename=filename)
-
-            candidate_id = str(uuid.uuid4())
-            candidates.append({
-                "candidate_id": candidate_id,
-                "filename": filename,
-                "name": candidate_data.get("name"),
-                "email": candidate_data.get("email"),
-                "experience_years": candidate_data.get("total_experience_years"),
-                "skills": candidate_data.get("skills", []),
-                "education": candidate_data.get("education"),
-                "total_score": eval_data["total_score"],
-                "skill_score": eval_data["skill_score"],
-                "experience_score": eval_data["experience_score"],
-                "project_score": eval_data["project_score"],
-                "education_score": eval_data["education_score"],
-                "role_score": eval_data["role_score"],
-                "verdict": eval_data["verdict"],
-                "flags": eval_data["flags"],
-                "reasoning": eval_data["reasoning"],
-                # AI default decision
-                "decision": (
-                    "Interview" if eval_data["verdict"] in ("Strong Yes", "Yes")
-                    else "Hold" if eval_data["verdict"] == "Maybe"
-                    else "Reject"
-                ),
-            })
-            logger.info(f"  {filename}: score={eval_data['total_score']}, verdict={eval_data['verdict']}")
-        except QuotaError:
-            raise HTTPException(
-                status_code=503,
-                detail="⚠️ Gemini API quota exceeded. Your free-tier limit has been reached. Please wait for it to reset (resets daily at midnight Pacific Time) or set DEMO_MODE=true in your .env to use mock results."
-            )
+            files.append((upload.filename, await read_upload_file(upload)))
         except HTTPException as exc:
-            errors.append({"filename": filename, "error": exc.detail})
-        except Exception as exc:
-            logger.error(f"  {filename} failed: {exc}")
-            errors.append({"filename": filename, "error": str(exc)})
-
-    # Sort by score desc
-    candidates.sort(key=lambda c: c["total_score"], reverse=True)
+            errors.append({"filename": upload.filename, "error": exc.detail})
 
-    # 3. Store session
     session_id = str(uuid.uuid4())
-    SESSION_STORE[session_id] = {
+    payload = {
         "job_title": job_title,
-        "criteria": criteria,
-        "candidates": candidates,
+        "token_budget": settings.TOKEN_BUDGET_PER_REQUEST if token_budget is None else token_budget,
+        "token_budget_mode": settings.TOKEN_BUDGET_MODE,
+        "upload_errors": errors,
     }
-
-    return {
+    job_id = await run_in_threadpool(queue.enqueue, "analyze", payload, files, session_id, len(files) - 1)
+    logger.info(f"queued job {job_id}: job_title='{job_title}', resumes={len(files) - 1}")
+    return ORJSONResponse({
+        "job_id": job_id,
         "session_id": session_id,
-        "job_title": job_title,
-        "total_candidates": len(candidates),
-        "candidates": candidates,
+        "status": QUEUED,
+        "total": len(files) - 1,
         "errors": errors,
+    }, status_code=202)
+
+
+# ── GET /jobs/{id} ────────────────────────────────────────────────────────────
+def _import_job(job: Job) -> SessionData:
+    """The finished job's session, created in SESSION_STORE (and the talent pool) on first sight."""
+    with _JOB_IMPORT_LOCK:
+        session = SESSION_STORE.get(job.session_id)
+        if session is None:
+            job_title = job.payload["job_title"]
+            session = SessionData(job_title, job.result["criteria"], CandidateTable(job.result["candidates"]))
+            SESSION_STORE[job.session_id] = session
+            _add_to_pool(job.result["candidates"], job.session_id, job_title)
+    return session
+
+
+def _session(session_id: str) -> Optional[SessionData]:
+    """
+    SESSION_STORE[session_id].  A session created by a queued job that has
+    finished since is imported from the queue on first use, so it doesn't
+    depend on anyone polling GET /jobs/{id} (or on which API process does).
+    """
+    session = SESSION_STORE.get(session_id)
+    if session is None and JOB_QUEUE is not None:
+        job = JOB_QUEUE.for_session(session_id)
+        if job is not None and job.status == DONE:
+            session = _import_job(job)
+    return session
+
+
+@app.get("/jobs/{job_id}", tags=["Jobs"])
+def job_status(
+    job_id: str,
+    compact: bool = Query(False),
+    include: Optional[str] = Query(None),
+):
+    """
+    Status and progress of a queued analysis.  Once done, the response has
+    the same fields as /analyze and the session is available as usual.
+    """
+    job = _job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    body = {
+        "job_id": job.id,
+        "session_id": job.session_id,
+        "job_title": job.payload["job_title"],
+        "status": job.status,
+        "attempts": job.attempts,
+        "progress": {"done": job.progress, "total": job.total},
     }
+    if job.status == FAILED:
+        body["error"] = QUOTA_DETAIL if (job.error or "").startswith("quota:") else job.error
+    elif job.status == DONE:
+        table = _import_job(job).candidates
+        body.update({
+            "total_candidates": len(table),
+            "candidates": table.to_list(_excluded_fields(compact, include)),
+            "errors": job.result["errors"],
+            "token_usage": job.result["token_usage"],
+        })
+        if "token_budget" in job.result:
+            body["token_budget"] = job.result["token_budget"]
+    return ORJSONResponse(body)
 
 
 # ── GET /session/{sid} ────────────────────────────────────────────────────────
 @app.get("/session/{session_id}", tags=["Session"])
-def get_session(session_id: str):
-    """Retrieve stored results for a session."""
-    session = SESSION_STORE.get(session_id)
+def get_session(
+    session_id: str,
+    compact: bool = Query(False),
+    include: Optional[str] = Query(None),
+):
+    """Retrieve stored results for a session (supports ?compact / ?include like /analyze)."""
+    session = _session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found.")
-    return session
+    return ORJSONResponse({
+        **session.to_dict(_excluded_fields(compact, include)),
+        "token_usage": LEDGER.scope(session_id),
+    })
+
+
+# ── GET /session/{sid}/export ─────────────────────────────────────────────────
+@app.get("/session/{session_id}/export", tags=["Session"])
+def export_session(
+    session_id: str,
+    format: str = Query("csv", description="csv | ndjson | parquet"),
+    columns: Optional[str] = Query(None, description="Comma-separated; default all"),
+    decision: Optional[str] = Query(None),
+    verdict: Optional[str] = Query(None),
+):
+    """Stream ranked candidates row by row for bulk (ATS) imports."""
+    session = _session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found.")
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail="format must be csv, ndjson or parquet.")
+    if decision is not None and decision not in DECISIONS:
+        raise HTTPException(status_code=400, detail="decision must be Interview, Hold or Reject.")
+    if verdict is not None and verdict not in VERDICTS:
+        raise HTTPException(status_code=400, detail=f"verdict must be one of: {', '.join(VERDICTS)}.")
+    try:
+        selected = parse_columns(columns)
+        rows = session.candidates.ranked_rows(decision=decision, verdict=verdict)
+        body = export_stream(format, session.candidates, rows, selected)
+    except ExportError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    media_type, ext = FORMATS[format]
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="session-{session_id}.{ext}"'},
+    )
+
+
+# ── POST /session/{sid}/resumes ───────────────────────────────────────────────
+@app.post("/session/{session_id}/resumes", tags=["Session"])
+async def append_resumes(
+    session_id: str,
+    resumes: List[UploadFile] = File(...),
+    compact: bool = Query(False),
+    include: Optional[str] = Query(None),
+    token_budget: Optional[int] = Query(None, ge=0),
+):
+    """
+    Add late-arriving resumes to an existing session.
+    Only the new files are processed, against the session's stored criteria
+    (no JD re-parse); each result is insertion-merged into the already
+    ranked list so existing candidates and overrides are untouched.
+    """
+    session = await run_in_threadpool(_session, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found.")
+    logger.info(f"append: session={session_id}, resumes={[r.filename for r in resumes]}")
+
+    budget = _token_budget(token_budget)
+    async with session.lock:   # a concurrent rerank would miss rows added mid-way
+        with token_scope(session_id, budget), llm_scope(session_id, is_interactive(len(resumes))):
+            added, errors = await _process_resumes(resumes, session.criteria)
+
+        table = session.candidates
+        for c in added:
+            # ranking is total_score desc; ties go after existing entries
+            table.insert_ranked(table.append(c))
+    await run_in_threadpool(_add_to_pool, added, session_id, session.job_title)
+
+    return ORJSONResponse({
+        "session_id": session_id,
+        "job_title": session.job_title,
+        "added": len(added),
+        "total_candidates": len(table),
+        "candidates": table.to_list(_excluded_fields(compact, include)),
+        "errors": errors,
+        **_token_report(session_id, budget),
+    })
+
+
+# ── POST /session/{sid}/rerank ────────────────────────────────────────────────
+@app.post("/session/{session_id}/rerank", tags=["Session"])
+async def rerank_session(
+    session_id: str,
+    criteria: Optional[str] = Form(None),
+    jd_pdf: Optional[UploadFile] = File(None),
+    compact: bool = Query(False),
+    include: Optional[str] = Query(None),
+    token_budget: Optional[int] = Query(None, ge=0),
+):
+    """
+    Re-score a session against edited criteria and/or a new JD, reusing the
+    stored parsed resumes (no PDF extraction, no parse_resume).
+    criteria: JSON object with any JobCriteria fields to change, applied on
+    top of the new JD (if given) or the session's current criteria.
+    Recruiter overrides are kept; other decisions follow the new verdicts.
+    With TOKEN_BUDGET_MODE=stop, rows left once the budget is spent keep
+    their previous scores and are counted in not_rescored.  Runs one at a
+    time per session, and never alongside an append.
+    """
+    session = await run_in_threadpool(_session, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found.")
+    if criteria is None and jd_pdf is None:
+        raise HTTPException(status_code=400, detail="Provide criteria and/or jd_pdf.")
+
+    base = None   # the session's criteria, read once the lock is held
+    budget = _token_budget(token_budget)
+    table = session.candidates
+    interactive = is_interactive(len(table))
+    if jd_pdf is not None:
+        try:
+            jd_content = await read_upload_file(jd_pdf)
+            jd_text = await run_in_threadpool(extract_text, jd_content, jd_pdf.filename)
+            with token_scope(session_id, budget), llm_scope(session_id, interactive):
+                base = await run_in_threadpool(parse_jd, jd_text, filename=jd_pdf.filename)
+        except HTTPException:
+            raise
+        except QuotaError:
+            raise HTTPException(status_code=503, detail=QUOTA_DETAIL)
+        except Exception as exc:
+            raise HTTPException(status_code=502, detail=f"JD processing failed: {exc}")
+
+    try:
+        edits = json.loads(criteria) if criteria else {}
+        if not isinstance(edits, dict):
+            raise ValueError("criteria must be a JSON object")
+        edits = JobCriteria.model_validate(edits).model_dump(exclude_unset=True)
+    except (ValueError, ValidationError) as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid criteria: {exc}")
+
+    def rescore() -> int:
+        """Re-evaluate every row (on the threadpool); returns the rows left once the budget ran out."""
+        for row in range(len(table)):
+            try:
+                eval_data = evaluate_candidate(
+                    new_criteria, table.parsed_view(row), filename=table.text(row, "filename")
+                )
+            except BudgetExhausted:
+                return len(table) - row
+            table.update_scores(row, eval_data)
+            if not table.is_overridden(row):
+                table.set_decision(row, default_decision(eval_data["verdict"]))
+        return 0
+
+    async with session.lock:
+        new_criteria = {**(session.criteria if base is None else base), **edits}
+        try:
+            with token_scope(session_id, budget), llm_scope(session_id, interactive):
+                not_rescored = await run_in_threadpool(rescore)
+        except QuotaError:
+            raise HTTPException(status_code=503, detail=QUOTA_DETAIL)
+        table.sort()
+        session.criteria = new_criteria
+
+    logger.info(f"rerank: session={session_id}, candidates={len(table)}")
+    return ORJSONResponse({
+        "session_id": session_id,
+        "job_title": session.job_title,
+        "criteria": new_criteria,
+        "total_candidates": len(table),
+        "not_rescored": not_rescored,
+        "candidates": table.to_list(_excluded_fields(compact, include)),
+        **_token_report(session_id, budget),
+    })
+
+
+# ── POST /talent-pool/match ───────────────────────────────────────────────────
+def _experience_bound(criteria: dict, field: str, from_request: bool) -> Optional[float]:
+    """
+    criteria[field] as a number (numeric strings such as "3" included).
+    Anything else is a 400 when the client sent it, and ignored when it came
+    from a session's LLM-parsed criteria.
+    """
+    value = criteria.get(field)
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = float(value.strip())
+        except ValueError:
+            value = None
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return value
+    if from_request:
+        raise HTTPException(status_code=400, detail=f"{field} must be a number.")
+    return None
+
+
+@app.post("/talent-pool/match", tags=["Talent Pool"])
+def match_talent_pool(payload: dict):
+    """
+    Rank candidates from all previous sessions against JD criteria – no upload,
+    no re-parse.
+    Body: { session_id } to reuse that session's parsed JD, or
+          { required_skills, nice_to_have_skills?, min_experience?, max_experience? }
+    Optional: within_experience (bool), limit (int, default 50).
+    """
+    session_id = payload.get("session_id")
+    if session_id:
+        session = _session(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found.")
+        criteria = session.criteria
+    else:
+        criteria = payload
+
+    required = criteria.get("required_skills") or []
+    if not required:
+        raise HTTPException(status_code=400, detail="required_skills or session_id is required.")
+
+    limit = payload.get("limit", 50)
+    if not isinstance(limit, int) or not 1 <= limit <= 500:
+        raise HTTPException(status_code=400, detail="limit must be an integer between 1 and 500.")
+
+    matches = TALENT_POOL.match(
+        required,
+        nice_to_have_skills=criteria.get("nice_to_have_skills") or [],
+        min_experience=_experience_bound(criteria, "min_experience", from_request=not session_id),
+        max_experience=_experience_bound(criteria, "max_experience", from_request=not session_id),
+        within_experience=bool(payload.get("within_experience", False)),
+        limit=limit,
+    )
+    return {
+        "pool_size": len(TALENT_POOL),
+        "total_matches": len(matches),
+        "candidates": matches,
+    }
 
 
 # ── POST /override ─────────────────────────────────────────────────────────────
@@ -180,70 +844,201 @@ def override_decision(payload: dict):
     if decision not in ("Interview", "Hold", "Reject"):
         raise HTTPException(status_code=400, detail="decision must be Interview, Hold, or Reject.")
 
-    session = SESSION_STORE.get(session_id)
+    session = _session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found.")
+
+    row = session.candidates.find(candidate_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Candidate not found in session.")
+    session.candidates.set_decision(row, decision, overridden=True)
+    return {"ok": True, "candidate_id": candidate_id, "decision": decision}
+
+
+# ── Email previews ─────────────────────────────────────────────────────────────
+def _parse_decisions(decision: Optional[str]) -> List[str]:
+    wanted = [d.strip() for d in (decision or "Interview").split(",") if d.strip()]
+    bad = [d for d in wanted if d not in DECISIONS]
+    if bad or not wanted:
+        raise HTTPException(status_code=400, detail="decision must be Interview, Hold and/or Reject.")
+    return list(dict.fromkeys(wanted))
+
+
+def _preview_page(
+    session_id: str, session: SessionData, decisions: List[str],
+    offset: int, limit: int, simulated: bool = True,
+) -> dict:
+    """
+    One page of rendered letters, grouped by decision in the order requested
+    and ranked within each group.  Only rows on the page are rendered.
+    """
+    table = session.candidates
+    counts = table.count_decisions()
+    templates = templates_for(session.job_title, session.templates)
+    total = sum(counts[d] for d in decisions)
+
+    previews = []
+    skip = offset
+    for d in decisions:
+        if len(previews) >= limit:
+            break
+        if skip >= counts[d]:
+            skip -= counts[d]
+            continue
+        template = templates[d]
+        for row in table.ranked_rows(decision=d)[skip:skip + limit - len(previews)]:
+            name, email = table.text(row, "name"), table.text(row, "email")
+            subject, body = template.render(name, email)
+            previews.append({
+                "candidate_id": table.candidate_id(row),
+                "name": name,
+                "email": email,
+                "decision": d,
+                "email_subject": subject,
+                "email_body": body,
+                "simulated": simulated,
+            })
+        skip = 0
+
+    end = offset + len(previews)
+    return {
+        "session_id": session_id,
+        "job_title": session.job_title,
+        "simulated": simulated,
+        "summary": {
+            "interview": counts["Interview"],
+            "hold": counts["Hold"],
+            "reject": counts["Reject"],
+        },
+        "previews_total": total,
+        "offset": offset,
+        "next_offset": end if end < total else None,
+        "email_previews": previews,
+    }
+
+
+# ── PUT /session/{sid}/templates ──────────────────────────────────────────────
+@app.put("/session/{session_id}/templates", tags=["Finalize"])
+def set_templates(session_id: str, payload: dict):
+    """
+    Per-job e-mail templates.
+    Body: { "Interview"|"Hold"|"Reject": { subject?, body? }, ... }
+    Placeholders: {job_title}, {name}, {email}.  Omitted parts keep the default.
+    """
+    session = _session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found.")
+    bad = [d for d in payload if d not in DECISIONS]
+    if bad:
+        raise HTTPException(status_code=400, detail=f"Unknown decision(s): {', '.join(bad)}")
+
+    templates = {**session.templates}
+    for d, parts in payload.items():
+        if not isinstance(parts, dict) or not set(parts) <= {"subject", "body"}:
+            raise HTTPException(status_code=400, detail=f"{d}: expected {{subject?, body?}}.")
+        templates[d] = {**templates.get(d, {}), **{k: str(v) for k, v in parts.items()}}
+    try:
+        templates_for(session.job_title, templates)   # compile now so errors surface here
+    except TemplateError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    session.templates = templates
+    return {"ok": True, "templates": templates}
 
-    for c in session["candidates"]:
-        if c["candidate_id"] == candidate_id:
-            c["decision"] = decision
-            return {"ok": True, "candidate_id": candidate_id, "decision": decision}
 
-    raise HTTPException(status_code=404, detail="Candidate not found in session.")
+# ── GET /session/{sid}/email-previews ─────────────────────────────────────────
+@app.get("/session/{session_id}/email-previews", tags=["Finalize"])
+def email_previews(
+    session_id: str,
+    decision: Optional[str] = Query(None, description="Comma-separated; default Interview"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Page through rendered letters without finalizing again."""
+    session = _session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found.")
+    return ORJSONResponse(_preview_page(session_id, session, _parse_decisions(decision), offset, limit))
 
 
 # ── POST /finalize/{sid} ───────────────────────────────────────────────────────
+def _outbound(session_id: str, session: SessionData, decisions: List[str]) -> Tuple[List[OutboundEmail], int]:
+    """Render every letter for the given decisions; returns (messages, skipped without e-mail)."""
+    table = session.candidates
+    templates = templates_for(session.job_title, session.templates)
+    messages, skipped = [], 0
+    for d in decisions:
+        template = templates[d]
+        for row in table.ranked_rows(decision=d):
+            name, email = table.text(row, "name"), table.text(row, "email")
+            if not email:
+                skipped += 1
+                continue
+            candidate_id = table.candidate_id(row)
+            subject, body = template.render(name, email)
+            messages.append(OutboundEmail(
+                key=idempotency_key(session_id, candidate_id, d), to=email,
+                subject=subject, body=body, candidate_id=candidate_id, decision=d,
+            ))
+    return messages, skipped
+
+
 @app.post("/finalize/{session_id}", tags=["Finalize"])
-def finalize(session_id: str):
+async def finalize(
+    session_id: str,
+    decision: Optional[str] = Query(None, description="Comma-separated; default Interview"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+):
     """
-    MVP simulation – no emails are actually sent.
-    Returns preview data for the email screen.
+    With EMAIL_SENDING_ENABLED off (default) this is a simulation – nothing is sent.
+    Otherwise letters for the selected decisions are queued for background
+    delivery and the call returns immediately with a dispatch_id to poll at
+    GET /dispatch/{id}.  Re-finalizing never re-sends a delivered letter.
+    Returns the summary plus the first page of previews; use next_offset with
+    GET /session/{sid}/email-previews for the rest.
     """
-    session = SESSION_STORE.get(session_id)
+    session = await run_in_threadpool(_session, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found.")
 
-    job_title = session["job_title"]
-    candidates = session["candidates"]
+    decisions = _parse_decisions(decision)
+    sending = settings.EMAIL_SENDING_ENABLED
+    page = _preview_page(session_id, session, decisions, offset, limit, simulated=not sending)
 
-    interview_candidates = [c for c in candidates if c["decision"] == "Interview"]
-    hold_candidates      = [c for c in candidates if c["decision"] == "Hold"]
-    reject_candidates    = [c for c in candidates if c["decision"] == "Reject"]
-
-    previews = []
-    for c in interview_candidates:
-        previews.append({
-            "candidate_id": c["candidate_id"],
-            "name": c["name"],
-            "email": c["email"],
-            "decision": "Interview",
-            "email_subject": f"Interview Invitation — {job_title}",
-            "email_body": (
-                f"Dear {c['name'] or 'Candidate'},\n\n"
-                f"Thank you for your interest in the {job_title} position. "
-                f"We were impressed with your background and would like to invite you for an interview.\n\n"
-                f"Please confirm your availability for the proposed time below.\n\n"
-                f"Best regards,\nHiring Team"
-            ),
-            "simulated": True,
-        })
+    if sending:
+        messages, skipped = _outbound(session_id, session, decisions)
+        try:
+            dispatch_id = EMAIL_DISPATCHER.submit(messages)
+        except QueueFullError as exc:
+            raise HTTPException(
+                status_code=503, detail=f"Email queue is full, retry shortly. {exc}",
+                headers={"Retry-After": "30"},
+            )
+        report = EMAIL_DISPATCHER.batch_status(dispatch_id)
+        page["dispatch"] = {
+            "dispatch_id": dispatch_id,
+            "queued": report["total"] - report["duplicates"],
+            "duplicates": report["duplicates"],
+            "skipped_no_email": skipped,
+        }
 
+    summary = page["summary"]
     logger.info(
-        f"finalize: session={session_id}, interview={len(interview_candidates)}, "
-        f"hold={len(hold_candidates)}, reject={len(reject_candidates)}"
+        f"finalize: session={session_id}, interview={summary['interview']}, "
+        f"hold={summary['hold']}, reject={summary['reject']}, sending={sending}"
     )
+    return ORJSONResponse(page)
 
-    return {
-        "session_id": session_id,
-        "job_title": job_title,
-        "simulated": True,
-        "summary": {
-            "interview": len(interview_candidates),
-            "hold": len(hold_candidates),
-            "reject": len(reject_candidates),
-        },
-        "email_previews": previews,
-    }
+
+# ── GET /dispatch/{id} ────────────────────────────────────────────────────────
+@app.get("/dispatch/{dispatch_id}", tags=["Finalize"])
+def dispatch_status(dispatch_id: str):
+    """Per-message delivery status for a finalize dispatch."""
+    report = EMAIL_DISPATCHER.batch_status(dispatch_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Dispatch not found.")
+    report["queue"] = EMAIL_DISPATCHER.stats()
+    return ORJSONResponse(report)
 
 
 # ── Global exception handler ───────────────────────────────────────────────────
@@ -0,0 +1,201 @@
+"""
+Minimal in-process Prometheus metrics (text exposition format 0.0.4).
+
+Counters and fixed-bucket histograms keyed by label values; recording is a
+dict lookup, a bisect and an add under a lock (~1 µs), so instrumentation
+stays on in production.  Gauges are callbacks evaluated only when /metrics
+is scraped.
+
+    STAGE_SECONDS.observe(0.12, stage="extract_text")
+    with LLM_CALL_SECONDS.time(label="EVAL"): ...
+    LLM_RETRIES.inc(label="RESUME", reason="parse")
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], list] = {}   # key → [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[idx] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return series[-1] if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        lines = self.header()
+        for key, series in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), series):
+                cumulative += n
+                le = 'le="' + _fmt(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(series[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {series[-1]}")
+        return lines
+
+
+class GaugeFunc(_Metric):
+    """
+    Value(s) read from a callback at scrape time: a number, or a dict keyed by
+    label value(s).  kind="counter" exposes an existing running total
+    (e.g. JSON_STATS) without double-bookkeeping.
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Callable[[], object], labelnames: Sequence[str] = (),
+                 kind: str = "gauge"):
+        super().__init__(name, help, labelnames)
+        self.fn = fn
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        value = self.fn()
+        if not self.labelnames:
+            return self.header() + [f"{self.name} {_fmt(value)}"]
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, k if isinstance(k, tuple) else (k,))} {_fmt(v)}"
+            for k, v in sorted(value.items())
+        ]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric   # re-registering (e.g. on reload) replaces
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), **kwargs) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, **kwargs))
+
+    def gauge(self, name: str, help: str, fn: Callable[[], object], labelnames: Sequence[str] = (),
+              kind: str = "gauge") -> GaugeFunc:
+        return self.register(GaugeFunc(name, help, fn, labelnames, kind))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            try:
+                lines.extend(metric.render())
+            except Exception:   # a failing gauge callback must not break the scrape
+                continue
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ── Pipeline / LLM metrics shared by main.py and llm_service ──────────────────
+STAGE_SECONDS = REGISTRY.histogram(
+    "recruiter_pipeline_stage_seconds", "Time spent per analyze pipeline stage.", ("stage",))
+LLM_CALL_SECONDS = REGISTRY.histogram(
+    "recruiter_llm_call_seconds", "Latency of individual model calls by prompt label.", ("label",))
+LLM_RETRIES = REGISTRY.counter(
+    "recruiter_llm_retries_total", "Model call retries by label and reason (parse, error, rate_limit, deadline).",
+    ("label", "reason"))
+LLM_RATE_LIMITED = REGISTRY.counter(
+    "recruiter_llm_rate_limited_total", "Model calls answered with 429.", ("label",))
+LLM_SLEEP_SECONDS = REGISTRY.counter(
+    "recruiter_llm_sleep_seconds_total", "Seconds slept before model calls (retry back-off, UI pacing).",
+    ("label", "reason"))
+LLM_DEADLINE_EXCEEDED = REGISTRY.counter(
+    "recruiter_llm_deadline_exceeded_total", "Model calls abandoned at their deadline.", ("label",))
+LLM_HEDGES = REGISTRY.counter(
+    "recruiter_llm_hedges_total", "Hedged model calls by outcome (won, lost, over_budget, no_slot).", ("label", "outcome"))
+LLM_FALLBACKS = REGISTRY.counter(
+    "recruiter_llm_demo_fallbacks_total", "Results served from mock data after a model failure.", ("label",))
+EVAL_CACHE = REGISTRY.counter(
+    "recruiter_eval_cache_total", "Evaluation cache lookups.", ("result",))
@@ -3,7 +3,7 @@ SQLAlchemy ORM models matching the PRD database schema.
 """
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, Text, TIMESTAMP, ForeignKey
+    Column, Integer, Text, TIMESTAMP, ForeignKey, Index, event, select
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
@@ -46,6 +46,10 @@ class Job(Base):
 
 class Resume(Base):
     __tablename__ = "resumes"
+    __table_args__ = (
+        # per-job scans in id order
+        Index("ix_resumes_job_id_id", "job_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
@@ -69,6 +73,8 @@ class Evaluation(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False, unique=True)
+    # copy of resumes.job_id, so a job's ranking is one index range scan (filled in on insert)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
     skill_score = Column(Integer, default=0)
     experience_score = Column(Integer, default=0)
     project_score = Column(Integer, default=0)
@@ -82,6 +88,21 @@ class Evaluation(Base):
 
     resume = relationship("Resume", back_populates="evaluation")
 
+    __table_args__ = (
+        # ranking order within a job: total_score DESC, resume_id ASC
+        Index("ix_evaluations_job_id_total_score_resume_id", "job_id", total_score.desc(), "resume_id"),
+    )
+
+
+@event.listens_for(Evaluation, "before_insert")
+def _evaluation_job_id(mapper, connection, target: Evaluation) -> None:
+    if target.job_id is not None:
+        return
+    if target.resume is not None:
+        target.job_id = target.resume.job_id
+    else:   # built with only the foreign key set
+        target.job_id = connection.scalar(select(Resume.job_id).where(Resume.id == target.resume_id))
+
 
 # ─── Approvals ────────────────────────────────────────────────────────────────
 
@@ -0,0 +1,124 @@
+"""
+Opt-in per-request sampling profiler.
+
+  • ProfilingMiddleware – installed only when PROFILING_ENABLED, and only
+                          requests carrying `X-Profile: 1` or `?profile=1` are
+                          profiled; everything else passes straight through.
+  • SamplingProfiler    – a background thread that snapshots every thread's
+                          stack (sys._current_frames) each PROFILE_INTERVAL_MS
+                          and counts identical stacks.
+
+The profile is written to PROFILE_DIR/<id>.folded in collapsed-stack format
+("thread;module:func;module:func <samples>"), which flamegraph.pl and
+speedscope read directly; the id comes back in the X-Profile-Id header.
+All threads are sampled (the handler may run on the event loop or on the
+threadpool), so concurrent requests show up too; idle waits are dropped.
+Only one request is profiled at a time.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+IDLE_LEAVES = frozenset({"wait", "select", "poll", "_worker", "_wait_for_tstate_lock", "accept"})
+
+
+def _frame_label(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005, max_seconds: float = 120):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        deadline = time.monotonic() + self.max_seconds
+        while not self._stop.wait(self.interval) and time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me or frame.f_code.co_name in IDLE_LEAVES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        return "".join(f"{';'.join(stack)} {n}\n" for stack, n in sorted(self.stacks.items()))
+
+
+def _wants_profile(scope: Scope) -> bool:
+    if Headers(scope=scope).get(PROFILE_HEADER, "") in ("1", "true"):
+        return True
+    return QueryParams(scope.get("query_string", b"")).get("profile") in ("1", "true")
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp, directory: str = "profiles", interval_ms: float = 5, max_seconds: float = 120):
+        self.app = app
+        self.directory = directory
+        self.interval = interval_ms / 1000
+        self.max_seconds = max_seconds
+        self._busy = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _wants_profile(scope) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile_id
+            await send(message)
+
+        profiler = SamplingProfiler(self.interval, self.max_seconds)
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.stop()
+            self._busy.release()
+            self._write(profile_id, profiler, scope, time.perf_counter() - start)
+
+    def _write(self, profile_id: str, profiler: SamplingProfiler, scope: Scope, elapsed: float) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{profile_id}.folded")
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write(profiler.folded())
+            logger.info(f"profile {profile_id}: {scope['method']} {scope['path']} "
+                        f"{elapsed:.2f}s, {profiler.samples} samples → {path}")
+        except OSError as exc:
+            logger.error(f"profile {profile_id} write failed: {exc}")
+
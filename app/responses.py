@@ -0,0 +1,167 @@
+"""
+Fast JSON responses and negotiated compression for large result payloads.
+
+  • ORJSONResponse        – orjson-backed JSONResponse (stdlib json fallback).
+                            Endpoints that return big candidate lists build it
+                            directly, skipping FastAPI's jsonable_encoder pass.
+  • CompressionMiddleware – brotli (if the `brotli` package is installed) or
+                            gzip, picked from Accept-Encoding, for bodies of at
+                            least COMPRESSION_MIN_BYTES.  Streaming responses
+                            are compressed chunk by chunk.
+"""
+import json
+import zlib
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover – orjson is in requirements.txt
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# ── Compression ───────────────────────────────────────────────────────────────
+
+# Streamed live or already compressed – sent as-is.
+PASSTHROUGH_TYPES = ("text/event-stream", "application/vnd.apache.parquet")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Return "br", "gzip" or None for an Accept-Encoding header value."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name] = q
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 31)   # 31 → gzip container
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._z.compress(data) + self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes) -> bytes:
+        return self._z.compress(data) + self._z.flush()
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self._c = brotli.Compressor(quality=quality)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._c.process(data) + self._c.flush()
+
+    def finish(self, data: bytes) -> bytes:
+        return self._c.process(data) + self._c.finish()
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressingResponder(self, encoding, send)(scope, receive)
+
+
+class _CompressingResponder:
+    def __init__(self, config: CompressionMiddleware, encoding: str, send: Send):
+        self.config = config
+        self.encoding = encoding
+        self.send = send
+        self.start_message: Optional[Message] = None
+        self.started = False
+        self.passthrough = False
+        self.compressor = None
+
+    async def __call__(self, scope: Scope, receive: Receive) -> None:
+        await self.config.app(scope, receive, self.on_send)
+
+    def _new_compressor(self):
+        if self.encoding == "br":
+            return _Brotli(self.config.brotli_quality)
+        return _Gzip(self.config.gzip_level)
+
+    async def on_send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the headers until the first body chunk tells us the size.
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or headers.get("content-type", "").startswith(PASSTHROUGH_TYPES)
+            )
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            if not self.started and self.start_message is not None:
+                self.started = True
+                await self.send(self.start_message)
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            if not more_body and len(body) < self.config.minimum_size:
+                await self.send(self.start_message)
+                await self.send(message)
+                self.passthrough = True
+                return
+            self.compressor = self._new_compressor()
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body:
+                data = self.compressor.finish(body)
+                headers["Content-Length"] = str(len(data))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": data})
+                return
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await self.send(self.start_message)
+
+        data = self.compressor.chunk(body) if more_body else self.compressor.finish(body)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
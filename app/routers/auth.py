@@ -1,35 +1,48 @@
 """
 Auth router – register and login for recruiters.
+
+Handlers are async end to end: bcrypt (hash_password_async /
+verify_password_async) runs on its capped pool and queries go through the
+async engine, so neither ties up a request thread.
 """
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 from app import models
-from app.auth import hash_password, verify_password, create_access_token
+from app.auth import hash_password_async, verify_password_async, create_access_token
 from app.schemas.recruiter import RecruiterRegister, RecruiterRead, Token
 from app.schemas.common import success
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+async def _find_by_email(db: AsyncSession, email: str) -> Optional[models.Recruiter]:
+    result = await db.execute(select(models.Recruiter).where(models.Recruiter.email == email).limit(1))
+    return result.scalars().first()
+
+
 @router.post("/register", status_code=status.HTTP_201_CREATED)
-def register(payload: RecruiterRegister, db: Session = Depends(get_db)):
-    existing = db.query(models.Recruiter).filter(models.Recruiter.email == payload.email).first()
+async def register(payload: RecruiterRegister, db: AsyncSession = Depends(get_async_db)):
+    existing = await _find_by_email(db, payload.email)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="A recruiter with this email already exists.",
         )
+    hashed = await hash_password_async(payload.password)
     recruiter = models.Recruiter(
         email=payload.email,
-        hashed_password=hash_password(payload.password),
+        hashed_password=hashed,
         full_name=payload.full_name,
     )
     db.add(recruiter)
-    db.commit()
-    db.refresh(recruiter)
+    await db.commit()
+    await db.refresh(recruiter)
     return success(
         data=RecruiterRead.model_validate(recruiter).model_dump(),
         message="Recruiter registered successfully.",
@@ -37,9 +50,9 @@ def register(payload: RecruiterRegister, db: Session = Depends(get_db)):
 
 
 @router.post("/token", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    recruiter = db.query(models.Recruiter).filter(models.Recruiter.email == form_data.username).first()
-    if not recruiter or not verify_password(form_data.password, recruiter.hashed_password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    recruiter = await _find_by_email(db, form_data.username)
+    if not recruiter or not await verify_password_async(form_data.password, recruiter.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password.",
@@ -0,0 +1,129 @@
+"""
+The resume-analysis pipeline shared by the API and the job workers.
+
+  • parse_criteria     – extract text from a JD and parse its criteria
+  • parse_and_evaluate – extract text, parse and score one resume
+  • build_candidate    – the session row for a scored resume
+  • resume_step        – the span and per-file error rules around one resume
+                         of a batch, shared by /analyze and analyze_files
+  • analyze_files      – a whole /analyze batch (JD + resumes) in one call,
+                         for processes without an event loop (app.worker)
+"""
+import logging
+import uuid
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.services.llm_service import QuotaError, evaluate_candidate, parse_jd, parse_resume
+from app.services.pdf_service import extract_text
+from app.services.token_usage import BudgetExhausted
+from app.tracing import span
+
+logger = logging.getLogger(__name__)
+
+SCORE_FIELDS = (
+    "total_score", "skill_score", "experience_score",
+    "project_score", "education_score", "role_score",
+    "verdict", "flags", "reasoning",
+)
+
+
+def default_decision(verdict: str) -> str:
+    """AI default decision for a verdict."""
+    return (
+        "Interview" if verdict in ("Strong Yes", "Yes")
+        else "Hold" if verdict == "Maybe"
+        else "Reject"
+    )
+
+
+def build_candidate(filename: str, candidate_data: dict, eval_data: dict) -> dict:
+    candidate = {
+        "candidate_id": str(uuid.uuid4()),
+        "filename": filename,
+        "name": candidate_data.get("name"),
+        "email": candidate_data.get("email"),
+        "experience_years": candidate_data.get("total_experience_years"),
+        "skills": candidate_data.get("skills", []),
+        "education": candidate_data.get("education"),
+    }
+    candidate.update({f: eval_data[f] for f in SCORE_FIELDS})
+    # AI default decision
+    candidate["decision"] = default_decision(eval_data["verdict"])
+    return candidate
+
+
+def parse_criteria(content: bytes, filename: str) -> dict:
+    return parse_jd(extract_text(content, filename), filename=filename)
+
+
+def parse_and_evaluate(content: bytes, filename: str, criteria: dict) -> Tuple[dict, dict]:
+    resume_text = extract_text(content, filename)
+    candidate_data = parse_resume(resume_text, filename=filename)
+    return candidate_data, evaluate_candidate(criteria, candidate_data, filename=filename)
+
+
+def score_resume(content: bytes, filename: str, criteria: dict) -> dict:
+    """parse_and_evaluate + build_candidate for one resume."""
+    candidate_data, eval_data = parse_and_evaluate(content, filename, criteria)
+    logger.info(f"  {filename}: score={eval_data['total_score']}, verdict={eval_data['verdict']}")
+    return build_candidate(filename, candidate_data, eval_data)
+
+
+class _Step:
+    __slots__ = ("stop",)
+
+    def __init__(self):
+        self.stop = False
+
+
+@contextmanager
+def resume_step(index: int, remaining: List[str], errors: List[dict]):
+    """
+    Wrap the work on remaining[0] (the index-th resume of a batch) in a
+    "resume" span.  A per-file failure is appended to errors; an exhausted
+    token budget records every file in remaining as skipped and sets
+    step.stop; QuotaError propagates.
+    """
+    filename = remaining[0]
+    step = _Step()
+    try:
+        with span("resume", filename=filename, index=index):
+            yield step
+    except QuotaError:
+        raise
+    except BudgetExhausted as exc:
+        logger.warning(f"  {exc} Skipping {len(remaining)} resume(s).")
+        errors.extend({"filename": name, "error": f"Skipped: {exc}"} for name in remaining)
+        step.stop = True
+    except HTTPException as exc:
+        errors.append({"filename": filename, "error": exc.detail})
+    except Exception as exc:
+        logger.error(f"  {filename} failed: {exc}")
+        errors.append({"filename": filename, "error": str(exc)})
+
+
+def analyze_files(
+    jd: Tuple[str, bytes],
+    resumes: List[Tuple[str, bytes]],
+    progress: Optional[Callable[[int], None]] = None,
+) -> Tuple[dict, List[dict], List[dict]]:
+    """
+    (criteria, candidates, errors) for a JD and resumes given as (filename, bytes).
+    Same rules as /analyze: per-file failures become errors, an exhausted token
+    budget skips the rest, and QuotaError / a JD failure propagate.
+    progress(n) is called after each resume.
+    """
+    jd_name, jd_content = jd
+    criteria = parse_criteria(jd_content, jd_name)
+    candidates, errors = [], []
+    for n, (filename, content) in enumerate(resumes):
+        with resume_step(n, [name for name, _ in resumes[n:]], errors) as step:
+            candidates.append(score_resume(content, filename, criteria))
+        if step.stop:
+            break
+        if progress is not None:
+            progress(n + 1)
+    return criteria, candidates, errors
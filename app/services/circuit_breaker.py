@@ -0,0 +1,97 @@
+"""
+Process-wide circuit breaker for the Gemini dependency.
+
+  • closed     – calls go through; consecutive quota (429) / auth failures
+                 are counted and any reply from the model resets the count
+  • open       – after `threshold` failures in a row every call is refused
+                 at once, for `reset_seconds`, instead of each request
+                 retrying and sleeping on its own
+  • half_open  – once the wait is over, one caller is let through as a
+                 probe: a reply closes the breaker, another quota / auth
+                 failure opens it for a fresh `reset_seconds`
+
+What a refused call turns into (503, local scoring or mock data) is up to
+llm_service (LLM_BREAKER_POLICY).  snapshot() feeds /health.
+"""
+import threading
+import time
+from typing import Callable
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}   # /metrics gauge values
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int, reset_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.threshold = max(1, threshold)
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0            # consecutive quota / auth failures
+        self.opens = 0               # times the breaker has opened
+        self.rejected = 0            # calls refused while open / probing
+        self.last_error = ""
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """May a call go out now?  Claims the single probe when the open period is over."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self._clock() - self._opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self, error: str = "") -> None:
+        """A quota / auth failure; opens the breaker at the threshold, or straight away for a failed probe."""
+        with self._lock:
+            self.failures += 1
+            self.last_error = error[:200]
+            if self.state == HALF_OPEN or self.failures >= self.threshold:
+                if self.state != OPEN:
+                    self.opens += 1
+                self.state = OPEN
+                self._opened_at = self._clock()
+
+    def release_probe(self) -> None:
+        """The probe ended without telling us anything (timeout, network error): let the next caller probe."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.state = OPEN
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+    def retry_in(self) -> float:
+        """Seconds until a probe is allowed (0 unless open)."""
+        with self._lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(0.0, self.reset_seconds - (self._clock() - self._opened_at))
+
+    def snapshot(self) -> dict:
+        retry_in = self.retry_in()
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "opens": self.opens,
+                "rejected": self.rejected,
+                "retry_in_seconds": round(retry_in, 1),
+                "last_error": self.last_error,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = self.opens = self.rejected = 0
+            self.last_error = ""
@@ -0,0 +1,354 @@
+"""
+Outbound e-mail dispatch queue.
+
+finalize enqueues letters and returns immediately; worker tasks on the event
+loop drain the queue in the background:
+
+  • SMTPPool        – up to EMAIL_POOL_SIZE long-lived aiosmtplib connections,
+                      reused across messages and reconnected when dropped
+  • batching        – each worker takes up to EMAIL_BATCH_SIZE messages per
+                      connection checkout
+  • rate limit      – token bucket, EMAIL_RATE_PER_SECOND across all workers
+  • backpressure    – bounded queue; submit() refuses a batch that doesn't fit
+                      (QueueFullError) instead of buffering without limit
+  • retries         – transient failures (4xx, dropped connections) are retried
+                      with exponential backoff up to EMAIL_MAX_RETRIES;
+                      5xx responses fail immediately
+  • idempotency     – every message carries a key (also its Message-ID);
+                      a key already queued or sent is counted as a duplicate
+                      and never sent twice
+  • retention       – finished messages and dispatches are forgotten after
+                      EMAIL_STATUS_RETENTION_SECONDS (the idempotency window)
+
+Any SMTP server works, including a local stand-in for development/tests:
+    python -m aiosmtpd -n -l localhost:8025
+"""
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUED, SENDING, SENT, FAILED = "queued", "sending", "sent", "failed"
+FINISHED = (SENT, FAILED)
+PRUNE_INTERVAL = 60.0   # seconds between retention sweeps
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+def idempotency_key(session_id: str, candidate_id: str, decision: str) -> str:
+    return hashlib.sha256(f"{session_id}:{candidate_id}:{decision}".encode()).hexdigest()[:32]
+
+
+@dataclass
+class OutboundEmail:
+    key: str
+    to: str
+    subject: str
+    body: str
+    candidate_id: str = ""
+    decision: str = ""
+
+
+@dataclass
+class MessageStatus:
+    key: str
+    to: str
+    candidate_id: str
+    decision: str
+    state: str = QUEUED
+    attempts: int = 0
+    error: str = ""
+    updated_at: float = field(default_factory=time.time)
+
+    def as_dict(self) -> dict:
+        return {
+            "key": self.key, "to": self.to, "candidate_id": self.candidate_id,
+            "decision": self.decision, "state": self.state, "attempts": self.attempts,
+            "error": self.error,
+        }
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class SMTPPool:
+    """Bounded pool of reusable aiosmtplib connections."""
+
+    def __init__(self, hostname: str, port: int, size: int = 4, username: str = "", password: str = "",
+                 use_tls: bool = False, start_tls: bool = False, timeout: float = 30):
+        self.options = dict(
+            hostname=hostname, port=port, use_tls=use_tls,
+            start_tls=start_tls or None, timeout=timeout,
+            username=username or None, password=password or None,
+        )
+        self.size = size
+        self._idle: List = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.connects = 0
+
+    def bind(self) -> None:
+        """(Re)create loop-bound state; called when the dispatcher starts on a loop."""
+        self._idle = []
+        self._slots = asyncio.Semaphore(self.size)
+
+    async def acquire(self):
+        import aiosmtplib   # optional dependency, only needed when sending is enabled
+
+        await self._slots.acquire()
+        try:
+            while self._idle:
+                conn = self._idle.pop()
+                if conn.is_connected:
+                    return conn
+            conn = aiosmtplib.SMTP(**self.options)
+            await conn.connect()
+            self.connects += 1
+            return conn
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def release(self, conn, broken: bool = False) -> None:
+        try:
+            if broken or not conn.is_connected:
+                conn.close()
+            else:
+                self._idle.append(conn)
+        finally:
+            self._slots.release()
+
+    async def close(self) -> None:
+        while self._idle:
+            conn = self._idle.pop()
+            try:
+                await conn.quit()
+            except Exception:
+                conn.close()
+
+
+class EmailDispatcher:
+    def __init__(self, pool: SMTPPool, sender: str, batch_size: int = 50, rate_per_second: float = 20,
+                 max_queue: int = 10_000, max_retries: int = 3, retry_backoff: float = 2.0,
+                 retention_seconds: float = 86_400):
+        self.pool = pool
+        self.sender = sender
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retention_seconds = retention_seconds   # 0 → keep statuses forever
+        self.rate_per_second = rate_per_second
+        self._bucket: Optional[_TokenBucket] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._pending = 0                          # queued + waiting to retry
+        self.statuses: Dict[str, MessageStatus] = {}
+        self.batches: Dict[str, dict] = {}         # dispatch id → {keys, duplicates, created_at}
+        self._pruned_at = 0.0
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+    def _ensure_started(self) -> None:
+        if self._workers and not all(w.done() for w in self._workers):
+            return
+        # Fresh start (or the loop that owned the old workers is gone):
+        # anything still in flight there can no longer be delivered.
+        for st in self.statuses.values():
+            if st.state in (QUEUED, SENDING):
+                st.state, st.error = FAILED, "dispatcher restarted"
+        self._pending = 0
+        self.pool.bind()
+        self._bucket = _TokenBucket(self.rate_per_second)
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.pool.size)]
+
+    async def stop(self) -> None:
+        for w in self._workers:
+            w.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        await self.pool.close()
+
+    async def join(self) -> None:
+        """Wait until every submitted message is sent or has failed (tests / shutdown drains)."""
+        while self._pending:
+            await asyncio.sleep(0.01)
+
+    # ── Submission ────────────────────────────────────────────────────────────
+    def submit(self, messages: Iterable[OutboundEmail]) -> str:
+        """
+        Enqueue a batch and return its dispatch id.  Must be called on the
+        event loop.  Raises QueueFullError if the batch would exceed max_queue.
+        """
+        self._prune()
+        messages = list(messages)
+        keys = list(dict.fromkeys(m.key for m in messages))
+        fresh: Dict[str, OutboundEmail] = {}
+        for m in messages:
+            st = self.statuses.get(m.key)
+            if m.key not in fresh and (st is None or st.state == FAILED):
+                fresh[m.key] = m
+        if self._pending + len(fresh) > self.max_queue:
+            raise QueueFullError(f"{self._pending} messages already queued (limit {self.max_queue}).")
+
+        self._ensure_started()
+        for m in fresh.values():
+            self.statuses[m.key] = MessageStatus(m.key, m.to, m.candidate_id, m.decision)
+            self._pending += 1
+            self._queue.put_nowait(m)
+        batch_id = str(uuid.uuid4())
+        self.batches[batch_id] = {"keys": keys, "duplicates": len(keys) - len(fresh), "created_at": time.time()}
+        logger.info(f"email dispatch {batch_id}: queued={len(fresh)}, duplicate={len(keys) - len(fresh)}")
+        return batch_id
+
+    def batch_status(self, batch_id: str) -> Optional[dict]:
+        batch = self.batches.get(batch_id)
+        if batch is None:
+            return None
+        counts = {QUEUED: 0, SENDING: 0, SENT: 0, FAILED: 0}
+        messages = []
+        for k in batch["keys"]:
+            st = self.statuses[k]
+            counts[st.state] += 1
+            messages.append(st.as_dict())
+        return {
+            "dispatch_id": batch_id,
+            "total": len(batch["keys"]),
+            "duplicates": batch["duplicates"],
+            "counts": counts,
+            "messages": messages,
+        }
+
+    def _prune(self, force: bool = False) -> None:
+        """
+        Forget dispatches older than retention_seconds whose messages have all
+        finished, then finished messages that old which no kept dispatch lists.
+        Runs at most once per PRUNE_INTERVAL unless forced.
+        """
+        now = time.time()
+        if self.retention_seconds <= 0 or (not force and now - self._pruned_at < PRUNE_INTERVAL):
+            return
+        self._pruned_at = now
+        cutoff = now - self.retention_seconds
+        expired = [
+            batch_id for batch_id, batch in self.batches.items()
+            if batch["created_at"] < cutoff and all(self.statuses[k].state in FINISHED for k in batch["keys"])
+        ]
+        for batch_id in expired:
+            del self.batches[batch_id]
+        listed = {k for batch in self.batches.values() for k in batch["keys"]}
+        stale = [
+            k for k, st in self.statuses.items()
+            if st.state in FINISHED and st.updated_at < cutoff and k not in listed
+        ]
+        for k in stale:
+            del self.statuses[k]
+        if expired or stale:
+            logger.info(f"email dispatch: forgot {len(expired)} dispatch(es), {len(stale)} message status(es)")
+
+    def stats(self) -> dict:
+        return {"pending": self._pending, "max_queue": self.max_queue, "connections_opened": self.pool.connects}
+
+    # ── Workers ───────────────────────────────────────────────────────────────
+    def _build(self, m: OutboundEmail) -> EmailMessage:
+        msg = EmailMessage()
+        msg["From"] = self.sender
+        msg["To"] = m.to
+        msg["Subject"] = m.subject
+        msg["Message-ID"] = f"<{m.key}@recruiter-ai>"
+        msg["X-Idempotency-Key"] = m.key
+        msg.set_content(m.body)
+        return msg
+
+    async def _worker(self, n: int) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                conn = await self.pool.acquire()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:   # can't connect: the whole batch is retried
+                logger.warning(f"email worker {n}: {exc}")
+                for m in batch:
+                    self.statuses[m.key].attempts += 1
+                    self._retry_or_fail(m, str(exc))
+                continue
+            await self._send_batch(conn, batch)
+
+    async def _send_batch(self, conn, batch: List[OutboundEmail]) -> None:
+        import aiosmtplib
+
+        broken = False
+        try:
+            for i, m in enumerate(batch):
+                status = self.statuses[m.key]
+                await self._bucket.acquire()
+                status.state, status.attempts = SENDING, status.attempts + 1
+                try:
+                    await conn.send_message(self._build(m))
+                except (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused) as exc:
+                    # one recipient per message, so a refusal carries exactly one response
+                    resp = exc.recipients[0] if isinstance(exc, aiosmtplib.SMTPRecipientsRefused) else exc
+                    if 500 <= resp.code < 600:
+                        self._fail(m, f"{resp.code} {resp.message}")
+                    else:
+                        self._retry_or_fail(m, f"{resp.code} {resp.message}")
+                    continue
+                except (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, OSError) as exc:
+                    broken = True
+                    for rest in batch[i:]:
+                        self._retry_or_fail(rest, str(exc))
+                    return
+                except Exception as exc:
+                    self._retry_or_fail(m, str(exc))
+                    continue
+                status.state, status.error, status.updated_at = SENT, "", time.time()
+                self._done()
+        finally:
+            await self.pool.release(conn, broken=broken)
+
+    def _done(self) -> None:
+        self._pending -= 1
+
+    def _fail(self, m: OutboundEmail, error: str) -> None:
+        st = self.statuses[m.key]
+        st.state, st.error, st.updated_at = FAILED, error, time.time()
+        self._done()
+        logger.warning(f"email to {m.to} failed: {error}")
+
+    def _retry_or_fail(self, m: OutboundEmail, error: str) -> None:
+        st = self.statuses[m.key]
+        if st.attempts >= self.max_retries + 1:
+            self._fail(m, error)
+            return
+        st.state, st.error, st.updated_at = QUEUED, error, time.time()
+        delay = self.retry_backoff * (2 ** max(st.attempts - 1, 0))
+        asyncio.get_running_loop().call_later(delay, self._queue.put_nowait, m)
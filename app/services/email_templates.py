@@ -0,0 +1,122 @@
+"""
+Precompiled e-mail templates for finalize previews.
+
+Templates use str.format-style placeholders:
+  • job fields       – {job_title}           (filled once at compile time)
+  • candidate fields – {name}, {email}        (filled per candidate)
+
+compile_template() turns a subject/body pair into a list of literal chunks
+and candidate-field slots, so rendering one letter is a single "".join with
+no parsing.  Compiled templates are cached per (job_title, subject, body).
+"""
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, Optional, Tuple
+
+JOB_FIELDS = ("job_title",)
+CANDIDATE_FIELDS = ("name", "email")
+
+DEFAULT_TEMPLATES: Dict[str, Dict[str, str]] = {
+    "Interview": {
+        "subject": "Interview Invitation — {job_title}",
+        "body": (
+            "Dear {name},\n\n"
+            "Thank you for your interest in the {job_title} position. "
+            "We were impressed with your background and would like to invite you for an interview.\n\n"
+            "Please confirm your availability for the proposed time below.\n\n"
+            "Best regards,\nHiring Team"
+        ),
+    },
+    "Hold": {
+        "subject": "Your application — {job_title}",
+        "body": (
+            "Dear {name},\n\n"
+            "Thank you for applying for the {job_title} position. "
+            "Your application is still under review and we will be in touch as soon as we have an update.\n\n"
+            "Best regards,\nHiring Team"
+        ),
+    },
+    "Reject": {
+        "subject": "Your application — {job_title}",
+        "body": (
+            "Dear {name},\n\n"
+            "Thank you for your interest in the {job_title} position and for the time you invested in applying. "
+            "After careful review, we have decided not to move forward with your application at this time.\n\n"
+            "We wish you every success in your search.\n\n"
+            "Best regards,\nHiring Team"
+        ),
+    },
+}
+
+
+class TemplateError(ValueError):
+    pass
+
+
+def _compile_text(text: str, job_values: Dict[str, str]) -> Tuple:
+    """
+    → tuple of str (literal) and int (index into CANDIDATE_FIELDS) parts.
+    Adjacent literals are merged so rendering touches as few pieces as possible.
+    """
+    parts = []
+    try:
+        parsed = list(Formatter().parse(text))
+    except ValueError as exc:
+        raise TemplateError(f"Bad template: {exc}")
+    for literal, field, spec, conv in parsed:
+        if literal:
+            parts.append(literal)
+        if field is None:
+            continue
+        if spec or conv:
+            raise TemplateError(f"Format specs are not supported: {{{field}}}")
+        if field in job_values:
+            parts.append(job_values[field])
+        elif field in CANDIDATE_FIELDS:
+            parts.append(CANDIDATE_FIELDS.index(field))
+        else:
+            raise TemplateError(
+                f"Unknown placeholder {{{field}}}; use {', '.join('{%s}' % f for f in JOB_FIELDS + CANDIDATE_FIELDS)}"
+            )
+    merged = []
+    for p in parts:
+        if merged and isinstance(p, str) and isinstance(merged[-1], str):
+            merged[-1] += p
+        else:
+            merged.append(p)
+    return tuple(merged)
+
+
+class CompiledTemplate:
+    __slots__ = ("subject", "body")
+
+    def __init__(self, subject: Tuple, body: Tuple):
+        self.subject = subject
+        self.body = body
+
+    @staticmethod
+    def _render(parts: Tuple, values: Tuple[str, ...]) -> str:
+        return "".join(values[p] if isinstance(p, int) else p for p in parts)
+
+    def render(self, name: Optional[str], email: Optional[str]) -> Tuple[str, str]:
+        values = (name or "Candidate", email or "")
+        return self._render(self.subject, values), self._render(self.body, values)
+
+
+@lru_cache(maxsize=1024)
+def compile_template(job_title: str, subject: str, body: str) -> CompiledTemplate:
+    job_values = {"job_title": job_title}
+    return CompiledTemplate(_compile_text(subject, job_values), _compile_text(body, job_values))
+
+
+def templates_for(job_title: str, overrides: Optional[Dict[str, Dict[str, str]]] = None) -> Dict[str, CompiledTemplate]:
+    """Compiled template per decision, with per-job overrides layered on the defaults."""
+    compiled = {}
+    for decision, default in DEFAULT_TEMPLATES.items():
+        custom = (overrides or {}).get(decision) or {}
+        compiled[decision] = compile_template(
+            job_title,
+            custom.get("subject", default["subject"]),
+            custom.get("body", default["body"]),
+        )
+    return compiled
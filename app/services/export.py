@@ -0,0 +1,170 @@
+"""
+Bulk export of session candidates for ATS imports.
+
+Every format is a generator over CandidateTable rows in rank order, so the
+response streams and only one chunk is ever held in memory:
+
+  • csv      – header + one line per candidate (skills joined with "; ")
+  • ndjson   – one JSON object per line, same shape as GET /session/{sid}
+  • parquet  – columnar, one row group per PARQUET_BATCH_ROWS candidates;
+               needs the optional `pyarrow` package
+
+Columns are any subset of EXPORT_COLUMNS, in the order requested.
+"""
+import csv
+import io
+import json
+from typing import Iterator, List, Optional, Sequence
+
+from app.services.session_store import SCORE_COLUMNS, CandidateTable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover – orjson is in requirements.txt
+    orjson = None
+
+EXPORT_COLUMNS = (
+    "candidate_id", "filename", "name", "email", "experience_years", "skills", "education",
+    *SCORE_COLUMNS,
+    "verdict", "flags", "reasoning", "decision",
+)
+FORMATS = {
+    "csv":     ("text/csv; charset=utf-8", "csv"),
+    "ndjson":  ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+CHUNK_ROWS = 500            # csv / ndjson rows per yielded chunk
+PARQUET_BATCH_ROWS = 10_000
+
+
+class ExportError(ValueError):
+    pass
+
+
+def parse_columns(columns: Optional[str]) -> List[str]:
+    """Comma-separated column list → validated, de-duplicated list (None → all)."""
+    if not columns:
+        return list(EXPORT_COLUMNS)
+    wanted = list(dict.fromkeys(c.strip() for c in columns.split(",") if c.strip()))
+    bad = [c for c in wanted if c not in EXPORT_COLUMNS]
+    if bad or not wanted:
+        raise ExportError(f"Unknown export column(s): {', '.join(bad) or '(none given)'}.")
+    return wanted
+
+
+def _records(table: CandidateTable, rows: Sequence[int], columns: List[str]) -> Iterator[dict]:
+    exclude = frozenset(EXPORT_COLUMNS).difference(columns)
+    for row in rows:
+        record = table.row_dict(row, exclude)
+        yield {c: record[c] for c in columns}
+
+
+def iter_csv(table: CandidateTable, rows: Sequence[int], columns: List[str]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    skills_at = columns.index("skills") if "skills" in columns else None
+    for n, record in enumerate(_records(table, rows, columns), 1):
+        values = list(record.values())
+        if skills_at is not None:
+            values[skills_at] = "; ".join(values[skills_at])
+        writer.writerow(values)
+        if n % CHUNK_ROWS == 0:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue().encode("utf-8")
+
+
+def _dumps_line(record: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def iter_ndjson(table: CandidateTable, rows: Sequence[int], columns: List[str]) -> Iterator[bytes]:
+    chunk: List[bytes] = []
+    for record in _records(table, rows, columns):
+        chunk.append(_dumps_line(record))
+        if len(chunk) == CHUNK_ROWS:
+            yield b"".join(chunk)
+            chunk.clear()
+    if chunk:
+        yield b"".join(chunk)
+
+
+class _Drain:
+    """Write-only file object for ParquetWriter; hands out what was written so far."""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts.clear()
+        return out
+
+
+def _arrow_schema(pa, columns: List[str]):
+    types = {c: pa.int16() for c in SCORE_COLUMNS}
+    types.update(experience_years=pa.float64(), skills=pa.list_(pa.string()))
+    return pa.schema([(c, types.get(c, pa.string())) for c in columns])
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportError("Parquet export needs the optional 'pyarrow' package.")
+    return pa, pq
+
+
+def iter_parquet(table: CandidateTable, rows: Sequence[int], columns: List[str]) -> Iterator[bytes]:
+    pa, pq = _require_pyarrow()
+    schema = _arrow_schema(pa, columns)
+    sink = _Drain()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+    try:
+        batch: List[dict] = []
+        for record in _records(table, rows, columns):
+            if isinstance(record.get("experience_years"), str):   # '5+' has no float64 value
+                record["experience_years"] = None
+            batch.append(record)
+            if len(batch) == PARQUET_BATCH_ROWS:
+                writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+                batch.clear()
+                yield sink.take()
+        if batch or not rows:
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+def export_stream(fmt: str, table: CandidateTable, rows: Sequence[int], columns: List[str]) -> Iterator[bytes]:
+    if fmt == "csv":
+        return iter_csv(table, rows, columns)
+    if fmt == "ndjson":
+        return iter_ndjson(table, rows, columns)
+    if fmt == "parquet":
+        _require_pyarrow()   # fail before any response bytes are sent
+        return iter_parquet(table, rows, columns)
+    raise ExportError(f"Unknown export format '{fmt}'; use csv, ndjson or parquet.")
@@ -0,0 +1,307 @@
+"""
+Local Gemini stand-in for load testing.
+
+Replies to the JD / resume / evaluation prompts llm_service sends with
+plausible, deterministic JSON, and simulates what the real API does under
+load:
+
+  • latency          – fixed, uniform or lognormal (median + p99), per call
+  • tokens/second    – extra time proportional to the reply length
+  • 429 rate         – fraction of calls that fail with "429 Resource exhausted"
+  • malformed rate   – fraction of replies wrapped in prose / fences, given a
+                       trailing comma, or truncated mid-object
+
+In-process:  LLM_BACKEND=fake (FakeGeminiModel replaces the Gemini model)
+Over HTTP:   python -m app.services.fake_llm --port 8090 [--latency-ms ...]
+             then LLM_BACKEND=fake FAKE_LLM_URL=http://127.0.0.1:8090
+The HTTP server speaks the generateContent REST shape, so the same server
+works with any client that can target a custom endpoint.
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import asdict, dataclass, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+Z_99 = 2.326   # standard normal 99th percentile
+
+SKILLS = [
+    "Python", "JavaScript", "TypeScript", "SQL", "PostgreSQL", "Machine Learning", "React",
+    "Docker", "Kubernetes", "AWS", "TensorFlow", "PyTorch", "Node.js", "Git", "REST APIs",
+    "FastAPI", "Data Analysis", "CI/CD", "Java", "Go", "Terraform", "Linux",
+]
+
+
+class RateLimitedError(RuntimeError):
+    """Raised for an injected 429; the message matches what llm_service looks for."""
+
+    def __init__(self):
+        super().__init__("429 Resource has been exhausted (e.g. check quota).")
+
+
+@dataclass
+class FakeLLMConfig:
+    latency_ms: float = 800          # median (lognormal) / mean (fixed, uniform)
+    latency_p99_ms: float = 2500     # lognormal only
+    distribution: str = "lognormal"
+    rate_429: float = 0.0
+    malformed_rate: float = 0.0
+    tokens_per_second: float = 0.0   # 0 → reply arrives as soon as the latency elapses
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(f"distribution must be one of {', '.join(DISTRIBUTIONS)}")
+
+    @classmethod
+    def from_settings(cls, settings) -> "FakeLLMConfig":
+        return cls(
+            latency_ms=settings.FAKE_LLM_LATENCY_MS,
+            latency_p99_ms=settings.FAKE_LLM_LATENCY_P99_MS,
+            distribution=settings.FAKE_LLM_LATENCY_DIST,
+            rate_429=settings.FAKE_LLM_429_RATE,
+            malformed_rate=settings.FAKE_LLM_MALFORMED_RATE,
+            tokens_per_second=settings.FAKE_LLM_TOKENS_PER_SECOND,
+            seed=settings.FAKE_LLM_SEED,
+        )
+
+
+# ── Reply content ─────────────────────────────────────────────────────────────
+
+def _h(text: str) -> int:
+    return int(hashlib.md5(text.encode()).hexdigest(), 16)
+
+
+def _skills_in(text: str):
+    lower = text.lower()
+    return [s for s in SKILLS if s.lower() in lower]
+
+
+def _after(prompt: str, marker: str) -> str:
+    idx = prompt.find(marker)
+    return prompt[idx + len(marker):] if idx >= 0 else prompt
+
+
+def _jd_reply(prompt: str) -> dict:
+    text = _after(prompt, "JD:")
+    found = _skills_in(text) or [SKILLS[(_h(text) >> i) % len(SKILLS)] for i in range(5)]
+    lo = 1 + _h(text + "exp") % 4
+    return {
+        "required_skills": found[:6],
+        "nice_to_have_skills": found[6:10],
+        "min_experience": lo,
+        "max_experience": lo + 3,
+        "role_level": ("Junior", "Mid", "Senior")[_h(text) % 3],
+    }
+
+
+def _resume_reply(prompt: str) -> dict:
+    text = _after(prompt, "Resume:")
+    h = _h(text)
+    email = re.search(r"[\w.+-]+@[\w-]+\.[a-z]{2,}", text)
+    years = re.search(r"(\d{1,2})\+?\s*years", text)
+    first = next((line.strip() for line in text.splitlines() if line.strip()), "")
+    name = first[:40] if first and len(first.split()) <= 4 else f"Candidate {h % 10000}"
+    return {
+        "name": name,
+        "email": email.group(0) if email else f"candidate{h % 10000}@example.com",
+        "total_experience_years": int(years.group(1)) if years else h % 12,
+        "skills": _skills_in(text) or [SKILLS[(h >> i) % len(SKILLS)] for i in range(4)],
+        "education": ("B.Sc. Computer Science", "B.Tech. IT", "M.Sc. Data Science")[h % 3],
+    }
+
+
+def _eval_reply(prompt: str) -> dict:
+    req = re.search(r"req=(.*?) exp=", prompt)
+    have = re.search(r"skills=(.*?) exp=", prompt)
+    required = {s.strip().lower() for s in (req.group(1) if req else "").split(",") if s.strip()}
+    skills = {s.strip().lower() for s in (have.group(1) if have else "").split(",") if s.strip()}
+    overlap = len(required & skills) / len(required) if required else 0.5
+    h = _h(prompt)
+    scores = {
+        "skill_score": round(40 * overlap),
+        "experience_score": 8 + h % 13,
+        "project_score": 5 + (h >> 4) % 11,
+        "education_score": 4 + (h >> 8) % 7,
+        "role_score": 6 + (h >> 12) % 10,
+    }
+    total = sum(scores.values())
+    verdict = "Strong Yes" if total >= 80 else "Yes" if total >= 65 else "Maybe" if total >= 50 else "No"
+    return {**scores, "total_score": total, "verdict": verdict,
+            "flags": "" if overlap >= 0.5 else "Missing Required Skills",
+            "reasoning": f"Matches {round(overlap * 100)}% of required skills."}
+
+
+def reply_for(prompt: str) -> dict:
+    """The JSON object the real model would be asked to produce for this prompt."""
+    if prompt.startswith("Extract hiring criteria"):
+        return _jd_reply(prompt)
+    if prompt.startswith("Extract candidate info"):
+        return _resume_reply(prompt)
+    if prompt.startswith("Score candidate"):
+        return _eval_reply(prompt)
+    return {"text": "ok"}
+
+
+def _malform(text: str, rng: random.Random) -> str:
+    kind = rng.randrange(3)
+    if kind == 0:
+        return f"Sure! Here is the JSON you asked for:\n```json\n{text}\n```\nLet me know if you need anything else."
+    if kind == 1:
+        return text[:-1] + ",}"
+    return text[: max(1, int(len(text) * rng.uniform(0.3, 0.9)))]
+
+
+# ── In-process model ──────────────────────────────────────────────────────────
+
+class _Reply:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """Drop-in for genai.GenerativeModel: generate_content(prompt).text"""
+
+    def __init__(self, config: Optional[FakeLLMConfig] = None, sleep: Callable[[float], None] = time.sleep):
+        self.config = config or FakeLLMConfig()
+        self.sleep = sleep
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "rate_limited": 0, "malformed": 0}
+
+    def _latency_ms(self) -> float:
+        cfg = self.config
+        if cfg.distribution == "fixed" or cfg.latency_ms <= 0:
+            return max(cfg.latency_ms, 0.0)
+        if cfg.distribution == "uniform":
+            return self._rng.uniform(0.5 * cfg.latency_ms, 1.5 * cfg.latency_ms)
+        # lognormal with the given median and 99th percentile
+        sigma = math.log(max(cfg.latency_p99_ms, cfg.latency_ms) / cfg.latency_ms) / Z_99
+        return cfg.latency_ms * math.exp(self._rng.gauss(0, sigma))
+
+    def _draw(self):
+        cfg = self.config
+        with self._lock:
+            self.stats["calls"] += 1
+            latency = self._latency_ms()
+            limited = self._rng.random() < cfg.rate_429
+            malformed = not limited and self._rng.random() < cfg.malformed_rate
+            if limited:
+                self.stats["rate_limited"] += 1
+            if malformed:
+                self.stats["malformed"] += 1
+            return latency / 1000, limited, malformed, random.Random(self._rng.random())
+
+    def respond(self, prompt: str):
+        """(status, text) for one call, after sleeping the simulated latency."""
+        latency, limited, malformed, rng = self._draw()
+        if limited:
+            self.sleep(latency)
+            return 429, RateLimitedError().args[0]
+        text = json.dumps(reply_for(prompt))
+        if self.config.tokens_per_second > 0:
+            latency += (len(text) / 4) / self.config.tokens_per_second
+        self.sleep(latency)
+        return 200, _malform(text, rng) if malformed else text
+
+    def generate_content(self, prompt: str) -> _Reply:
+        status, text = self.respond(prompt)
+        if status == 429:
+            raise RateLimitedError()
+        return _Reply(text)
+
+
+# ── HTTP server / client ──────────────────────────────────────────────────────
+
+def make_server(model: FakeGeminiModel, host: str = "127.0.0.1", port: int = 8090) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if not self.path.split("?")[0].endswith(":generateContent"):
+                self.send_error(404)
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            prompt = "".join(
+                part.get("text", "") for c in body.get("contents", []) for part in c.get("parts", [])
+            )
+            status, text = model.respond(prompt)
+            if status == 429:
+                payload = {"error": {"code": 429, "message": text, "status": "RESOURCE_EXHAUSTED"}}
+            else:
+                payload = {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+class HTTPFakeModel:
+    """generate_content() against a fake server started with `python -m app.services.fake_llm`."""
+
+    def __init__(self, base_url: str, model: str = "gemini-2.0-flash", timeout: float = 60):
+        self.url = f"{base_url.rstrip('/')}/v1beta/models/{model}:generateContent"
+        self.timeout = timeout
+
+    def generate_content(self, prompt: str) -> _Reply:
+        body = json.dumps({"contents": [{"role": "user", "parts": [{"text": prompt}]}]}).encode()
+        request = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as resp:
+                payload = json.loads(resp.read())
+        except urllib.error.HTTPError as exc:
+            if exc.code == 429:
+                raise RateLimitedError()
+            raise RuntimeError(f"{exc.code} {exc.reason}")
+        return _Reply(payload["candidates"][0]["content"]["parts"][0]["text"])
+
+
+def build_fake_model(settings):
+    """The model llm_service uses when LLM_BACKEND=fake."""
+    if settings.FAKE_LLM_URL:
+        return HTTPFakeModel(settings.FAKE_LLM_URL, settings.GEMINI_MODEL)
+    return FakeGeminiModel(FakeLLMConfig.from_settings(settings))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Fake Gemini generateContent server for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    defaults = FakeLLMConfig()
+    for f in fields(FakeLLMConfig):
+        flag = "--" + f.name.replace("_", "-")
+        if f.name == "distribution":
+            parser.add_argument(flag, choices=DISTRIBUTIONS, default=defaults.distribution)
+        elif f.name == "seed":
+            parser.add_argument(flag, type=int, default=None)
+        else:
+            parser.add_argument(flag, type=float, default=getattr(defaults, f.name))
+    args = vars(parser.parse_args(argv))
+    host, port = args.pop("host"), args.pop("port")
+    config = FakeLLMConfig(**args)
+    server = make_server(FakeGeminiModel(config), host, port)
+    print(f"fake Gemini on http://{host}:{port}  {asdict(config)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Durable local queue of analysis jobs, shared by the API and worker processes.
+
+One SQLite file (JOB_QUEUE_PATH, WAL mode) holds:
+  • jobs       – id, kind, status (queued → running → done | failed), JSON
+                 payload and result, attempts, progress and the lease of the
+                 worker running it
+  • job_files  – the uploaded files (filename + bytes) of a job; dropped
+                 once the job has finished (or been given up on)
+
+Finished jobs, results included, are deleted retention_seconds after they
+finished (JOB_RETENTION_SECONDS); workers sweep them out while polling.
+
+claim() hands the oldest queued job to one worker inside an IMMEDIATE
+transaction, so any number of processes can poll the same file.  A running
+job whose lease runs out (its worker died) is claimed again, up to
+max_attempts.  Every call opens its own short-lived connection, so a
+JobQueue can be shared between threads.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+PRUNE_INTERVAL = 60.0   # seconds between retention sweeps
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          TEXT PRIMARY KEY,
+    kind        TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    session_id  TEXT,
+    payload     TEXT NOT NULL,
+    result      TEXT,
+    error       TEXT,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    progress    INTEGER NOT NULL DEFAULT 0,
+    total       INTEGER NOT NULL DEFAULT 0,
+    worker      TEXT,
+    lease_until REAL,
+    created_at  REAL NOT NULL,
+    started_at  REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_at);
+CREATE INDEX IF NOT EXISTS jobs_session ON jobs (session_id);
+CREATE TABLE IF NOT EXISTS job_files (
+    job_id   TEXT NOT NULL,
+    idx      INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    content  BLOB NOT NULL,
+    PRIMARY KEY (job_id, idx)
+);
+"""
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str
+    session_id: Optional[str]
+    payload: dict
+    result: Optional[dict]
+    error: Optional[str]
+    attempts: int
+    progress: int
+    total: int
+    worker: Optional[str]
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        return cls(
+            id=row["id"], kind=row["kind"], status=row["status"], session_id=row["session_id"],
+            payload=json.loads(row["payload"]), result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"], attempts=row["attempts"], progress=row["progress"], total=row["total"],
+            worker=row["worker"], created_at=row["created_at"], started_at=row["started_at"],
+            finished_at=row["finished_at"],
+        )
+
+
+class JobQueue:
+    def __init__(self, path: str, lease_seconds: float = 300, max_attempts: int = 3,
+                 retention_seconds: float = 86_400):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retention_seconds = retention_seconds   # 0 → keep finished jobs forever
+        self._pruned_at = 0.0
+        self._ready = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _connect(self, immediate: bool = False):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            if not self._ready:   # the file is only created once the queue is first used
+                with self._lock:
+                    if not self._ready:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(SCHEMA)
+                        self._ready = True
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    # ── API side ──────────────────────────────────────────────────────────────
+    def enqueue(self, kind: str, payload: dict, files: List[Tuple[str, bytes]],
+                session_id: Optional[str] = None, total: int = 0) -> str:
+        job_id = str(uuid.uuid4())
+        with self._connect(immediate=True) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, session_id, payload, total, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, session_id, json.dumps(payload), total, time.time()),
+            )
+            conn.executemany(
+                "INSERT INTO job_files (job_id, idx, filename, content) VALUES (?, ?, ?, ?)",
+                [(job_id, i, name, sqlite3.Binary(content)) for i, (name, content) in enumerate(files)],
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row else None
+
+    def for_session(self, session_id: str) -> Optional[Job]:
+        """The latest job creating session_id, or None."""
+        if not os.path.exists(self.path):
+            return None
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE session_id = ? ORDER BY created_at DESC LIMIT 1",
+                               (session_id,)).fetchone()
+        return Job.from_row(row) if row else None
+
+    def counts(self) -> Dict[str, int]:
+        """Jobs per status ({} before the queue file exists)."""
+        if not os.path.exists(self.path):
+            return {}
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    # ── Worker side ───────────────────────────────────────────────────────────
+    def claim(self, worker: str) -> Optional[Job]:
+        """The oldest runnable job, now leased to `worker`; None if there is nothing to do."""
+        now = time.time()
+        self.prune()
+        with self._connect(immediate=True) as conn:
+            # jobs whose worker vanished too often are given up on, and their uploads dropped
+            lost = [r["id"] for r in conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                (RUNNING, now, self.max_attempts),
+            )]
+            for job_id in lost:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_until = NULL WHERE id = ?",
+                    (FAILED, "Worker lost (lease expired) too many times.", now, job_id),
+                )
+                conn.execute("DELETE FROM job_files WHERE job_id = ?", (job_id,))
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? OR (status = ? AND lease_until < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (QUEUED, RUNNING, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, lease_until = ?, attempts = attempts + 1, "
+                "started_at = ?, progress = 0 WHERE id = ?",
+                (RUNNING, worker, now + self.lease_seconds, now, row["id"]),
+            )
+            job = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+        return Job.from_row(job)
+
+    def files(self, job_id: str) -> List[Tuple[str, bytes]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT filename, content FROM job_files WHERE job_id = ? ORDER BY idx", (job_id,)
+            ).fetchall()
+        return [(row["filename"], bytes(row["content"])) for row in rows]
+
+    def heartbeat(self, job_id: str, worker: str, progress: int) -> bool:
+        """Record progress and extend the lease; False if the job is no longer this worker's."""
+        with self._connect(immediate=True) as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET progress = ?, lease_until = ? WHERE id = ? AND worker = ? AND status = ?",
+                (progress, time.time() + self.lease_seconds, job_id, worker, RUNNING),
+            )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: str, worker: str, result: dict) -> bool:
+        return self._finish(job_id, worker, DONE, result=json.dumps(result))
+
+    def fail(self, job_id: str, worker: str, error: str, retry: bool = False) -> bool:
+        """Mark a job failed, or put it back in the queue if `retry` and attempts are left."""
+        with self._connect(immediate=True) as conn:
+            row = conn.execute("SELECT attempts FROM jobs WHERE id = ? AND worker = ? AND status = ?",
+                               (job_id, worker, RUNNING)).fetchone()
+            if row is not None and retry and row["attempts"] < self.max_attempts:
+                conn.execute("UPDATE jobs SET status = ?, error = ?, worker = NULL, lease_until = NULL "
+                             "WHERE id = ?", (QUEUED, error[:500], job_id))
+                return True
+        return self._finish(job_id, worker, FAILED, error=error[:500])
+
+    def prune(self, force: bool = False) -> int:
+        """
+        Delete jobs that finished more than retention_seconds ago; returns how
+        many.  Runs at most once per PRUNE_INTERVAL unless forced.
+        """
+        now = time.time()
+        if self.retention_seconds <= 0 or (not force and now - self._pruned_at < PRUNE_INTERVAL):
+            return 0
+        self._pruned_at = now
+        with self._connect(immediate=True) as conn:
+            old = [r["id"] for r in conn.execute(
+                "SELECT id FROM jobs WHERE finished_at < ? AND status IN (?, ?)",
+                (now - self.retention_seconds, DONE, FAILED),
+            )]
+            conn.executemany("DELETE FROM job_files WHERE job_id = ?", [(i,) for i in old])
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(i,) for i in old])
+        return len(old)
+
+    def _finish(self, job_id: str, worker: str, status: str, result: Optional[str] = None,
+                error: Optional[str] = None) -> bool:
+        with self._connect(immediate=True) as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, lease_until = NULL "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (status, result, error, time.time(), job_id, worker, RUNNING),
+            )
+            if cur.rowcount == 1:
+                conn.execute("DELETE FROM job_files WHERE job_id = ?", (job_id,))
+        return cur.rowcount == 1
@@ -0,0 +1,152 @@
+"""
+Tolerant JSON recovery for LLM responses.
+
+loads_lenient() tries a plain json.loads first.  When that fails it pulls the
+first JSON object/array out of the response and repairs what models commonly
+get wrong, in one pass over the text:
+
+  • code fences and prose before / after the JSON
+  • trailing commas before } or ]
+  • // and /* */ comments
+  • Python literals (True / False / None)
+  • truncation – the document is cut back to the last complete value and the
+    open strings / brackets are closed
+
+Anything it cannot recover raises JSONRecoveryError.
+"""
+import json
+import re
+from typing import Any, List, Tuple
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", re.S)
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_TOKEN_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+-.")
+
+
+class JSONRecoveryError(ValueError):
+    pass
+
+
+def _strip_fences(raw: str) -> str:
+    match = _FENCE.search(raw)
+    return match.group(1) if match else raw
+
+
+def _first_container(text: str) -> int:
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    return min(starts) if starts else -1
+
+
+def _trim_comma(out: List[str]) -> None:
+    """Drop trailing whitespace and one dangling comma from the output buffer."""
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+def _scan(text: str, start: int) -> Tuple[str, bool]:
+    """
+    Copy the container starting at text[start] into a cleaned string.
+    Returns (json_text, complete); on truncation json_text is cut back to the
+    last complete value and closed.
+    """
+    out: List[str] = []
+    closers: List[str] = []          # pending "}" / "]"
+    expect_key: List[bool] = []      # per level: next string is an object key
+    safe_len, safe_closers = 0, ""   # last point where the document can be closed
+    in_str = False
+    i, n = start, len(text)
+
+    def mark_safe():
+        nonlocal safe_len, safe_closers
+        safe_len, safe_closers = len(out), "".join(reversed(closers))
+
+    while i < n:
+        ch = text[i]
+        if in_str:
+            if ch == "\\":
+                if i + 1 >= n:
+                    break
+                out.append(text[i:i + 2])
+                i += 2
+                continue
+            out.append(ch)
+            if ch == '"':
+                in_str = False
+                if not (expect_key and expect_key[-1]):
+                    mark_safe()
+            elif ch == "\n":
+                out[-1] = "\\n"      # raw newline inside a string
+            i += 1
+            continue
+
+        if ch == '"':
+            in_str = True
+            out.append(ch)
+        elif ch in "{[":
+            closers.append("}" if ch == "{" else "]")
+            expect_key.append(ch == "{")
+            out.append(ch)
+            mark_safe()   # an empty container closes cleanly
+        elif ch in "}]":
+            if not closers:
+                break
+            _trim_comma(out)
+            out.append(closers.pop())
+            expect_key.pop()
+            if not closers:
+                return "".join(out), True
+            mark_safe()
+        elif ch == ",":
+            out.append(ch)
+            if expect_key:
+                expect_key[-1] = closers[-1] == "}"
+        elif ch == ":":
+            out.append(ch)
+            if expect_key:
+                expect_key[-1] = False
+        elif ch == "/" and text.startswith("//", i):
+            end = text.find("\n", i)
+            i = n if end < 0 else end
+            continue
+        elif ch == "/" and text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            continue
+        elif ch in _TOKEN_CHARS:
+            j = i
+            while j < n and text[j] in _TOKEN_CHARS:
+                j += 1
+            token = text[i:j]
+            out.append(_LITERALS.get(token, token))
+            i = j
+            if j < n:          # a token running into the end may be cut short
+                mark_safe()
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    if not safe_len:
+        raise JSONRecoveryError("No complete JSON value in response.")
+    head = out[:safe_len]
+    _trim_comma(head)
+    return "".join(head) + safe_closers, False
+
+
+def loads_lenient(raw: str) -> Tuple[Any, bool]:
+    """Parse an LLM response; returns (value, repaired)."""
+    try:
+        return json.loads(raw), False
+    except ValueError:
+        pass
+    text = _strip_fences(raw)
+    start = _first_container(text)
+    if start < 0:
+        raise JSONRecoveryError("No JSON object in response.")
+    cleaned, _ = _scan(text, start)
+    try:
+        return json.loads(cleaned), True
+    except ValueError as exc:
+        raise JSONRecoveryError(f"Unrecoverable JSON: {exc}")
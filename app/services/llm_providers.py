@@ -0,0 +1,195 @@
+"""
+LLM providers: what llm_service sends its prompts to.
+
+A provider is anything with generate_content(prompt) returning a reply with
+`.text` and, when the backend reports it, Gemini-style `.usage_metadata`.
+LLM_BACKEND picks one:
+
+  • gemini  – GeminiProvider (google.generativeai, imported on first build)
+  • fake    – fake_llm.FakeGeminiModel / HTTPFakeModel, for load tests
+  • mock    – no provider: llm_service answers with its deterministic mock
+              data, exactly as with DEMO_MODE=true
+
+With LLM_CASSETTE=path the provider is wrapped in a CassetteProvider:
+
+  • record  – every reply is passed through and saved
+  • replay  – replies are served from the cassette; the wrapped provider is
+              never built, so no SDK import, API key or network is needed
+  • auto    – replay what was recorded, record the rest
+
+The cassette is an append-only JSONL file with one line per reply:
+{"k": prompt hash, "t": reply text, "p": prompt tokens, "o": output tokens}.
+Prompts are not stored (resume text stays out of the file) and the last
+line for a key wins.  Replays are dictionary lookups with the recorded token
+counts, so a production-shaped run re-runs offline at full speed with the
+same token accounting.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from types import SimpleNamespace
+from typing import Callable, Dict, Optional, Protocol, Tuple
+
+from app.lazy import LazyModule
+from app.metrics import REGISTRY
+from app.services.token_usage import usage_from_reply
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("gemini", "fake", "mock")
+CASSETTE_MODES = ("record", "replay", "auto")
+
+CASSETTE_CALLS = REGISTRY.counter(
+    "recruiter_llm_cassette_total", "Cassette lookups by result (hit, miss, recorded).", ("result",),
+)
+
+genai = LazyModule("google.generativeai")
+
+
+class LLMProvider(Protocol):
+    def generate_content(self, prompt: str): ...
+
+
+# ── Gemini ────────────────────────────────────────────────────────────────────
+class GeminiProvider:
+    def __init__(self, api_key: str, model_name: str, timeout: float = 0):
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(
+            model_name=model_name,
+            generation_config={"temperature": 0.1, "response_mime_type": "application/json"},
+        )
+        # transport timeout: closes the connection of a call llm_service has stopped waiting for
+        self.request_options = {"timeout": timeout} if timeout > 0 else None
+
+    def generate_content(self, prompt: str):
+        if self.request_options:
+            return self.model.generate_content(prompt, request_options=self.request_options)
+        return self.model.generate_content(prompt)
+
+
+# ── Record / replay ───────────────────────────────────────────────────────────
+class CassetteMiss(LookupError):
+    """Replay mode was asked for a prompt the cassette has no reply for."""
+
+
+class CassetteReply:
+    def __init__(self, text: str, prompt_tokens: Optional[int] = None, output_tokens: Optional[int] = None):
+        self.text = text
+        self.usage_metadata = (
+            SimpleNamespace(prompt_token_count=prompt_tokens, candidates_token_count=output_tokens)
+            if prompt_tokens is not None and output_tokens is not None else None
+        )
+
+
+class Cassette:
+    """Prompt hash → (reply text, prompt tokens, output tokens), loaded into memory from a JSONL file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, Tuple[str, Optional[int], Optional[int]]] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:   # a line cut short by a crash mid-write
+                        continue
+                    self._entries[row["k"]] = (row["t"], row.get("p"), row.get("o"))
+
+    @staticmethod
+    def key(prompt: str) -> str:
+        return hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+
+    def get(self, prompt: str) -> Optional[CassetteReply]:
+        entry = self._entries.get(self.key(prompt))
+        return CassetteReply(*entry) if entry is not None else None
+
+    def put(self, prompt: str, text: str, prompt_tokens: Optional[int] = None,
+            output_tokens: Optional[int] = None) -> None:
+        key = self.key(prompt)
+        row = {"k": key, "t": text}
+        if prompt_tokens is not None and output_tokens is not None:
+            row.update(p=prompt_tokens, o=output_tokens)
+        line = json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(line)
+            self._entries[key] = (text, row.get("p"), row.get("o"))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CassetteProvider:
+    """Records and/or replays another provider's replies; the wrapped provider is built on first miss."""
+
+    def __init__(self, cassette: Cassette, mode: str, inner: Callable[[], LLMProvider]):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Cassette mode must be one of {', '.join(CASSETTE_MODES)}.")
+        self.cassette = cassette
+        self.mode = mode
+        self._build_inner = inner
+        self._inner: Optional[LLMProvider] = None
+        self._lock = threading.Lock()
+
+    def _provider(self) -> LLMProvider:
+        if self._inner is None:
+            with self._lock:
+                if self._inner is None:
+                    self._inner = self._build_inner()
+        return self._inner
+
+    def generate_content(self, prompt: str):
+        if self.mode != "record":
+            reply = self.cassette.get(prompt)
+            if reply is not None:
+                CASSETTE_CALLS.inc(result="hit")
+                return reply
+            if self.mode == "replay":
+                CASSETTE_CALLS.inc(result="miss")
+                raise CassetteMiss(f"No recorded reply for prompt {Cassette.key(prompt)} in {self.cassette.path}")
+        resp = self._provider().generate_content(prompt)
+        prompt_tokens, output_tokens, estimated = usage_from_reply(resp, prompt)
+        if estimated:
+            self.cassette.put(prompt, resp.text or "")
+        else:
+            self.cassette.put(prompt, resp.text or "", prompt_tokens, output_tokens)
+        CASSETTE_CALLS.inc(result="recorded")
+        return resp
+
+
+# ── Selection ─────────────────────────────────────────────────────────────────
+def _build_backend(settings) -> LLMProvider:
+    if settings.LLM_BACKEND == "fake":
+        from app.services.fake_llm import build_fake_model
+        return build_fake_model(settings)
+    deadlines = (settings.LLM_DEADLINE_JD_SECONDS, settings.LLM_DEADLINE_RESUME_SECONDS,
+                 settings.LLM_DEADLINE_EVAL_SECONDS)
+    return GeminiProvider(settings.GEMINI_API_KEY, settings.GEMINI_MODEL,
+                          0 if min(deadlines) <= 0 else max(deadlines))
+
+
+def describe(settings) -> str:
+    """Human-readable provider choice for logs, e.g. "fake (in-process) via cassette replay"."""
+    if settings.LLM_BACKEND == "fake":
+        name = f"fake ({settings.FAKE_LLM_URL or 'in-process'})"
+    else:
+        name = settings.LLM_BACKEND
+    if settings.LLM_CASSETTE:
+        name += f" via cassette {settings.LLM_CASSETTE_MODE} ({settings.LLM_CASSETTE})"
+    return name
+
+
+def build_provider(settings) -> LLMProvider:
+    """The provider llm_service calls for LLM_BACKEND / LLM_CASSETTE."""
+    if settings.LLM_BACKEND not in BACKENDS:
+        raise ValueError(f"LLM_BACKEND must be one of {', '.join(BACKENDS)}.")
+    if settings.LLM_BACKEND == "mock":
+        raise ValueError("The mock backend makes no model calls.")
+    if settings.LLM_CASSETTE:
+        return CassetteProvider(Cassette(settings.LLM_CASSETTE), settings.LLM_CASSETTE_MODE,
+                                lambda: _build_backend(settings))
+    return _build_backend(settings)
@@ -0,0 +1,184 @@
+"""
+Fair-share scheduling of model calls across sessions.
+
+Every model call takes one of SCHEDULER's LLM_MAX_CONCURRENCY slots (the
+process's share of the Gemini quota) and holds it until the provider
+returns – a call abandoned at its deadline still counts, and so does a
+hedge (which only takes an idle slot, try_acquire()).  While all slots are
+busy, waiting calls are served:
+
+  • by lane – "interactive" (batches of at most LLM_INTERACTIVE_MAX_RESUMES
+    resumes) before "bulk", so a 5-resume check never queues behind a
+    3,000-resume upload; while both lanes wait, every LLM_BULK_EVERY-th
+    slot still goes to bulk, so a steady stream of small batches can't
+    starve the large ones
+  • within a lane, by start-time fair queuing over tenants (sessions, or
+    the batch for /analyze/matrix): a call is tagged
+    max(virtual time, tenant's last finish tag) and moves its tenant on by
+    1/weight, so each tenant gets its weighted share of the slots however
+    many calls it has queued
+
+Idle slots are never held back: with no interactive work waiting, bulk
+calls use all of them.  llm_scope(tenant, interactive) sets the caller
+for the current request (a contextvar, like token_scope), and queue depth,
+busy slots and wait times are exported on /metrics and /health.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Optional, Tuple
+
+from app.config import settings
+from app.metrics import REGISTRY
+
+INTERACTIVE, BULK = "interactive", "bulk"
+LANES = (INTERACTIVE, BULK)   # priority order
+
+QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "recruiter_llm_queue_wait_seconds", "Time model calls waited for a scheduler slot.", ("lane",))
+
+
+class _Waiter:
+    __slots__ = ("tag", "event")
+
+    def __init__(self, tag: float):
+        self.tag = tag
+        self.event = threading.Event()
+
+
+class FairScheduler:
+    def __init__(self, slots: int, bulk_every: int = 5):
+        self.slots = slots            # 0 → no limit, calls never wait
+        self.bulk_every = bulk_every  # 0 → the interactive lane always goes first
+        self.busy = 0
+        self.dispatched = dict.fromkeys(LANES, 0)
+        self._queues: Dict[str, Dict[str, Deque[_Waiter]]] = {lane: {} for lane in LANES}
+        self._finish: Dict[str, float] = {}   # tenant → virtual finish tag of its last call
+        self._vtime = 0.0
+        self._streak = 0   # interactive grants in a row while bulk calls were waiting
+        self._lock = threading.Lock()
+
+    def _tag(self, tenant: str, weight: float) -> float:
+        start = max(self._vtime, self._finish.get(tenant, 0.0))
+        self._finish[tenant] = start + 1.0 / max(weight, 1e-6)
+        return start
+
+    def _queued(self) -> bool:
+        return any(self._queues[lane] for lane in LANES)
+
+    def acquire(self, tenant: str = "default", interactive: bool = False, weight: float = 1.0) -> float:
+        """Take a slot, waiting for one if need be; returns the seconds waited.  Pair with release()."""
+        if self.slots <= 0:
+            return 0.0
+        lane = INTERACTIVE if interactive else BULK
+        start = time.perf_counter()
+        waiter: Optional[_Waiter] = None
+        with self._lock:
+            tag = self._tag(tenant, weight)
+            if self.busy < self.slots and not self._queued():
+                self.busy += 1
+                self._vtime = max(self._vtime, tag)
+                self.dispatched[lane] += 1
+            else:
+                waiter = _Waiter(tag)
+                self._queues[lane].setdefault(tenant, deque()).append(waiter)
+        if waiter is not None:
+            waiter.event.wait()   # the releasing call hands its slot straight over
+        waited = time.perf_counter() - start
+        QUEUE_WAIT_SECONDS.observe(waited, lane=lane)
+        return waited
+
+    def try_acquire(self, interactive: bool = False) -> bool:
+        """Take a slot only if one is idle and nobody is waiting (never queues); pair with release()."""
+        if self.slots <= 0:
+            return True
+        with self._lock:
+            if self.busy >= self.slots or self._queued():
+                return False
+            self.busy += 1
+            self.dispatched[INTERACTIVE if interactive else BULK] += 1
+            return True
+
+    @contextmanager
+    def slot(self, tenant: str = "default", interactive: bool = False, weight: float = 1.0):
+        """Hold a slot for the block; yields the seconds spent waiting for it."""
+        waited = self.acquire(tenant, interactive, weight)
+        try:
+            yield waited
+        finally:
+            self.release()
+
+    def release(self) -> None:
+        if self.slots <= 0:
+            return
+        with self._lock:
+            lanes = LANES
+            if self.bulk_every > 0 and self._streak >= self.bulk_every - 1 and self._queues[BULK]:
+                lanes = (BULK, INTERACTIVE)
+            for lane in lanes:
+                queues = self._queues[lane]
+                if not queues:
+                    continue
+                self._streak = self._streak + 1 if lane == INTERACTIVE and self._queues[BULK] else 0
+                tenant = min(queues, key=lambda t: queues[t][0].tag)
+                waiter = queues[tenant].popleft()
+                if not queues[tenant]:
+                    del queues[tenant]
+                self._vtime = max(self._vtime, waiter.tag)
+                self.dispatched[lane] += 1
+                waiter.event.set()
+                return
+            self.busy -= 1
+            if len(self._finish) > 1024:   # forget tenants that have caught up with virtual time
+                self._finish = {t: f for t, f in self._finish.items() if f > self._vtime}
+
+    def depth(self) -> Dict[str, int]:
+        with self._lock:
+            return {lane: sum(len(q) for q in self._queues[lane].values()) for lane in LANES}
+
+    def snapshot(self) -> dict:
+        depth = self.depth()
+        with self._lock:
+            return {
+                "slots": self.slots,
+                "busy": self.busy,
+                "queued": depth,
+                "tenants_waiting": {lane: len(self._queues[lane]) for lane in LANES},
+                "dispatched": dict(self.dispatched),
+            }
+
+
+SCHEDULER = FairScheduler(settings.LLM_MAX_CONCURRENCY, settings.LLM_BULK_EVERY)
+REGISTRY.gauge("recruiter_llm_queue_depth", "Model calls waiting for a scheduler slot.",
+               lambda: SCHEDULER.depth(), ("lane",))
+REGISTRY.gauge("recruiter_llm_slots_busy", "Scheduler slots held by running model calls.",
+               lambda: SCHEDULER.busy)
+
+_SCOPE: ContextVar[Tuple[str, bool, float]] = ContextVar("llm_scope", default=("default", False, 1.0))
+
+
+@contextmanager
+def llm_scope(tenant: str, interactive: bool = False, weight: float = 1.0):
+    """Schedule the model calls made inside the block (threads / tasks included) for this tenant and lane."""
+    token = _SCOPE.set((tenant, interactive, weight))
+    try:
+        yield
+    finally:
+        _SCOPE.reset(token)
+
+
+def is_interactive(resumes: int) -> bool:
+    return resumes <= settings.LLM_INTERACTIVE_MAX_RESUMES
+
+
+def current_scope() -> Tuple[str, bool, float]:
+    """(tenant, interactive, weight) set by the enclosing llm_scope."""
+    return _SCOPE.get()
+
+
+def scheduled_slot():
+    """SCHEDULER.slot() for the current llm_scope."""
+    tenant, interactive, weight = _SCOPE.get()
+    return SCHEDULER.slot(tenant, interactive, weight)
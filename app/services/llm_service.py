@@ -6,32 +6,95 @@ Strategy:
   2. If Gemini fails (quota/auth) → automatically fall back to mock data
   3. Mock results are deterministic per filename (same file = same score every time)
   4. Realistic delays are added so the UI looks like real processing
+  5. Malformed JSON replies are repaired (json_repair) rather than retried;
+     JSON_STATS counts clean / repaired / retried / failed replies
+  6. Call latency, retries, 429s, fallbacks and cache hits are recorded in
+     app.metrics and exposed on GET /metrics
+  7. Every reply's prompt/output tokens go to token_usage.LEDGER; once the
+     request's TokenBudget is spent, resumes are parsed and scored locally
+     (mode "local") or BudgetExhausted is raised (mode "stop")
+  8. Prompts go to the provider picked by LLM_BACKEND / LLM_CASSETTE (see
+     llm_providers), built on first use (get_provider / warm_up), not at
+     import, so cold starts stay cheap
+  9. Each call has a per-label deadline (LLM_DEADLINE_*_SECONDS); with
+     LLM_HEDGE_ENABLED a duplicate is sent once a call outlives the label's
+     rolling p95, and whichever reply comes first wins
+ 10. Repeated 429 / auth failures open a process-wide circuit breaker
+     (BREAKER); while open, calls are refused without retry sleeps and
+     LLM_BREAKER_POLICY decides between a 503, local scoring and mock data
+ 11. Calls wait for a slot from llm_scheduler.SCHEDULER, which shares
+     LLM_MAX_CONCURRENCY fairly across sessions, small batches first; a
+     call keeps its slot until the provider returns, even once abandoned
+     at its deadline, and a hedge is only sent if a slot is idle
 """
+import contextvars
 import hashlib
 import logging
+import threading
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional
 
-import google.generativeai as genai
 from app.config import settings
+from app.metrics import (
+    EVAL_CACHE, LLM_CALL_SECONDS, REGISTRY, STAGE_SECONDS, LLM_DEADLINE_EXCEEDED, LLM_FALLBACKS, LLM_HEDGES,
+    LLM_RATE_LIMITED, LLM_RETRIES, LLM_SLEEP_SECONDS,
+)
+from app.services.circuit_breaker import STATE_CODES, CircuitBreaker
+from app.services.json_repair import JSONRecoveryError, loads_lenient
+from app.services.llm_providers import CassetteMiss, build_provider, describe as describe_provider
+from app.services import llm_scheduler
+from app.services.llm_scheduler import scheduled_slot
+from app.services.token_usage import LEDGER, BudgetExhausted, current_budget, usage_from_reply
+from app.tracing import current_span, span
 
 logger = logging.getLogger(__name__)
 
 # ── Demo / fallback mode ──────────────────────────────────────────────────────
 def _demo() -> bool:
-    return bool(getattr(settings, "DEMO_MODE", False))
+    return bool(getattr(settings, "DEMO_MODE", False)) or settings.LLM_BACKEND == "mock"
 
-RESUME_PROCESSING_DELAY = 1.6   # seconds per resume
+RESUME_PROCESSING_DELAY = settings.RESUME_PARSE_DELAY   # seconds per resume
+JD_PROCESSING_DELAY     = settings.JD_PARSE_DELAY
+
+
+def _offline_backend() -> bool:
+    """The fake models its own latency and cassettes replay at full speed, so neither is paced."""
+    return settings.LLM_BACKEND == "fake" or bool(settings.LLM_CASSETTE)
+
+
+def _pace(seconds: float, label: str) -> None:
+    """UI pacing sleep; skipped for the fake backend and cassettes."""
+    if seconds > 0 and not _offline_backend():
+        LLM_SLEEP_SECONDS.inc(seconds, label=label, reason="pacing")
+        time.sleep(seconds)
+
+
+# ── Provider setup (lazy: first call or warm_up(), never at import) ───────────
+_model = None   # the active LLMProvider
+_model_lock = threading.Lock()
 
-# ── Gemini setup (always init so fallback works even in demo mode) ────────────
-try:
-    genai.configure(api_key=settings.GEMINI_API_KEY)
-    _model = genai.GenerativeModel(
-        model_name=settings.GEMINI_MODEL,
-        generation_config={"temperature": 0.1, "response_mime_type": "application/json"},
-    )
-except Exception as e:
-    logger.warning(f"Gemini init failed: {e}")
-    _model = None
+
+def get_provider():
+    """The provider, built once on first use; init errors surface as call failures (→ fallback)."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                try:
+                    _model = build_provider(settings)
+                except Exception as e:
+                    logger.warning(f"LLM provider init failed: {e}")
+                    raise
+                logger.info(f"LLM provider: {describe_provider(settings)}")
+    return _model
+
+
+def warm_up() -> None:
+    """Build the provider (importing its SDK) ahead of the first request (skipped in mock / DEMO_MODE)."""
+    if not _demo():
+        get_provider()
 
 MAX_RETRIES   = 1
 RETRY_DELAY   = 16   # free tier needs ~12-15s between retries
@@ -39,6 +102,8 @@ RETRY_DELAY   = 16   # free tier needs ~12-15s between retries
 JD_CHAR_LIMIT     = 2800
 RESUME_CHAR_LIMIT = 2200
 
+EVAL_CACHE_SIZE   = 4096   # evaluations kept for re-ranking / repeat uploads
+
 
 # ─── Mock data helpers ────────────────────────────────────────────────────────
 
@@ -181,6 +246,88 @@ def _mock_evaluate(criteria: dict, candidate: dict, filename: str) -> dict:
     }
 
 
+# ─── Local (no-LLM) scoring, used once a token budget is spent ───────────────
+
+KNOWN_SKILLS = (
+    "Python", "JavaScript", "TypeScript", "Java", "Go", "C++", "C#", "SQL", "PostgreSQL",
+    "MySQL", "MongoDB", "Redis", "React", "Vue", "Angular", "Node.js", "Django", "Flask",
+    "FastAPI", "Spring", "Docker", "Kubernetes", "AWS", "Azure", "GCP", "Terraform",
+    "Linux", "Git", "CI/CD", "REST APIs", "GraphQL", "Kafka", "Spark", "Machine Learning",
+    "TensorFlow", "PyTorch", "Data Analysis", "HTML/CSS", "Agile",
+)
+LOCAL_FLAG = "Local estimate (token budget spent)"
+BREAKER_FLAG = "Local estimate (Gemini unavailable)"
+
+
+def _mentions(text_lower: str, skill: str) -> bool:
+    import re
+    return any(
+        re.search(r"(?<![\w+#])" + re.escape(alt.strip().lower()) + r"(?![\w+#])", text_lower)
+        for alt in skill.split("/") if alt.strip()
+    )
+
+
+def _local_resume(filename: str, resume_text: str) -> dict:
+    """Regex / keyword parse of a resume – no model call."""
+    import re
+    lines = [l.strip() for l in resume_text.splitlines() if l.strip()]
+    email = re.search(r'[\w.+-]+@[\w-]+\.[a-z]{2,}', resume_text)
+    years = [int(y) for y in re.findall(r"(\d{1,2})\+?\s*(?:years|yrs)", resume_text, re.I)]
+    first = lines[0] if lines else ""
+    name = first if first and len(first) <= 60 and "@" not in first else _extract_name_from_filename(filename)
+    lower = resume_text.lower()
+    return {
+        "name":                   name,
+        "email":                  email.group(0) if email else None,
+        "total_experience_years": max(years) if years else None,
+        "skills":                 [s for s in KNOWN_SKILLS if _mentions(lower, s)],
+        "education":              None,
+    }
+
+
+def _local_evaluate(criteria: dict, candidate: dict, flag: str = LOCAL_FLAG) -> dict:
+    """Skill-overlap / experience-range scoring on the same /100 scale – no model call."""
+    have = " | ".join(candidate.get("skills") or []).lower()
+    required = criteria.get("required_skills") or []
+    nice = criteria.get("nice_to_have_skills") or []
+    req_hit = sum(_mentions(have, s) for s in required)
+    nice_hit = sum(_mentions(have, s) for s in nice)
+    ss = round(40 * req_hit / len(required)) if required else 20
+
+    exp, mn, mx = (candidate.get("total_experience_years"), criteria.get("min_experience"),
+                   criteria.get("max_experience"))
+    if not isinstance(exp, (int, float)):
+        es = 8
+    elif isinstance(mn, (int, float)) and exp < mn:
+        es = max(0, round(20 - 5 * (mn - exp)))
+    else:
+        es = 14 if isinstance(mx, (int, float)) and exp > mx + 2 else 20   # overqualified vs. in range
+    ps = round(15 * nice_hit / len(nice)) if nice else 7
+    ds = 5
+    rs = round(15 * (ss + es) / 60)
+    total = ss + es + ps + ds + rs
+    verdict = "Strong Yes" if total >= 80 else "Yes" if total >= 65 else "Maybe" if total >= 50 else "No"
+    return {
+        "skill_score": ss, "experience_score": es, "project_score": ps,
+        "education_score": ds, "role_score": rs, "total_score": total,
+        "verdict": verdict, "flags": flag,
+        "reasoning": f"Scored without the model: {req_hit}/{len(required)} required and "
+                     f"{nice_hit}/{len(nice)} nice-to-have skills matched.",
+    }
+
+
+def _budget_spent(what: str) -> bool:
+    """True if the request's budget is spent (mode "local"); raises BudgetExhausted in mode "stop"."""
+    budget = current_budget()
+    if budget is None or not budget.exhausted:
+        return False
+    budget.note_skipped()
+    current_span().set_attribute("budget_exhausted", True)
+    if budget.mode == "stop":
+        raise BudgetExhausted(f"Token budget of {budget.limit} exhausted before {what}.")
+    return True
+
+
 # ─── Gemini helpers ───────────────────────────────────────────────────────────
 
 def _truncate(text: str, limit: int) -> str:
@@ -191,27 +338,325 @@ class QuotaError(RuntimeError):
     pass
 
 
-def _call_gemini(prompt: str, label: str) -> dict:
-    import json
+class CircuitOpen(QuotaError):
+    """Refused by the open circuit breaker; with LLM_BREAKER_POLICY=fail it surfaces like a quota error."""
+
+
+BREAKER = CircuitBreaker(settings.LLM_BREAKER_THRESHOLD, settings.LLM_BREAKER_RESET_SECONDS)
+REGISTRY.gauge("recruiter_llm_breaker_state", "Gemini circuit breaker: 0 closed, 1 half-open, 2 open.",
+               lambda: STATE_CODES[BREAKER.state])
+REGISTRY.gauge("recruiter_llm_breaker_rejected_total", "Model calls refused by the open circuit breaker.",
+               lambda: BREAKER.rejected, kind="counter")
+
+AUTH_ERROR_MARKERS = ("401", "403", "API_KEY_INVALID", "API key not valid", "PERMISSION_DENIED")
+
+
+def _trips_breaker(err: str) -> bool:
+    return "429" in err or any(marker in err for marker in AUTH_ERROR_MARKERS)
+
+
+def _circuit_policy(label: str) -> str:
+    """What to answer with while the breaker is open: "local" or "mock"; raises for "fail"."""
+    current_span().set_attribute("circuit_open", True)
+    if settings.LLM_BREAKER_POLICY == "fail":
+        raise CircuitOpen("CIRCUIT_OPEN")
+    if settings.LLM_BREAKER_POLICY == "mock":
+        LLM_FALLBACKS.inc(label=label)
+    return settings.LLM_BREAKER_POLICY
+
+
+class _LRUCache:
+    """Tiny thread-safe LRU used to memoise evaluation results."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_EVAL_CACHE = _LRUCache(EVAL_CACHE_SIZE)
+
+
+class _JSONStats:
+    """How often Gemini replies parsed cleanly, needed repair, or cost a retry."""
+
+    FIELDS = ("clean", "repaired", "retried", "failed")
+
+    def __init__(self):
+        self._counts = dict.fromkeys(self.FIELDS, 0)
+        self._lock = threading.Lock()
+
+    def incr(self, field: str) -> None:
+        with self._lock:
+            self._counts[field] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+
+JSON_STATS = _JSONStats()
+REGISTRY.gauge(
+    "recruiter_llm_json_replies_total", "Model replies by JSON outcome.",
+    JSON_STATS.snapshot, ("outcome",), kind="counter",
+)
+
+
+# ─── Deadlines / hedging ──────────────────────────────────────────────────────
+
+class LLMDeadlineExceeded(TimeoutError):
+    pass
+
+
+class _LatencyWindow:
+    """The last `size` call latencies for one label, for the hedging p95."""
+
+    def __init__(self, size: int = 200):
+        self._samples: "deque[float]" = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float, min_samples: int) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < max(min_samples, 1):
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class _HedgeBudget:
+    """Every call earns `ratio` of a hedge (banked up to `burst`); sending one spends a whole hedge."""
+
+    def __init__(self, ratio: float, burst: float = 10):
+        self.ratio = ratio
+        self.burst = burst
+        self._credit = 0.0
+        self._lock = threading.Lock()
+
+    def earn(self) -> None:
+        with self._lock:
+            self._credit = min(self.burst, self._credit + self.ratio)
+
+    def take(self) -> bool:
+        with self._lock:
+            if self._credit < 1:
+                return False
+            self._credit -= 1
+            return True
+
+    def refund(self) -> None:
+        with self._lock:
+            self._credit = min(self.burst, self._credit + 1)
+
+
+_LATENCY = {label: _LatencyWindow() for label in ("JD", "RESUME", "EVAL")}
+_HEDGE_BUDGET = _HedgeBudget(settings.LLM_HEDGE_MAX_RATIO)
+# Calls run here so the caller can stop waiting at the deadline; an abandoned
+# call finishes (or hits the provider's own timeout) in the background.
+_CALL_POOL = ThreadPoolExecutor(max_workers=settings.LLM_CALL_THREADS, thread_name_prefix="llm-call")
+
+
+def _deadline(label: str) -> float:
+    return {
+        "JD": settings.LLM_DEADLINE_JD_SECONDS,
+        "RESUME": settings.LLM_DEADLINE_RESUME_SECONDS,
+        "EVAL": settings.LLM_DEADLINE_EVAL_SECONDS,
+    }.get(label, 0)
+
+
+def _hedge_delay(label: str) -> Optional[float]:
+    """Seconds after which a still-running call is hedged (the label's rolling p95), or None."""
+    if not settings.LLM_HEDGE_ENABLED or label not in _LATENCY:
+        return None
+    return _LATENCY[label].quantile(0.95, settings.LLM_HEDGE_MIN_SAMPLES)
+
+
+def _generate(prompt: str, label: str):
+    """One provider call; returns (reply, tokens) and books the tokens and latency."""
+    start = time.perf_counter()
+    resp = get_provider().generate_content(prompt)
+    if label in _LATENCY:
+        _LATENCY[label].add(time.perf_counter() - start)
+    prompt_tokens, output_tokens, estimated = usage_from_reply(resp, prompt)
+    LEDGER.record(label, prompt_tokens, output_tokens, estimated)
+    return resp, prompt_tokens + output_tokens
+
+
+def _submit(prompt: str, label: str, hedge: bool = False):
+    """
+    _generate() on _CALL_POOL, holding a scheduler slot until the provider
+    returns rather than until the caller stops waiting.  A hedge never
+    queues for its slot: None if none is idle.
+    """
+    scheduler = llm_scheduler.SCHEDULER
+    tenant, interactive, weight = llm_scheduler.current_scope()
+    if hedge:
+        if not scheduler.try_acquire(interactive):
+            return None
+    else:
+        waited = scheduler.acquire(tenant, interactive, weight)
+        current_span().set_attribute("slot_wait_ms", round(waited * 1000, 1))
+    try:
+        # copy_context: token scope / budget and the current span follow the call onto the pool
+        future = _CALL_POOL.submit(contextvars.copy_context().run, _generate, prompt, label)
+    except BaseException:
+        scheduler.release()
+        raise
+    future.add_done_callback(lambda f: scheduler.release())   # also runs when a queued call is cancelled
+    return future
+
+
+def _generate_with_deadline(prompt: str, label: str):
+    """
+    _generate() bounded by the label's deadline, hedged with one duplicate
+    call once it runs past the rolling p95 (budget permitting).  The first
+    successful reply wins; if both fail, the last error is raised.
+    """
+    deadline = _deadline(label)
+    hedge_after = _hedge_delay(label)
+    span_ = current_span()
+    if deadline <= 0 and hedge_after is None:
+        with scheduled_slot() as waited:
+            span_.set_attribute("slot_wait_ms", round(waited * 1000, 1))
+            return _generate(prompt, label)
+    _HEDGE_BUDGET.earn()
+    pending = {_submit(prompt, label)}
+    start = time.monotonic()   # the deadline covers the call, not the wait for its slot
+    hedge = None
+    while True:
+        elapsed = time.monotonic() - start
+        timeouts = []
+        if deadline > 0:
+            if elapsed >= deadline:
+                break
+            timeouts.append(deadline - elapsed)
+        if hedge_after is not None:
+            timeouts.append(max(0.0, hedge_after - elapsed))
+        done, pending = wait(pending, timeout=min(timeouts) if timeouts else None, return_when=FIRST_COMPLETED)
+        ok = [f for f in done if f.exception() is None]
+        if ok or (done and not pending):
+            winner = ok[0] if ok else next(iter(done))
+            if hedge is not None:
+                LLM_HEDGES.inc(label=label, outcome="won" if winner is hedge else "lost")
+                span_.set_attribute("hedge_won", winner is hedge)
+            for f in pending:
+                f.cancel()
+            return winner.result()
+        if hedge_after is not None and time.monotonic() - start >= hedge_after:
+            hedge_after = None   # at most one hedge per call
+            if not _HEDGE_BUDGET.take():
+                LLM_HEDGES.inc(label=label, outcome="over_budget")
+            elif (hedge := _submit(prompt, label, hedge=True)) is None:
+                _HEDGE_BUDGET.refund()
+                LLM_HEDGES.inc(label=label, outcome="no_slot")
+            else:
+                pending.add(hedge)
+                span_.set_attribute("hedged", True)
+    for f in pending:
+        f.cancel()
+    LLM_DEADLINE_EXCEEDED.inc(label=label)
+    raise LLMDeadlineExceeded(f"{label} call exceeded its {deadline:g}s deadline")
+
+
+def _parse_reply(raw: str, label: str, required: tuple) -> dict:
+    """Parse a Gemini reply, repairing it if needed; raises JSONRecoveryError if unusable."""
+    result, repaired = loads_lenient(raw)
+    if isinstance(result, list):      # occasionally the object comes wrapped in a list
+        result = next((r for r in result if isinstance(r, dict)), None)
+    if not isinstance(result, dict):
+        raise JSONRecoveryError("Reply is not a JSON object.")
+    missing = [k for k in required if k not in result]
+    if missing:   # typically a truncated reply: a partial object is worse than a retry
+        raise JSONRecoveryError(f"Reply is missing {', '.join(missing)}.")
+    if repaired:
+        logger.info(f"[{label}] repaired malformed JSON reply")
+    JSON_STATS.incr("repaired" if repaired else "clean")
+    return result
+
+
+def _call_gemini(prompt: str, label: str, required: tuple = ()) -> dict:
+    """
+    One Gemini call (plus at most MAX_RETRIES retries).  Replies go through
+    loads_lenient, so fenced / chatty / truncated JSON is repaired instead of
+    retried; a reply that still can't be used is retried straight away (the
+    back-off sleeps are only for API errors).
+    """
+    stage = current_span()
+    stage.set_attribute("prompt_chars", len(prompt))
     for attempt in range(1, MAX_RETRIES + 2):
+        if attempt > 1:
+            stage.add("retries")
+        if not BREAKER.allow():
+            raise CircuitOpen(f"Circuit open after: {BREAKER.last_error}")
         try:
-            resp = _model.generate_content(prompt)
-            raw = resp.text.strip()
-            if raw.startswith("```"):
-                raw = raw.split("```")[1]
-                if raw.startswith("json"):
-                    raw = raw[4:]
-                raw = raw.strip()
-            return json.loads(raw)
+            with span("llm_call", label=label, attempt=attempt) as call:
+                with LLM_CALL_SECONDS.time(label=label):
+                    resp, tokens = _generate_with_deadline(prompt, label)
+                BREAKER.record_success()
+                call.set_attribute("reply_chars", len(resp.text or ""))
+                call.set_attribute("tokens", tokens)
+                return _parse_reply(resp.text, label, required)
+        except CassetteMiss as e:
+            BREAKER.release_probe()
+            logger.warning(f"[{label}] {e}")
+            raise   # a retry would miss again
+        except LLMDeadlineExceeded as e:
+            BREAKER.release_probe()
+            logger.warning(f"[{label}] attempt {attempt}: {e}")
+            if attempt <= MAX_RETRIES:   # retried straight away: the API didn't ask us to back off
+                LLM_RETRIES.inc(label=label, reason="deadline")
+        except JSONRecoveryError as e:
+            logger.warning(f"[{label}] attempt {attempt}: unusable JSON ({e})")
+            JSON_STATS.incr("retried" if attempt <= MAX_RETRIES else "failed")
+            if attempt <= MAX_RETRIES:
+                LLM_RETRIES.inc(label=label, reason="parse")
         except Exception as e:
             err = str(e)
             logger.warning(f"[{label}] attempt {attempt}: {err[:120]}")
+            if _trips_breaker(err):
+                BREAKER.record_failure(err)
+                if BREAKER.is_open:   # no point sleeping for a retry the breaker would refuse
+                    if "429" in err:
+                        LLM_RATE_LIMITED.inc(label=label)
+                    logger.warning(f"[{label}] circuit breaker open for {BREAKER.reset_seconds:g}s")
+                    raise CircuitOpen(f"Circuit open after: {err[:120]}")
+            else:
+                BREAKER.release_probe()
             if "429" in err:
+                LLM_RATE_LIMITED.inc(label=label)
                 if attempt <= MAX_RETRIES:
+                    LLM_RETRIES.inc(label=label, reason="rate_limit")
+                    LLM_SLEEP_SECONDS.inc(RETRY_DELAY, label=label, reason="retry")
                     time.sleep(RETRY_DELAY)
                 else:
                     raise QuotaError("QUOTA_EXCEEDED")
             elif attempt <= MAX_RETRIES:
+                LLM_RETRIES.inc(label=label, reason="error")
+                LLM_SLEEP_SECONDS.inc(3, label=label, reason="retry")
                 time.sleep(3)
     raise RuntimeError("LLM call failed")
 
@@ -233,12 +678,17 @@ Candidate: skills={sk} exp={ex}yr edu={edu}
 {{"skill_score":0,"experience_score":0,"project_score":0,"education_score":0,"role_score":0,"total_score":0,"verdict":"No","flags":"","reasoning":""}}"""
 
 
+@STAGE_SECONDS.time(stage="parse_jd")
+@span("parse_jd")
 def parse_jd(jd_text: str, filename: str = "jd") -> dict:
-    time.sleep(0.4)
+    current_span().set_attribute("filename", filename)
+    _pace(JD_PROCESSING_DELAY, "JD")
     if _demo():
         return _mock_jd(jd_text)
     try:
-        result = _call_gemini(JD_PROMPT.format(jd=_truncate(jd_text, JD_CHAR_LIMIT)), "JD")
+        result = _call_gemini(
+            JD_PROMPT.format(jd=_truncate(jd_text, JD_CHAR_LIMIT)), "JD", required=("required_skills",)
+        )
         return {
             "required_skills":     result.get("required_skills", []),
             "nice_to_have_skills": result.get("nice_to_have_skills", []),
@@ -246,20 +696,31 @@ def parse_jd(jd_text: str, filename: str = "jd") -> dict:
             "max_experience":      result.get("max_experience"),
             "role_level":          result.get("role_level"),
         }
+    except CircuitOpen:
+        _circuit_policy("JD")
+        return _mock_jd(jd_text)   # keyword-based, so it doubles as the local JD parse
     except QuotaError:
         raise   # let main.py surface this as a clear error
     except Exception:
         logger.warning("JD: Gemini failed → using demo fallback")
+        LLM_FALLBACKS.inc(label="JD")
+        current_span().set_attribute("fallback", True)
         return _mock_jd(jd_text)
 
 
+@STAGE_SECONDS.time(stage="parse_resume")
+@span("parse_resume")
 def parse_resume(resume_text: str, filename: str = "resume") -> dict:
-    time.sleep(RESUME_PROCESSING_DELAY)
+    current_span().set_attribute("filename", filename)
+    if not _demo() and _budget_spent(f"parsing {filename}"):
+        return _local_resume(filename, resume_text)
+    _pace(RESUME_PROCESSING_DELAY, "RESUME")
     if _demo():
         return _mock_resume(filename, resume_text)
     try:
         result = _call_gemini(
-            RESUME_PROMPT.format(resume=_truncate(resume_text, RESUME_CHAR_LIMIT)), "RESUME"
+            RESUME_PROMPT.format(resume=_truncate(resume_text, RESUME_CHAR_LIMIT)), "RESUME",
+            required=("name", "skills"),
         )
         return {
             "name":                   result.get("name"),
@@ -268,27 +729,63 @@ def parse_resume(resume_text: str, filename: str = "resume") -> dict:
             "skills":                 result.get("skills", []),
             "education":              result.get("education"),
         }
+    except CircuitOpen:
+        if _circuit_policy("RESUME") == "local":
+            return _local_resume(filename, resume_text)
+        return _mock_resume(filename, resume_text)
     except QuotaError:
         raise
     except Exception:
         logger.warning(f"RESUME {filename}: Gemini failed → using demo fallback")
+        LLM_FALLBACKS.inc(label="RESUME")
+        current_span().set_attribute("fallback", True)
         return _mock_resume(filename, resume_text)
 
 
+EVAL_SCORE_KEYS = ("skill_score", "experience_score", "project_score", "education_score", "role_score")
+
+
+def _eval_prompt(criteria: dict, candidate: dict) -> str:
+    return EVAL_PROMPT.format(
+        req=", ".join((criteria.get("required_skills") or [])[:6]),
+        mn=criteria.get("min_experience", "?"),
+        mx=criteria.get("max_experience", "?"),
+        lvl=criteria.get("role_level", "?"),
+        sk=", ".join((candidate.get("skills") or [])[:8]),
+        ex=candidate.get("total_experience_years", "?"),
+        edu=str(candidate.get("education", ""))[:100],
+    )
+
+
+@STAGE_SECONDS.time(stage="evaluate")
+@span("evaluate")
 def evaluate_candidate(criteria: dict, candidate: dict, filename: str = "resume") -> dict:
+    """
+    Score a parsed candidate against JD criteria.
+    Results are memoised on the rendered prompt (plus filename in demo mode,
+    since mock scores are seeded by it), so re-ranking a session against
+    unchanged criteria costs no Gemini calls.
+    """
+    prompt = _eval_prompt(criteria, candidate)
+    cache_key = hashlib.sha1(
+        (prompt + ("\0" + filename if _demo() else "")).encode()
+    ).hexdigest()
+    cached = _EVAL_CACHE.get(cache_key)
+    current_span().set_attribute("filename", filename)
+    current_span().set_attribute("cache_hit", cached is not None)
+    if cached is not None:
+        EVAL_CACHE.inc(result="hit")
+        return dict(cached)
+    EVAL_CACHE.inc(result="miss")
+
     if _demo():
-        return _mock_evaluate(criteria, candidate, filename)
+        result = _mock_evaluate(criteria, candidate, filename)
+        _EVAL_CACHE.put(cache_key, result)
+        return dict(result)
+    if _budget_spent(f"evaluating {filename}"):
+        return _local_evaluate(criteria, candidate)   # not cached: a later request may afford the model
     try:
-        prompt = EVAL_PROMPT.format(
-            req=", ".join(criteria.get("required_skills", [])[:6]),
-            mn=criteria.get("min_experience", "?"),
-            mx=criteria.get("max_experience", "?"),
-            lvl=criteria.get("role_level", "?"),
-            sk=", ".join(candidate.get("skills", [])[:8]),
-            ex=candidate.get("total_experience_years", "?"),
-            edu=str(candidate.get("education", ""))[:100],
-        )
-        result = _call_gemini(prompt, "EVAL")
+        result = _call_gemini(prompt, "EVAL", required=EVAL_SCORE_KEYS)
         ss = min(max(int(result.get("skill_score",      0)), 0), 40)
         es = min(max(int(result.get("experience_score", 0)), 0), 20)
         ps = min(max(int(result.get("project_score",    0)), 0), 15)
@@ -296,15 +793,23 @@ def evaluate_candidate(criteria: dict, candidate: dict, filename: str = "resume"
         rs = min(max(int(result.get("role_score",        0)), 0), 15)
         total = ss + es + ps + ds + rs
         verdict = "Strong Yes" if total >= 80 else "Yes" if total >= 65 else "Maybe" if total >= 50 else "No"
-        return {
+        scored = {
             "skill_score": ss, "experience_score": es, "project_score": ps,
             "education_score": ds, "role_score": rs, "total_score": total,
             "verdict": verdict,
             "flags":     result.get("flags", ""),
             "reasoning": result.get("reasoning", ""),
         }
+        _EVAL_CACHE.put(cache_key, scored)
+        return dict(scored)
+    except CircuitOpen:
+        if _circuit_policy("EVAL") == "local":
+            return _local_evaluate(criteria, candidate, BREAKER_FLAG)
+        return _mock_evaluate(criteria, candidate, filename)
     except QuotaError:
         raise
     except Exception:
         logger.warning(f"EVAL {filename}: Gemini failed → using demo fallback")
+        LLM_FALLBACKS.inc(label="EVAL")
+        current_span().set_attribute("fallback", True)
         return _mock_evaluate(criteria, candidate, filename)
@@ -3,12 +3,20 @@ File extraction service – supports PDF and plain-text (.txt) uploads.
 """
 import io
 from fastapi import HTTPException, UploadFile, status
-import pdfplumber
 
 from app.config import settings
+from app.lazy import LazyModule
+from app.metrics import STAGE_SECONDS
+from app.tracing import current_span, span
 
 ALLOWED_EXTENSIONS = (".pdf", ".txt")
 
+pdfplumber = LazyModule("pdfplumber")   # imported on the first PDF (or warm_up)
+
+
+def warm_up() -> None:
+    pdfplumber.load()
+
 
 def _check_size(content: bytes, filename: str) -> None:
     max_bytes = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
@@ -27,6 +35,7 @@ def extract_text_from_pdf(content: bytes, filename: str = "file") -> str:
     _check_size(content, filename)
     try:
         with pdfplumber.open(io.BytesIO(content)) as pdf:
+            current_span().set_attribute("pages", len(pdf.pages))
             pages = [p.extract_text() for p in pdf.pages if p.extract_text()]
         text = "\n".join(pages).strip()
         if not text:
@@ -58,11 +67,20 @@ async def read_upload_file(upload: UploadFile) -> bytes:
             status_code=400,
             detail=f"'{upload.filename}' must be a .pdf or .txt file.",
         )
-    return await upload.read()
+    with STAGE_SECONDS.time(stage="upload_read"), span("upload_read", filename=upload.filename) as s:
+        content = await upload.read()
+        s.set_attribute("bytes", len(content))
+        return content
 
 
+@STAGE_SECONDS.time(stage="extract_text")
+@span("extract_text")
 def extract_text(content: bytes, filename: str) -> str:
     """Route to the right extractor based on file extension."""
+    current_span().set_attribute("filename", filename)
     if filename.lower().endswith(".txt"):
-        return extract_text_from_txt(content, filename)
-    return extract_text_from_pdf(content, filename)
+        text = extract_text_from_txt(content, filename)
+    else:
+        text = extract_text_from_pdf(content, filename)
+    current_span().set_attribute("chars", len(text))
+    return text
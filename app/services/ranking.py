@@ -0,0 +1,110 @@
+"""
+Ranked candidate lists for a stored job.
+
+One statement per page: evaluations ⨝ resumes ⟕ approvals, filtered by job,
+ordered by (total_score DESC, resume id ASC) and projected straight into
+RankedCandidate, so no per-row relationship loads happen.  Pages are keyset
+paginated: the cursor is the (score, id) of the last row served, which keeps
+deep pages as cheap as the first one (no OFFSET scan).  Filter, order and
+cursor are all on evaluations columns, so a page is one range scan of
+ix_evaluations_job_id_total_score_resume_id – no sort of the whole job.
+
+Resumes that have not been evaluated yet are not ranked.
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.schemas.evaluation import RankedCandidate
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+_COLUMNS = (
+    models.Resume.id.label("candidate_id"),
+    models.Resume.name,
+    models.Resume.email,
+    models.Evaluation.total_score,
+    models.Evaluation.skill_score,
+    models.Evaluation.experience_score,
+    models.Evaluation.project_score,
+    models.Evaluation.education_score,
+    models.Evaluation.role_score,
+    models.Evaluation.verdict,
+    models.Evaluation.flags,
+    models.Approval.final_decision,
+)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(total_score: int, candidate_id: int) -> str:
+    return f"{total_score}:{candidate_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        score, candidate_id = cursor.split(":")
+        return int(score), int(candidate_id)
+    except ValueError:
+        raise InvalidCursor(f"Malformed ranking cursor '{cursor}'.")
+
+
+@dataclass
+class RankedPage:
+    candidates: List[RankedCandidate]
+    next_cursor: Optional[str]     # None on the last page
+
+    def to_dict(self) -> dict:
+        return {
+            "candidates": [c.model_dump() for c in self.candidates],
+            "next_cursor": self.next_cursor,
+        }
+
+
+def ranking_query(job_id: int, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+                  decision: Optional[str] = None) -> Select:
+    """The page statement; fetches limit + 1 rows so the caller can tell if more follow."""
+    score, resume_id = models.Evaluation.total_score, models.Evaluation.resume_id
+    stmt = (
+        select(*_COLUMNS)
+        .select_from(models.Evaluation)
+        .join(models.Resume, models.Resume.id == resume_id)
+        .outerjoin(models.Approval, models.Approval.resume_id == resume_id)
+        .where(models.Evaluation.job_id == job_id)
+    )
+    if decision is not None:
+        stmt = stmt.where(models.Approval.final_decision == decision)
+    if cursor:
+        last_score, last_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(score < last_score, and_(score == last_score, resume_id > last_id)))
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    return stmt.order_by(score.desc(), resume_id.asc()).limit(limit + 1)
+
+
+def _to_page(rows, limit: int) -> RankedPage:
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    candidates = [RankedCandidate(**row._mapping) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = candidates[-1]
+        next_cursor = encode_cursor(last.total_score, last.candidate_id)
+    return RankedPage(candidates, next_cursor)
+
+
+def rank_candidates(db: Session, job_id: int, limit: int = DEFAULT_PAGE_SIZE,
+                    cursor: Optional[str] = None, decision: Optional[str] = None) -> RankedPage:
+    rows = db.execute(ranking_query(job_id, limit, cursor, decision)).all()
+    return _to_page(rows, limit)
+
+
+async def rank_candidates_async(db, job_id: int, limit: int = DEFAULT_PAGE_SIZE,
+                                cursor: Optional[str] = None, decision: Optional[str] = None) -> RankedPage:
+    """Same as rank_candidates on an AsyncSession (app.database.get_async_db)."""
+    rows = (await db.execute(ranking_query(job_id, limit, cursor, decision))).all()
+    return _to_page(rows, limit)
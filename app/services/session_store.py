@@ -0,0 +1,320 @@
+"""
+Compact columnar storage for session candidates.
+
+A session used to hold one ~18-key dict per candidate.  CandidateTable keeps
+the same data as typed arrays instead:
+
+  • score columns        – array('h')  total / skill / experience / project / education / role
+  • decision / verdict   – array('b')  small integer codes
+  • candidate ids        – 16 raw UUID bytes per row in one bytearray
+  • per-person text      – filename / name / email packed as UTF-8 in a TextHeap
+  • shared text          – array('i')  ids into a per-table interned string pool
+                           (education, flags, reasoning, skills)
+  • skills               – flat array('i') of pool ids + row offsets (CSR layout)
+  • ranking              – array('i')  row numbers ordered by total_score desc
+
+Sorting, filtering and counting go through array/itertools primitives, so the
+per-row work stays in C.  Rows are materialised back into the exact dict shape
+/analyze has always returned only when a response needs them.
+"""
+import asyncio
+import math
+import uuid
+from array import array
+from dataclasses import dataclass, field
+from itertools import compress
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional
+
+DECISIONS = ("Interview", "Hold", "Reject")
+VERDICTS  = ("Strong Yes", "Yes", "Maybe", "No")
+DECISION_CODE = {d: i for i, d in enumerate(DECISIONS)}
+VERDICT_CODE  = {v: i for i, v in enumerate(VERDICTS)}
+
+SCORE_COLUMNS = (
+    "total_score", "skill_score", "experience_score",
+    "project_score", "education_score", "role_score",
+)
+HEAP_COLUMNS = ("filename", "name", "email")          # unique per candidate
+POOL_COLUMNS = ("education", "flags", "reasoning")    # repeat across candidates
+UUID_BYTES = 16
+
+NONE_ID = -1   # pool id for None
+
+
+def _as_years(value) -> float:
+    """experience_years as a float: numbers and numeric strings ('5', ' 3.5 '); NaN otherwise."""
+    if isinstance(value, str):
+        try:
+            value = float(value.strip())
+        except ValueError:
+            return math.nan
+    if isinstance(value, (int, float)) and math.isfinite(value):
+        return float(value)
+    return math.nan
+
+
+class StringPool:
+    """Interns strings to dense int ids; repeated values are stored once."""
+
+    __slots__ = ("_ids", "_values")
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._values: List[str] = []
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return NONE_ID
+        value = str(value)
+        idx = self._ids.get(value)
+        if idx is None:
+            idx = self._ids[value] = len(self._values)
+            self._values.append(value)
+        return idx
+
+    def lookup(self, idx: int) -> Optional[str]:
+        return None if idx == NONE_ID else self._values[idx]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class TextHeap:
+    """
+    Row-aligned strings packed as UTF-8 into a single bytearray.
+    Costs the encoded bytes plus 12 bytes of offsets per row, instead of a
+    full str object each.
+    """
+
+    __slots__ = ("_data", "_start", "_length")
+
+    def __init__(self):
+        self._data = bytearray()
+        self._start = array("q")
+        self._length = array("i")   # -1 = None
+
+    def append(self, value: Optional[str]) -> None:
+        self._start.append(len(self._data))
+        if value is None:
+            self._length.append(-1)
+            return
+        encoded = str(value).encode("utf-8")
+        self._data += encoded
+        self._length.append(len(encoded))
+
+    def get(self, row: int) -> Optional[str]:
+        length = self._length[row]
+        if length < 0:
+            return None
+        start = self._start[row]
+        return self._data[start:start + length].decode("utf-8")
+
+
+class CandidateTable:
+    """Append-only, rank-ordered candidate columns for one session."""
+
+    def __init__(self, candidates: Iterable[dict] = ()):
+        self._pool = StringPool()
+        self._ids = bytearray()             # row r: _ids[16r:16r+16]
+        self._scores = {col: array("h") for col in SCORE_COLUMNS}
+        self._heap   = {col: TextHeap() for col in HEAP_COLUMNS}
+        self._text   = {col: array("i") for col in POOL_COLUMNS}
+        self._verdict    = array("b")
+        self._decision   = array("b")
+        self._overridden = array("b")
+        self._experience = array("d")        # NaN = unknown
+        self._experience_raw: Dict[int, object] = {}   # row → non-numeric value as given ('5+'), rare
+        self._skill_ids  = array("i")
+        self._skill_start = array("i", [0])  # row r's skills: _skill_ids[start[r]:start[r+1]]
+        self._order = array("i")
+        for c in candidates:
+            self.append(c)
+        self.sort()
+
+    def __len__(self) -> int:
+        return len(self._ids) // UUID_BYTES
+
+    # ── Writes ────────────────────────────────────────────────────────────────
+    def append(self, c: dict) -> int:
+        """Store one candidate dict (as built by /analyze); returns its row. Call sort()/insert_ranked() after."""
+        row = len(self)
+        self._ids += uuid.UUID(c["candidate_id"]).bytes
+        for col in SCORE_COLUMNS:
+            self._scores[col].append(int(c[col]))
+        for col in HEAP_COLUMNS:
+            self._heap[col].append(c.get(col))
+        intern = self._pool.intern
+        for col in POOL_COLUMNS:
+            self._text[col].append(intern(c.get(col)))
+        self._verdict.append(VERDICT_CODE.get(c["verdict"], VERDICT_CODE["No"]))
+        self._decision.append(DECISION_CODE[c["decision"]])
+        self._overridden.append(0)
+        exp = c.get("experience_years")
+        years = _as_years(exp)
+        self._experience.append(years)
+        if math.isnan(years) and exp is not None:
+            self._experience_raw[row] = exp
+        self._skill_ids.extend(intern(s) for s in c.get("skills") or [])
+        self._skill_start.append(len(self._skill_ids))
+        return row
+
+    def update_scores(self, row: int, eval_data: dict) -> None:
+        for col in SCORE_COLUMNS:
+            self._scores[col][row] = int(eval_data[col])
+        self._verdict[row] = VERDICT_CODE.get(eval_data["verdict"], VERDICT_CODE["No"])
+        self._text["flags"][row] = self._pool.intern(eval_data.get("flags"))
+        self._text["reasoning"][row] = self._pool.intern(eval_data.get("reasoning"))
+
+    def set_decision(self, row: int, decision: str, overridden: bool = False) -> None:
+        self._decision[row] = DECISION_CODE[decision]
+        if overridden:
+            self._overridden[row] = 1
+
+    # ── Ranking ───────────────────────────────────────────────────────────────
+    def sort(self) -> None:
+        """Rank all rows by total_score desc (stable, so ties keep upload order)."""
+        total = self._scores["total_score"]
+        self._order = array("i", sorted(range(len(total)), key=total.__getitem__, reverse=True))
+
+    def insert_ranked(self, row: int) -> None:
+        """Merge one freshly appended row into the ranking; ties go after existing rows."""
+        total = self._scores["total_score"]
+        score = total[row]
+        lo, hi = 0, len(self._order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if total[self._order[mid]] >= score:
+                lo = mid + 1
+            else:
+                hi = mid
+        self._order.insert(lo, row)
+
+    # ── Reads ─────────────────────────────────────────────────────────────────
+    def find(self, candidate_id: str) -> Optional[int]:
+        """Row for a candidate id – a C-level scan of the packed id bytes, no per-row index."""
+        try:
+            needle = uuid.UUID(candidate_id).bytes
+        except (ValueError, TypeError, AttributeError):
+            return None
+        pos = self._ids.find(needle)
+        while pos != -1 and pos % UUID_BYTES:
+            pos = self._ids.find(needle, pos + 1)
+        return None if pos == -1 else pos // UUID_BYTES
+
+    def candidate_id(self, row: int) -> str:
+        return str(uuid.UUID(bytes=bytes(self._ids[row * UUID_BYTES:(row + 1) * UUID_BYTES])))
+
+    def verdict(self, row: int) -> str:
+        return VERDICTS[self._verdict[row]]
+
+    def decision(self, row: int) -> str:
+        return DECISIONS[self._decision[row]]
+
+    def is_overridden(self, row: int) -> bool:
+        return bool(self._overridden[row])
+
+    def text(self, row: int, col: str) -> Optional[str]:
+        heap = self._heap.get(col)
+        if heap is not None:
+            return heap.get(row)
+        return self._pool.lookup(self._text[col][row])
+
+    def experience(self, row: int):
+        exp = self._experience[row]
+        if math.isnan(exp):
+            return self._experience_raw.get(row)
+        return int(exp) if exp.is_integer() else exp
+
+    def skills(self, row: int) -> List[str]:
+        lookup = self._pool.lookup
+        return [lookup(i) for i in self._skill_ids[self._skill_start[row]:self._skill_start[row + 1]]]
+
+    def ranked_rows(self, decision: Optional[str] = None, verdict: Optional[str] = None) -> List[int]:
+        """Rows in rank order, optionally filtered by decision and/or verdict."""
+        rows: Iterable[int] = self._order
+        if decision is not None:
+            code = DECISION_CODE[decision]
+            rows = compress(rows, map(code.__eq__, map(self._decision.__getitem__, self._order)))
+        if verdict is not None:
+            rows = list(rows)
+            code = VERDICT_CODE[verdict]
+            rows = compress(rows, map(code.__eq__, map(self._verdict.__getitem__, rows)))
+        return list(rows)
+
+    def overrides(self) -> Dict[str, str]:
+        """{candidate_id: decision} for rows a recruiter has overridden."""
+        return {
+            self.candidate_id(row): self.decision(row)
+            for row in compress(range(len(self)), self._overridden)
+        }
+
+    def count_decisions(self) -> Dict[str, int]:
+        return {d: self._decision.count(code) for d, code in DECISION_CODE.items()}
+
+    def count_verdicts(self) -> Dict[str, int]:
+        return {v: self._verdict.count(code) for v, code in VERDICT_CODE.items()}
+
+    def row_dict(self, row: int, exclude: FrozenSet[str] = frozenset()) -> dict:
+        """Materialise one row in the public candidate shape, minus any excluded keys."""
+        text = self.text
+        scores = self._scores
+        candidate = {
+            "candidate_id":     self.candidate_id(row),
+            "filename":         text(row, "filename"),
+            "name":             text(row, "name"),
+            "email":            text(row, "email"),
+            "experience_years": self.experience(row),
+            "skills":           self.skills(row) if "skills" not in exclude else None,
+            "education":        text(row, "education"),
+            "total_score":      scores["total_score"][row],
+            "skill_score":      scores["skill_score"][row],
+            "experience_score": scores["experience_score"][row],
+            "project_score":    scores["project_score"][row],
+            "education_score":  scores["education_score"][row],
+            "role_score":       scores["role_score"][row],
+            "verdict":          self.verdict(row),
+            "flags":            text(row, "flags"),
+            "reasoning":        text(row, "reasoning"),
+            "decision":         self.decision(row),
+        }
+        for key in exclude:
+            del candidate[key]
+        return candidate
+
+    def parsed_view(self, row: int) -> dict:
+        """Rebuild the parse_resume() shape for re-evaluation."""
+        return {
+            "name":                   self.text(row, "name"),
+            "email":                  self.text(row, "email"),
+            "total_experience_years": self.experience(row),
+            "skills":                 self.skills(row),
+            "education":              self.text(row, "education"),
+        }
+
+    def __iter__(self) -> Iterator[dict]:
+        return map(self.row_dict, self._order)
+
+    def to_list(self, exclude: FrozenSet[str] = frozenset()) -> List[dict]:
+        if not exclude:
+            return list(self)
+        return [self.row_dict(row, exclude) for row in self._order]
+
+
+@dataclass
+class SessionData:
+    """One /analyze session: the parsed JD plus its candidate table."""
+    job_title: str
+    criteria: dict
+    candidates: CandidateTable = field(default_factory=CandidateTable)
+    templates: Dict[str, Dict[str, str]] = field(default_factory=dict)   # decision → {subject, body}
+    # held by rerank and append, which both rewrite the table off the event loop
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False, compare=False)
+
+    def to_dict(self, exclude: FrozenSet[str] = frozenset()) -> dict:
+        """Public JSON shape served by GET /session/{sid}."""
+        return {
+            "job_title": self.job_title,
+            "criteria": self.criteria,
+            "candidates": self.candidates.to_list(exclude),
+            "overrides": self.candidates.overrides(),
+        }
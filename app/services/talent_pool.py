@@ -0,0 +1,273 @@
+"""
+Cross-session talent pool.
+
+Every candidate parsed by /analyze is kept here, independent of the session
+it came from, so a new JD can be matched against people we have already seen
+without re-uploading or re-parsing their resumes.
+
+Layout:
+  • records     – { candidate_key: record dict }
+  • skill index – { normalized skill: {candidate_key, ...} }   (inverted index)
+  • exp buckets – { bucket: {candidate_key, ...} }             (EXP_BUCKET_YEARS wide)
+
+Persistence is an append-only JSONL log (TALENT_POOL_PATH).  Replaying the
+log on startup rebuilds the indexes; later lines for the same candidate win.
+Once superseded lines outnumber live candidates (COMPACT_RATIO), the log is
+rewritten with one line per candidate, on load or after an append.
+An empty path keeps the pool in memory only.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+EXP_BUCKET_YEARS = 2     # width of one experience bucket
+UNKNOWN_BUCKET   = -1    # candidates with no parsed experience
+
+REQUIRED_WEIGHT = 2      # a required-skill hit counts double a nice-to-have hit
+
+COMPACT_RATIO     = 2    # rewrite the log once it holds this many lines per candidate …
+COMPACT_MIN_LINES = 1000 # … and at least this many lines
+
+
+def normalize_skill(skill: str) -> str:
+    """'  Machine   Learning ' → 'machine learning'."""
+    return re.sub(r"\s+", " ", str(skill)).strip().lower()
+
+
+def _skill_alternatives(skill: str) -> Set[str]:
+    """
+    JD skills are often written as alternatives: 'TensorFlow/PyTorch',
+    'Cloud (AWS/Azure/GCP)'.  Any one of them should count as a hit.
+    """
+    norm = normalize_skill(skill)
+    alts = {norm}
+    inner = re.search(r"\(([^)]*)\)", norm)
+    if inner:
+        alts.update(p.strip() for p in inner.group(1).split("/"))
+        norm = norm[:inner.start()].strip()
+        alts.add(norm)
+    if "/" in norm:
+        alts.update(p.strip() for p in norm.split("/"))
+    return {a for a in alts if a}
+
+
+def _exp_bucket(years) -> int:
+    try:
+        return max(int(years), 0) // EXP_BUCKET_YEARS
+    except (TypeError, ValueError):
+        return UNKNOWN_BUCKET
+
+
+def candidate_key(candidate: dict) -> str:
+    """Identity of a person across sessions: e-mail if we have one, else name + file."""
+    email = (candidate.get("email") or "").strip().lower()
+    if email:
+        return email
+    name = normalize_skill(candidate.get("name") or "")
+    return f"{name}|{(candidate.get('filename') or '').lower()}"
+
+
+class TalentPool:
+    """Thread-safe in-memory index over parsed candidates, backed by a JSONL log."""
+
+    def __init__(self, path: str = ""):
+        self.path = path
+        self._lock = threading.Lock()
+        self._records: Dict[str, dict] = {}
+        self._by_skill: Dict[str, Set[str]] = {}
+        self._by_bucket: Dict[int, Set[str]] = {}
+        self._log_lines = 0      # lines in the JSONL log, superseded ones included
+        if path:
+            self._load()
+            if self._needs_compaction():
+                self.compact()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    # ── Index maintenance ─────────────────────────────────────────────────────
+    def _index(self, key: str, record: dict) -> None:
+        for skill in record["skills_norm"]:
+            self._by_skill.setdefault(skill, set()).add(key)
+        self._by_bucket.setdefault(_exp_bucket(record.get("experience_years")), set()).add(key)
+
+    def _unindex(self, key: str, record: dict) -> None:
+        for skill in record["skills_norm"]:
+            keys = self._by_skill.get(skill)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_skill[skill]
+        bucket = _exp_bucket(record.get("experience_years"))
+        keys = self._by_bucket.get(bucket)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_bucket[bucket]
+
+    def _put(self, record: dict) -> str:
+        key = record["key"]
+        old = self._records.get(key)
+        if old is not None:
+            self._unindex(key, old)
+        self._records[key] = record
+        self._index(key, record)
+        return key
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        loaded = 0
+        with open(self.path, encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                self._log_lines += 1
+                try:
+                    self._put(json.loads(line))
+                    loaded += 1
+                except (ValueError, KeyError) as exc:
+                    logger.warning(f"talent pool: skipping bad line: {exc}")
+        logger.info(f"talent pool: replayed {loaded} records, {len(self._records)} candidates")
+
+    def _needs_compaction(self) -> bool:
+        return (self._log_lines >= COMPACT_MIN_LINES
+                and self._log_lines > COMPACT_RATIO * max(len(self._records), 1))
+
+    def _rewrite_log(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in self._records.values()))
+        os.replace(tmp, self.path)   # readers never see a half-written log
+        self._log_lines = len(self._records)
+
+    # ── Public API ────────────────────────────────────────────────────────────
+    def compact(self) -> None:
+        """Rewrite the log with only the latest line per candidate."""
+        if not self.path:
+            return
+        with self._lock:
+            before = self._log_lines
+            self._rewrite_log()
+        logger.info(f"talent pool: compacted log from {before} to {self._log_lines} lines")
+
+    def add_many(self, candidates: Iterable[dict], session_id: str = "", job_title: str = "") -> int:
+        """
+        Upsert parsed candidates (the dicts /analyze builds) and append them to
+        the log.  Returns the number of records written.  Does file I/O:
+        call it off the event loop.
+        """
+        records = []
+        now = time.time()
+        for c in candidates:
+            skills = [s for s in (c.get("skills") or []) if s]
+            records.append({
+                "key":              candidate_key(c),
+                "name":             c.get("name"),
+                "email":            c.get("email"),
+                "experience_years": c.get("experience_years"),
+                "skills":           skills,
+                "skills_norm":      sorted({normalize_skill(s) for s in skills}),
+                "education":        c.get("education"),
+                "filename":         c.get("filename"),
+                "session_id":       session_id,
+                "job_title":        job_title,
+                "added_at":         now,
+            })
+        if not records:
+            return 0
+
+        with self._lock:
+            for r in records:
+                self._put(r)
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as fh:
+                    fh.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+                self._log_lines += len(records)
+                if self._needs_compaction():
+                    self._rewrite_log()
+        return len(records)
+
+    def get(self, key: str) -> Optional[dict]:
+        return self._records.get(key)
+
+    def match(
+        self,
+        required_skills: List[str],
+        nice_to_have_skills: Optional[List[str]] = None,
+        min_experience: Optional[int] = None,
+        max_experience: Optional[int] = None,
+        within_experience: bool = False,
+        limit: int = 50,
+    ) -> List[dict]:
+        """
+        Rank pooled candidates against JD criteria.
+
+        Candidates are gathered from the inverted index only (no full scan),
+        scored by weighted skill hits, and tie-broken by whether their
+        experience falls in [min_experience, max_experience].  With
+        within_experience=True, the experience buckets are used as a hard
+        filter instead.
+        """
+        required = [_skill_alternatives(s) for s in required_skills or []]
+        nice     = [_skill_alternatives(s) for s in nice_to_have_skills or []]
+
+        with self._lock:
+            hits: Dict[str, List[int]] = {}   # key → [required hits, nice hits]
+            for slot, groups in ((0, required), (1, nice)):
+                for alts in groups:
+                    matched: Set[str] = set()
+                    for alt in alts:
+                        matched |= self._by_skill.get(alt, set())
+                    for key in matched:
+                        hits.setdefault(key, [0, 0])[slot] += 1
+
+            allowed: Optional[Set[str]] = None
+            if within_experience and (min_experience is not None or max_experience is not None):
+                lo = _exp_bucket(min_experience or 0)
+                hi = _exp_bucket(max_experience) if max_experience is not None else max(self._by_bucket, default=lo)
+                allowed = set()
+                for b in range(lo, hi + 1):
+                    allowed |= self._by_bucket.get(b, set())
+
+            ranked = []
+            for key, (req_hits, nice_hits) in hits.items():
+                if allowed is not None and key not in allowed:
+                    continue
+                record = self._records[key]
+                exp = record.get("experience_years")
+                in_range = isinstance(exp, (int, float)) and (
+                    (min_experience is None or exp >= min_experience)
+                    and (max_experience is None or exp <= max_experience)
+                )
+                if allowed is not None and not in_range:
+                    continue
+                ranked.append((req_hits * REQUIRED_WEIGHT + nice_hits, in_range, req_hits, nice_hits, record))
+
+        ranked.sort(key=lambda r: (r[0], r[1]), reverse=True)
+        n_required = len(required) or 1
+        return [
+            {
+                "name":               r["name"],
+                "email":              r["email"],
+                "experience_years":   r["experience_years"],
+                "skills":             r["skills"],
+                "education":          r["education"],
+                "filename":           r["filename"],
+                "last_session_id":    r["session_id"],
+                "last_job_title":     r["job_title"],
+                "match_score":        score,
+                "required_matched":   req_hits,
+                "required_coverage":  round(req_hits / n_required, 2),
+                "nice_matched":       nice_hits,
+                "experience_in_range": in_range,
+            }
+            for score, in_range, req_hits, nice_hits, r in ranked[:limit]
+        ]
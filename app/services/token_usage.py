@@ -0,0 +1,188 @@
+"""
+Token accounting for LLM calls.
+
+  • Every call records prompt / output tokens — from the reply's
+    usage_metadata when the backend provides it, else estimated (~4 chars
+    per token).
+  • LEDGER rolls usage up per label (JD/RESUME/EVAL), per UTC day and per
+    scope (normally a session_id); only the most recently used
+    TOKEN_USAGE_SCOPES scopes are kept.
+  • token_scope(key, budget) sets the scope for the current request; the
+    contextvar follows run_in_threadpool and asyncio tasks.  A TokenBudget
+    is checked before each call, so a request overshoots by at most the
+    calls already in flight.
+"""
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from app.config import settings
+from app.metrics import REGISTRY
+
+CHARS_PER_TOKEN = 4
+BUDGET_MODES = ("local", "stop")
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text or "") + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def usage_from_reply(resp, prompt: str) -> Tuple[int, int, bool]:
+    """(prompt_tokens, output_tokens, estimated) for one model reply."""
+    meta = getattr(resp, "usage_metadata", None)
+    prompt_tokens = getattr(meta, "prompt_token_count", None)
+    output_tokens = getattr(meta, "candidates_token_count", None)
+    if isinstance(prompt_tokens, int) and isinstance(output_tokens, int):
+        return prompt_tokens, output_tokens, False
+    return estimate_tokens(prompt), estimate_tokens(getattr(resp, "text", "") or ""), True
+
+
+class BudgetExhausted(RuntimeError):
+    """Raised instead of a model call once the request's token budget is spent (mode "stop")."""
+
+
+class TokenBudget:
+    """Per-request token allowance shared by every call made under one token_scope."""
+
+    def __init__(self, limit: int, mode: str = "local"):
+        if mode not in BUDGET_MODES:
+            raise ValueError(f"Token budget mode must be one of {', '.join(BUDGET_MODES)}.")
+        self.limit = limit
+        self.mode = mode
+        self.spent = 0
+        self.skipped = 0     # calls answered locally / refused after exhaustion
+        self._lock = threading.Lock()
+
+    @property
+    def exhausted(self) -> bool:
+        return self.spent >= self.limit
+
+    def charge(self, tokens: int) -> None:
+        with self._lock:
+            self.spent += tokens
+
+    def note_skipped(self) -> None:
+        with self._lock:
+            self.skipped += 1
+
+    def as_dict(self) -> dict:
+        return {"limit": self.limit, "spent": self.spent, "mode": self.mode,
+                "exhausted": self.exhausted, "skipped_calls": self.skipped}
+
+
+@dataclass
+class _Scope:
+    key: str
+    budget: Optional[TokenBudget]
+
+
+_SCOPE: ContextVar[Optional[_Scope]] = ContextVar("token_scope", default=None)
+
+
+@contextmanager
+def token_scope(key: str, budget: Optional[TokenBudget] = None):
+    """Attribute LLM calls made inside the block to key and charge them to budget."""
+    token = _SCOPE.set(_Scope(key, budget))
+    try:
+        yield budget
+    finally:
+        _SCOPE.reset(token)
+
+
+def current_budget() -> Optional[TokenBudget]:
+    scope = _SCOPE.get()
+    return scope.budget if scope else None
+
+
+def _empty() -> Dict[str, int]:
+    return {"calls": 0, "prompt_tokens": 0, "output_tokens": 0, "estimated_calls": 0}
+
+
+def _add(row: Dict[str, int], prompt_tokens: int, output_tokens: int, estimated: bool) -> None:
+    row["calls"] += 1
+    row["prompt_tokens"] += prompt_tokens
+    row["output_tokens"] += output_tokens
+    row["estimated_calls"] += int(estimated)
+
+
+def _with_total(row: Dict[str, int]) -> dict:
+    return {**row, "total_tokens": row["prompt_tokens"] + row["output_tokens"]}
+
+
+class TokenLedger:
+    """Thread-safe running totals per label, per UTC day and per scope key."""
+
+    def __init__(self, keep_days: int = 30, keep_scopes: int = 10000):
+        self.keep_days = keep_days
+        self.keep_scopes = keep_scopes
+        self._by_label: Dict[str, Dict[str, int]] = {}
+        self._by_day: "OrderedDict[str, Dict[str, Dict[str, int]]]" = OrderedDict()     # day → label → row
+        self._by_scope: "OrderedDict[str, Dict[str, Dict[str, int]]]" = OrderedDict()   # key → label → row, LRU
+        self._lock = threading.Lock()
+
+    def record(self, label: str, prompt_tokens: int, output_tokens: int, estimated: bool = False) -> None:
+        scope = _SCOPE.get()
+        day = datetime.now(timezone.utc).date().isoformat()
+        with self._lock:
+            _add(self._by_label.setdefault(label, _empty()), prompt_tokens, output_tokens, estimated)
+            if day not in self._by_day:
+                self._by_day[day] = {}
+                while len(self._by_day) > self.keep_days:
+                    self._by_day.popitem(last=False)
+            _add(self._by_day[day].setdefault(label, _empty()), prompt_tokens, output_tokens, estimated)
+            if scope is not None:
+                rows = self._by_scope.setdefault(scope.key, {})
+                self._by_scope.move_to_end(scope.key)
+                while len(self._by_scope) > self.keep_scopes:
+                    self._by_scope.popitem(last=False)
+                _add(rows.setdefault(label, _empty()), prompt_tokens, output_tokens, estimated)
+        if scope is not None and scope.budget is not None:
+            scope.budget.charge(prompt_tokens + output_tokens)
+
+    @staticmethod
+    def _rollup(rows: Dict[str, Dict[str, int]]) -> dict:
+        total = _empty()
+        for row in rows.values():
+            for k in total:
+                total[k] += row[k]
+        return {"total": _with_total(total), "by_label": {l: _with_total(r) for l, r in sorted(rows.items())}}
+
+    def scope(self, key: str) -> dict:
+        with self._lock:
+            return self._rollup(self._by_scope.get(key, {}))
+
+    def day(self, day: Optional[str] = None) -> dict:
+        day = day or datetime.now(timezone.utc).date().isoformat()
+        with self._lock:
+            return {"day": day, **self._rollup(self._by_day.get(day, {}))}
+
+    def summary(self) -> dict:
+        with self._lock:
+            days = {d: self._rollup(rows)["total"] for d, rows in self._by_day.items()}
+            return {"by_label": self._rollup(self._by_label)["by_label"], "by_day": days}
+
+    def label_totals(self) -> Dict[Tuple[str, str], int]:
+        """(label, direction) → tokens, for the /metrics counter."""
+        with self._lock:
+            out = {}
+            for label, row in self._by_label.items():
+                out[(label, "prompt")] = row["prompt_tokens"]
+                out[(label, "output")] = row["output_tokens"]
+            return out
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_label.clear()
+            self._by_day.clear()
+            self._by_scope.clear()
+
+
+LEDGER = TokenLedger(settings.TOKEN_USAGE_DAYS, settings.TOKEN_USAGE_SCOPES)
+REGISTRY.gauge(
+    "recruiter_llm_tokens_total", "Model tokens by label and direction (prompt, output).",
+    LEDGER.label_totals, ("label", "direction"), kind="counter",
+)
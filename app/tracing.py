@@ -0,0 +1,242 @@
+"""
+Lightweight span tracing for the analyze pipeline, exported as OTLP/JSON.
+
+  • span(name, **attrs)  – context manager / decorator; nests via a
+                           contextvar, so spans opened on the threadpool or in
+                           asyncio tasks attach to the right parent.
+  • current_span()       – add attributes (filename, pages, prompt_chars,
+                           retries, cache_hit, …) from inside a stage.
+  • TracingMiddleware    – one root span per HTTP request; continues an
+                           incoming W3C `traceparent`, returns X-Trace-Id.
+  • FileExporter         – one OTLP/JSON `{"resourceSpans": …}` line per
+                           trace (the OpenTelemetry collector's otlpjsonfile
+                           receiver and Jaeger's OTLP importer read it).
+  • InMemoryExporter     – the most recent finished spans (tests, debugging).
+
+Nothing is recorded until configure() installs an exporter (TRACING_ENABLED);
+until then span() yields a shared no-op span.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+SERVICE_NAME = "recruiter-ai"
+KIND_INTERNAL, KIND_SERVER = 1, 2
+STATUS_ERROR = 2
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "kind", "start_ns", "end_ns",
+                 "attributes", "error", "local_root")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int = KIND_INTERNAL,
+                 local_root: bool = False):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: Dict[str, object] = {}
+        self.error: Optional[str] = None
+        self.local_root = local_root
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def add(self, key: str, amount: int = 1) -> None:
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_otlp(self) -> dict:
+        out = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in self.attributes.items()],
+        }
+        if self.parent_id:
+            out["parentSpanId"] = self.parent_id
+        if self.error is not None:
+            out["status"] = {"code": STATUS_ERROR, "message": self.error}
+        return out
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+    def add(self, key: str, amount: int = 1) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_batch(spans: List[Span]) -> dict:
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{"scope": {"name": "app.tracing"}, "spans": [s.to_otlp() for s in spans]}],
+    }]}
+
+
+# ── Exporters ─────────────────────────────────────────────────────────────────
+class InMemoryExporter:
+    def __init__(self, max_spans: int = 10000):
+        self.spans: "deque[Span]" = deque(maxlen=max_spans)   # oldest dropped first
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        with self._lock:
+            self.spans.extend(spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class FileExporter:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        line = json.dumps(otlp_batch(spans), separators=(",", ":")) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(line)
+
+
+class _Tracer:
+    """Buffers a trace's spans until its local root ends, then exports them in one batch."""
+
+    def __init__(self, exporter):
+        self.exporter = exporter
+        self._pending: Dict[str, List[Span]] = {}
+        self._lock = threading.Lock()
+
+    def finish(self, s: Span) -> None:
+        with self._lock:
+            if s.local_root:
+                batch = self._pending.pop(s.trace_id, []) + [s]
+            elif s.trace_id in _ROOTS:
+                self._pending.setdefault(s.trace_id, []).append(s)
+                return
+            else:   # outlived its root (e.g. a detached task)
+                batch = [s]
+        self.exporter.export(batch)
+
+
+_tracer: Optional[_Tracer] = None
+_ROOTS: Dict[str, bool] = {}     # trace ids with an open local root span
+_CURRENT: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def configure(exporter) -> None:
+    """Install an exporter (None switches tracing off)."""
+    global _tracer
+    _tracer = _Tracer(exporter) if exporter is not None else None
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def current_span():
+    return _CURRENT.get() or NOOP_SPAN
+
+
+@contextmanager
+def span(name: str, _kind: int = KIND_INTERNAL, _parent: Optional[tuple] = None, **attributes):
+    """
+    Time a block as a child of the current span (or a new trace).
+    _parent=(trace_id, span_id) continues a remote trace.
+    """
+    tracer = _tracer
+    if tracer is None:
+        yield NOOP_SPAN
+        return
+    parent = _CURRENT.get()
+    if parent is not None:
+        s = Span(name, parent.trace_id, parent.span_id, _kind)
+    elif _parent is not None:
+        s = Span(name, _parent[0], _parent[1], _kind, local_root=True)
+    else:
+        s = Span(name, os.urandom(16).hex(), None, _kind, local_root=True)
+    s.attributes.update(attributes)
+    if s.local_root:
+        _ROOTS[s.trace_id] = True
+    token = _CURRENT.set(s)
+    try:
+        yield s
+    except BaseException as exc:
+        s.error = f"{type(exc).__name__}: {exc}"[:200]
+        raise
+    finally:
+        _CURRENT.reset(token)
+        s.end_ns = time.time_ns()
+        if s.local_root:
+            _ROOTS.pop(s.trace_id, None)
+        tracer.finish(s)
+
+
+def parse_traceparent(value: str) -> Optional[tuple]:
+    """(trace_id, parent span_id) from a W3C traceparent header, or None."""
+    parts = (value or "").strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    return None if set(parts[1]) == {"0"} else (parts[1], parts[2])
+
+
+class TracingMiddleware:
+    """Root span per HTTP request, named after the matched route once it is known."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or _tracer is None:
+            await self.app(scope, receive, send)
+            return
+        remote = parse_traceparent(Headers(scope=scope).get("traceparent", ""))
+        with span(f"{scope['method']} {scope['path']}", KIND_SERVER, remote,
+                  **{"http.method": scope["method"], "http.target": scope["path"]}) as root:
+
+            async def send_with_trace(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    root.set_attribute("http.status_code", message["status"])
+                    MutableHeaders(scope=message)["X-Trace-Id"] = root.trace_id
+                await send(message)
+
+            await self.app(scope, receive, send_with_trace)
+            route = scope.get("route")
+            if route is not None and getattr(route, "path", None):
+                root.name = f"{scope['method']} {route.path}"
@@ -0,0 +1,157 @@
+"""
+Analysis workers – run /jobs/analyze batches outside the API process.
+
+    python -m app.worker [--workers N] [--queue jobs.db]
+
+Starts N (WORKER_PROCESSES) processes that each claim one job at a time
+from the SQLite queue (JOB_QUEUE_PATH), run the extraction + LLM pipeline
+(app.services.analysis) and write the result back to the queue, where the
+API imports it into its session store on the first GET /jobs/{id} or
+request for the session.  The API and the workers share nothing else, so
+each tier is scaled on its own: more API processes for request handling,
+more workers for model throughput (each worker has its own
+LLM_MAX_CONCURRENCY slots and circuit breaker).
+
+A worker that dies mid-job stops renewing its lease; after
+JOB_LEASE_SECONDS another worker picks the job up again (up to
+JOB_MAX_ATTEMPTS), and a slow worker that finds its job taken over stops
+at the next resume.  An unreadable JD fails the job without retries.  SIGTERM / Ctrl-C lets running jobs finish first.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from typing import Optional
+
+from fastapi import HTTPException
+
+from app.config import settings
+from app.services.analysis import analyze_files
+from app.services.job_queue import Job, JobQueue
+from app.services.llm_scheduler import is_interactive, llm_scope
+from app.services.llm_service import QuotaError
+from app.services.token_usage import LEDGER, TokenBudget, token_scope
+
+logger = logging.getLogger("app.worker")
+
+
+class LeaseLost(RuntimeError):
+    """The job was handed to another worker (our lease ran out) while it was running."""
+
+
+def make_queue(path: Optional[str] = None) -> JobQueue:
+    return JobQueue(
+        path or settings.JOB_QUEUE_PATH,
+        lease_seconds=settings.JOB_LEASE_SECONDS,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+        retention_seconds=settings.JOB_RETENTION_SECONDS,
+    )
+
+
+def process_job(queue: JobQueue, job: Job, worker_id: str) -> None:
+    """Run one claimed analyze job and record its result (or failure) in the queue."""
+    files = queue.files(job.id)
+    if not files:
+        queue.fail(job.id, worker_id, "Job files are missing.")
+        return
+    payload = job.payload
+    limit = payload.get("token_budget") or 0
+    budget = TokenBudget(limit, payload.get("token_budget_mode", "local")) if limit > 0 else None
+    resumes = files[1:]
+    logger.info(f"[{worker_id}] job {job.id}: {len(resumes)} resume(s), attempt {job.attempts}")
+    start = time.perf_counter()
+
+    def progress(n: int) -> None:
+        if not queue.heartbeat(job.id, worker_id, n):
+            raise LeaseLost(f"job {job.id} was reassigned after {n} resume(s)")
+
+    try:
+        with token_scope(job.session_id, budget), llm_scope(job.session_id, is_interactive(len(resumes))):
+            criteria, candidates, errors = analyze_files(files[0], resumes, progress=progress)
+    except LeaseLost as exc:
+        logger.warning(f"[{worker_id}] {exc}; stopping")   # the new owner runs it again
+        return
+    except QuotaError as exc:
+        queue.fail(job.id, worker_id, f"quota: {exc}")
+        return
+    except HTTPException as exc:   # unusable JD (scanned / corrupt file): a retry would fail the same way
+        queue.fail(job.id, worker_id, str(exc.detail))
+        return
+    except Exception as exc:
+        logger.error(f"[{worker_id}] job {job.id} failed: {exc}")
+        queue.fail(job.id, worker_id, str(exc) or type(exc).__name__, retry=True)
+        return
+
+    result = {
+        "criteria": criteria,
+        "candidates": candidates,
+        "errors": payload.get("upload_errors", []) + errors,
+        "token_usage": LEDGER.scope(job.session_id)["total"],
+    }
+    if budget is not None:
+        result["token_budget"] = budget.as_dict()
+    if not queue.complete(job.id, worker_id, result):
+        logger.warning(f"[{worker_id}] job {job.id} was reassigned before it finished; result dropped")
+        return
+    logger.info(f"[{worker_id}] job {job.id} done in {time.perf_counter() - start:.1f}s")
+
+
+def run_worker(queue: JobQueue, worker_id: str, stop=None, max_jobs: Optional[int] = None) -> int:
+    """Claim and run jobs until `stop` is set (or max_jobs have run); returns the jobs run."""
+    done = 0
+    while not (stop is not None and stop.is_set()) and (max_jobs is None or done < max_jobs):
+        job = queue.claim(worker_id)
+        if job is None:
+            if max_jobs is not None:
+                break
+            if stop is not None:
+                stop.wait(settings.JOB_POLL_SECONDS)
+            else:
+                time.sleep(settings.JOB_POLL_SECONDS)
+            continue
+        process_job(queue, job, worker_id)
+        done += 1
+    return done
+
+
+def _worker_main(path: str, n: int, stop) -> None:
+    # Ctrl-C / systemd signal the whole process group; only the parent turns them into `stop`
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, signal.SIG_IGN)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)-8s | %(name)s – %(message)s")
+    run_worker(make_queue(path), f"{socket.gethostname()}-{os.getpid()}-{n}", stop)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Run analysis workers against the local job queue.")
+    parser.add_argument("--workers", type=int, default=settings.WORKER_PROCESSES)
+    parser.add_argument("--queue", default=settings.JOB_QUEUE_PATH, help="SQLite queue file")
+    args = parser.parse_args(argv)
+    if not args.queue:
+        parser.error("JOB_QUEUE_PATH is empty; set it (or --queue) to the API's queue file.")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)-8s | %(name)s – %(message)s")
+
+    stop = multiprocessing.Event()
+    procs = [
+        multiprocessing.Process(target=_worker_main, args=(args.queue, n, stop), name=f"worker-{n}")
+        for n in range(max(1, args.workers))
+    ]
+    for proc in procs:
+        proc.start()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    logger.info(f"{len(procs)} worker(s) polling {args.queue}")
+    try:
+        for proc in procs:
+            proc.join()
+    except KeyboardInterrupt:
+        stop.set()
+        logger.info("stopping: waiting for running jobs to finish")
+        for proc in procs:
+            proc.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Ranking a large job: lazy relationship walk (N+1) vs the keyset ranking query.
+
+    python -m benchmarks.bench_ranking [N]
+
+Seeds N resumes (default 50,000) with evaluations and some approvals into a
+temporary SQLite file, then times the first page, a deep page and the naive
+"load resumes, touch .evaluation/.approval, sort in Python" approach.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base
+from app.services.ranking import rank_candidates
+
+
+def seed(session, n: int) -> int:
+    job = models.Job(job_title="Backend Engineer")
+    session.add(job)
+    session.flush()
+    session.execute(insert(models.Resume), [
+        {"id": i + 1, "job_id": job.id, "name": f"Candidate {i}", "email": f"c{i}@email.com"}
+        for i in range(n)
+    ])
+    session.execute(insert(models.Evaluation), [
+        {"resume_id": i + 1, "job_id": job.id, "total_score": (i * 37) % 101, "verdict": "Yes"} for i in range(n)
+    ])
+    session.execute(insert(models.Approval), [
+        {"resume_id": i + 1, "final_decision": "Interview"} for i in range(0, n, 5)
+    ])
+    session.commit()
+    return job.id
+
+
+def timed(fn, repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main(n: int) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench_ranking.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(1))
+    Session = sessionmaker(bind=engine)
+
+    with Session() as session:
+        job_id = seed(session, n)
+
+    def first_page():
+        with Session() as s:
+            return rank_candidates(s, job_id, limit=50)
+
+    first_ms, page = timed(first_page)
+
+    cursor = None
+    with Session() as s:
+        for _ in range(n // 2 // 500):    # walk to the middle of the ranking
+            cursor = rank_candidates(s, job_id, limit=500, cursor=cursor).next_cursor
+
+    def deep_page():
+        with Session() as s:
+            return rank_candidates(s, job_id, limit=50, cursor=cursor)
+
+    deep_ms, _ = timed(deep_page)
+
+    def naive():
+        with Session() as s:
+            resumes = s.query(models.Resume).filter(models.Resume.job_id == job_id).all()
+            rows = [(r.evaluation.total_score, r.id, r.approval and r.approval.final_decision) for r in resumes]
+            return sorted(rows, key=lambda t: (-t[0], t[1]))[:50]
+
+    statements.clear()
+    first_page()
+    page_queries = len(statements)
+    statements.clear()
+    naive_ms, _ = timed(naive, repeat=1)
+    naive_queries = len(statements)
+
+    print(f"resumes: {n:,}")
+    print(f"{'approach':<28}{'ms':>10}{'queries':>10}")
+    print(f"{'naive lazy loads':<28}{naive_ms:>10.1f}{naive_queries:>10,}")
+    print(f"{'ranking query, first page':<28}{first_ms:>10.1f}{page_queries:>10}")
+    print(f"{'ranking query, middle page':<28}{deep_ms:>10.1f}{page_queries:>10}")
+    print(f"top score: {page.candidates[0].total_score}")
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
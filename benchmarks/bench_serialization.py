@@ -0,0 +1,68 @@
+"""
+Serialization time and bytes on the wire for a /session payload.
+
+    python -m benchmarks.bench_serialization [N]
+
+Compares FastAPI's default path (jsonable_encoder + stdlib json) with the
+orjson response class, full vs ?compact=true rows, and identity / gzip / br
+encodings as produced by CompressionMiddleware.
+"""
+import json
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from app.responses import ORJSONResponse, _Brotli, _Gzip, brotli
+from app.services.session_store import CandidateTable, SessionData
+from benchmarks.bench_session_memory import make_candidates
+
+COMPACT = frozenset({"reasoning", "skills"})
+
+
+def _best_of(fn, repeat: int = 7) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(n: int = 1000) -> dict:
+    session = SessionData("ML Engineer", {"required_skills": ["Python"]}, CandidateTable(make_candidates(n)))
+    # Give every row a unique, Gemini-length reasoning string like real output.
+    for row in range(n):
+        session.candidates.update_scores(row, {
+            **session.candidates.row_dict(row),
+            "reasoning": f"Candidate {row}: " + "relevant experience with the required stack; " * 4,
+        })
+
+    def stdlib_default():
+        return json.dumps(
+            jsonable_encoder(session.to_dict()), ensure_ascii=False,
+            allow_nan=False, indent=None, separators=(",", ":"),
+        ).encode("utf-8")
+
+    def orjson_full():
+        return ORJSONResponse(session.to_dict()).body
+
+    def orjson_compact():
+        return ORJSONResponse(session.to_dict(COMPACT)).body
+
+    results = {"candidates": n, "serialize_ms": {}, "bytes": {}}
+    for name, fn in (("stdlib_default", stdlib_default), ("orjson_full", orjson_full), ("orjson_compact", orjson_compact)):
+        results["serialize_ms"][name] = round(_best_of(fn) * 1000, 2)
+
+    for mode, body in (("full", orjson_full()), ("compact", orjson_compact())):
+        sizes = {"identity": len(body), "gzip": len(_Gzip(6).finish(body))}
+        if brotli is not None:
+            sizes["br"] = len(_Brotli(4).finish(body))
+        results["bytes"][mode] = sizes
+
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,79 @@
+"""
+Memory per candidate: list-of-dicts vs CandidateTable.
+
+    python -m benchmarks.bench_session_memory [N]
+
+Candidates are shaped like real /analyze output: unique ids/names/emails,
+a handful of shared skills, degrees, flags and reasoning strings.
+"""
+import gc
+import sys
+import tracemalloc
+import uuid
+
+from app.services.session_store import CandidateTable
+
+SKILLS = ["Python", "SQL", "Docker", "React", "AWS", "Git", "FastAPI", "Kubernetes"]
+DEGREES = ["B.Sc. Computer Science", "B.Tech. IT", "M.Sc. Data Science"]
+REASONS = [
+    "Strong technical alignment with required skills and good experience fit.",
+    "Partially meets requirements. Worth a screening call.",
+    "Significant gaps in required technical skills.",
+]
+
+
+def make_candidates(n: int) -> list:
+    out = []
+    for i in range(n):
+        total = 30 + (i * 37) % 66
+        out.append({
+            "candidate_id": str(uuid.uuid4()),
+            "filename": f"Resume_Candidate_{i}.pdf",
+            "name": f"Candidate {i}",
+            "email": f"candidate{i}@email.com",
+            "experience_years": i % 12,
+            "skills": [SKILLS[(i + k) % len(SKILLS)] for k in range(5)],
+            "education": DEGREES[i % len(DEGREES)],
+            "total_score": total,
+            "skill_score": total * 40 // 100,
+            "experience_score": total * 20 // 100,
+            "project_score": total * 15 // 100,
+            "education_score": total * 10 // 100,
+            "role_score": total * 15 // 100,
+            "verdict": "Yes" if total >= 65 else "Maybe" if total >= 50 else "No",
+            "flags": "" if i % 4 else "Missing Required Skills",
+            "reasoning": REASONS[i % len(REASONS)],
+            "decision": "Interview" if total >= 65 else "Hold" if total >= 50 else "Reject",
+        })
+    return out
+
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def main(n: int = 20_000) -> dict:
+    # Both layouts are built from the same JSON-ish source so string objects
+    # are allocated inside the measured window in each case.
+    import json
+    raw = json.dumps(make_candidates(n))
+    as_dicts = measure(lambda: json.loads(raw))
+    as_table = measure(lambda: CandidateTable(json.loads(raw)))
+    result = {
+        "candidates": n,
+        "dict_bytes_per_candidate": round(as_dicts / n),
+        "table_bytes_per_candidate": round(as_table / n),
+        "ratio": round(as_dicts / as_table, 2),
+    }
+    print(result)
+    return result
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
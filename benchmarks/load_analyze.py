@@ -0,0 +1,100 @@
+"""
+Offline load test of POST /analyze against the fake Gemini backend.
+
+    python -m benchmarks.load_analyze [--requests 20] [--concurrency 4] [--resumes 5]
+        [--latency-ms 200] [--p99-ms 800] [--dist lognormal] [--rate-429 0]
+        [--malformed-rate 0] [--tokens-per-second 0] [--fake-url http://127.0.0.1:8090]
+
+The app runs in-process (ASGI transport, no network for the API itself);
+LLM calls go to FakeGeminiModel, or to a fake server when --fake-url is set.
+Reports throughput, latency percentiles and what the fake injected.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+
+def _configure(args) -> None:
+    # settings are read at import time, so this must run before importing app.*
+    os.environ.update({
+        "GEMINI_API_KEY": os.environ.get("GEMINI_API_KEY", "load-test"),
+        "TALENT_POOL_PATH": "",
+        "LLM_BACKEND": "fake",
+        "FAKE_LLM_URL": args.fake_url,
+        "FAKE_LLM_LATENCY_MS": str(args.latency_ms),
+        "FAKE_LLM_LATENCY_P99_MS": str(args.p99_ms),
+        "FAKE_LLM_LATENCY_DIST": args.dist,
+        "FAKE_LLM_429_RATE": str(args.rate_429),
+        "FAKE_LLM_MALFORMED_RATE": str(args.malformed_rate),
+        "FAKE_LLM_TOKENS_PER_SECOND": str(args.tokens_per_second),
+        "FAKE_LLM_SEED": "7",
+    })
+
+
+def _percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _run(args) -> None:
+    import httpx
+    from app.main import app
+    from app.services import llm_service
+
+    jd = b"Backend Engineer\nWe need Python, FastAPI, SQL, Docker and AWS. 3+ years."
+    resumes = [
+        (f"Resume_Person_{i}.txt",
+         f"Person {i}\nperson{i}@example.com\n{2 + i % 6} years of Python, SQL, Docker, React".encode())
+        for i in range(args.resumes)
+    ]
+    sem = asyncio.Semaphore(args.concurrency)
+    latencies, statuses = [], {}
+
+    async def one(client):
+        files = [("jd_pdf", ("jd.txt", jd, "text/plain"))]
+        files += [("resumes", (name, body, "text/plain")) for name, body in resumes]
+        async with sem:
+            start = time.perf_counter()
+            resp = await client.post("/analyze", data={"job_title": "Backend Engineer"}, files=files)
+            latencies.append(time.perf_counter() - start)
+            statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=None) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client) for _ in range(args.requests)))
+        wall = time.perf_counter() - start
+
+    print(f"requests: {args.requests}  concurrency: {args.concurrency}  resumes/request: {args.resumes}")
+    print(f"wall: {wall:.2f}s  throughput: {args.requests / wall:.2f} req/s  "
+          f"{args.requests * args.resumes / wall:.1f} resumes/s")
+    print(f"latency  p50 {_percentile(latencies, 0.5):.3f}s  p95 {_percentile(latencies, 0.95):.3f}s  "
+          f"p99 {_percentile(latencies, 0.99):.3f}s  mean {statistics.mean(latencies):.3f}s")
+    print(f"status codes: {dict(sorted(statuses.items()))}")
+    fake_stats = getattr(llm_service._model, "stats", None)
+    if fake_stats is not None:
+        print(f"fake model: {fake_stats}")
+    print(f"gemini JSON replies: {llm_service.JSON_STATS.snapshot()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--resumes", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--p99-ms", type=float, default=800)
+    parser.add_argument("--dist", default="lognormal", choices=("fixed", "uniform", "lognormal"))
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--fake-url", default="")
+    args = parser.parse_args()
+    _configure(args)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
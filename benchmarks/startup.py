@@ -0,0 +1,96 @@
+"""
+Cold-start cost: import time of app.main and of the lazily loaded SDKs,
+each measured in a fresh interpreter.
+
+    python -m benchmarks.startup [--repeat 5] [--top 15]
+
+Prints best-of-N wall times and the heaviest imports (python -X importtime,
+cumulative).  The same numbers run as the "startup" group of
+benchmarks.suite, so import-cost regressions hit the baseline gate.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Each snippet prints one number: milliseconds spent in the measured part.
+SNIPPETS = {
+    "startup.import_app_main.ms": (
+        "import time; t = time.perf_counter(); import app.main; "
+        "print((time.perf_counter() - t) * 1000)"
+    ),
+    "startup.warm_up.ms": (
+        "import app.main, time; t = time.perf_counter(); app.main._warm_up(); "
+        "print((time.perf_counter() - t) * 1000)"
+    ),
+    "startup.first_pdf.ms": (
+        "import app.main, time; from benchmarks.suite import resume_pdf; "
+        "from app.services.pdf_service import extract_text_from_pdf; b = resume_pdf(0); "
+        "t = time.perf_counter(); extract_text_from_pdf(b, 'r.pdf'); "
+        "print((time.perf_counter() - t) * 1000)"
+    ),
+}
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("GEMINI_API_KEY", "benchmark")
+    env.update({"TALENT_POOL_PATH": "", "PYTHONPATH": str(ROOT), "PYTHONDONTWRITEBYTECODE": "1"})
+    return env
+
+
+def _run(code: str, importtime: bool = False) -> Tuple[float, str]:
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    proc = subprocess.run(cmd, cwd=ROOT, env=_env(), capture_output=True, text=True, check=True)
+    return float(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+def heaviest_imports(stderr: str, top: int) -> List[Tuple[str, float]]:
+    """
+    Packages by cumulative import time (ms), from -X importtime output.
+    A package is charged where it is first entered from another package, so
+    e.g. starlette also counts inside fastapi's figure.
+    """
+    rows = []   # (depth, name, cumulative µs), in output (post-) order
+    for line in stderr.splitlines():
+        parts = line[len("import time:"):].split("|") if line.startswith("import time:") else []
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        raw = parts[2].rstrip()
+        depth = (len(raw) - len(raw.lstrip(" ")) - 1) // 2
+        rows.append((depth, raw.strip(), int(parts[1])))
+
+    totals: Dict[str, float] = {}
+    parents: Dict[int, str] = {}
+    for depth, name, cumulative in reversed(rows):   # parents come first when reversed
+        package = name.split(".")[0]
+        parents[depth] = package
+        if depth == 0 or parents.get(depth - 1) != package:
+            totals[package] = totals.get(package, 0) + cumulative / 1000
+    return sorted(totals.items(), key=lambda kv: -kv[1])[:top]
+
+
+def bench_startup(repeat: int) -> Dict[str, float]:
+    return {name: min(_run(code)[0] for _ in range(repeat)) for name, code in SNIPPETS.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for name, value in bench_startup(args.repeat).items():
+        print(f"{name:<40}{value:>10.1f}")
+    _, stderr = _run(SNIPPETS["startup.import_app_main.ms"], importtime=True)
+    print("\nheaviest imports at startup (cumulative ms):")
+    for name, ms in heaviest_imports(stderr, args.top):
+        print(f"  {name:<36}{ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
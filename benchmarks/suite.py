@@ -0,0 +1,318 @@
+"""
+End-to-end benchmark suite with a JSON baseline and regression gate.
+
+    python -m benchmarks.suite                     # run, compare with the baseline
+    python -m benchmarks.suite --update            # run and (re)write the baseline
+    python -m benchmarks.suite --only pdf,store --tolerance 0.3
+    python -m benchmarks.suite --sizes 1,10,100 --metric-tolerance analyze.999.seconds=0.5
+    python -m benchmarks.suite --cassette ci.jsonl --record   # record real Gemini replies once
+    python -m benchmarks.suite --cassette ci.jsonl            # replay them offline
+
+Groups (each metric is a best-of-N wall time, lower is better):
+
+  • pdf      – pdfplumber extraction of the sample files in "resumes and JD/"
+               and of generated 1- and 3-page PDFs
+  • llm      – llm_service overhead per call on the fake backend (prompt
+               build, JSON parse, evaluation cache), with zero model latency
+  • analyze  – POST /analyze wall time for 1/10/100/999 generated PDF resumes
+               (Starlette parses at most 1000 files per request, JD included)
+  • store    – CandidateTable build / sort / filter / serialise at 10k rows
+  • startup  – import app.main, warm-up and first-PDF cost in fresh
+               interpreters (see benchmarks/startup.py)
+
+Results are written to --out (default benchmarks/results.json).  With a
+baseline present, any metric slower than baseline × (1 + tolerance) is a
+regression and the exit status is 1.  Baselines are machine specific, so
+they are not committed; create one locally with --update.
+
+With --cassette the llm / analyze groups replay recorded model replies
+(app.services.llm_providers) instead of the fake's generated ones, so runs
+see production-shaped replies and stay reproducible; prompts the cassette
+doesn't know fall back to mock data and are counted as misses.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+SAMPLES_DIR = ROOT / "resumes and JD"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_RESULTS = Path(__file__).resolve().parent / "results.json"
+GROUPS = ("pdf", "llm", "analyze", "store", "startup")
+DEFAULT_SIZES = (1, 10, 100, 999)   # 999 resumes + the JD = multipart max_files
+
+
+def _configure_env(cassette: str = "", record: bool = False) -> None:
+    # settings are read at import time, so this must run before importing app.*
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+    os.environ.update({
+        "TALENT_POOL_PATH": "",
+        "LLM_BACKEND": "gemini" if record else "fake",
+        "LLM_CASSETTE": cassette,
+        "LLM_CASSETTE_MODE": "record" if record else "replay",
+        "FAKE_LLM_URL": "",
+        "FAKE_LLM_LATENCY_MS": "0",
+        "FAKE_LLM_LATENCY_DIST": "fixed",
+        "FAKE_LLM_429_RATE": "0",
+        "FAKE_LLM_MALFORMED_RATE": "0",
+        "FAKE_LLM_TOKENS_PER_SECOND": "0",
+    })
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+# ── Generated PDFs ────────────────────────────────────────────────────────────
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: List[List[str]]) -> bytes:
+    """Minimal text-only PDF (Helvetica, one content stream per page)."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        body = "BT /F1 11 Tf 14 TL 50 750 Td " + " ".join(f"({_pdf_escape(l)}) Tj T*" for l in lines) + " ET"
+        objects.append(f"<< /Length {len(body)} >>\nstream\n{body}\nendstream")
+        content_ref = len(objects)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Contents {content_ref} 0 R /Resources << /Font << /F1 3 0 R >> >> >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def resume_pdf(i: int, pages: int = 1) -> bytes:
+    skills = ["Python", "SQL", "Docker", "React", "AWS", "FastAPI", "Kubernetes", "Git"]
+    first = [f"Candidate {i}", f"candidate{i}@example.com", f"{1 + i % 9} years of experience",
+             "Skills: " + ", ".join(skills[(i + k) % len(skills)] for k in range(4)),
+             "Education: B.Sc. Computer Science"]
+    filler = [f"Project {p}: built and operated services handling production traffic." for p in range(30)]
+    return make_pdf([first + filler[:20]] + [filler] * (pages - 1))
+
+
+JD_TEXT = ["Backend Engineer", "Required: Python, FastAPI, SQL, Docker", "3-6 years of experience"]
+
+
+# ── Groups ────────────────────────────────────────────────────────────────────
+
+def bench_pdf(repeat: int) -> Dict[str, float]:
+    from app.services.pdf_service import extract_text_from_pdf
+
+    results = {}
+    samples = sorted(SAMPLES_DIR.glob("*.pdf")) if SAMPLES_DIR.is_dir() else []
+    if samples:
+        blobs = [(p.name, p.read_bytes()) for p in samples]
+        t = best_of(lambda: [extract_text_from_pdf(b, n) for n, b in blobs], repeat)
+        results["pdf.samples.ms_per_file"] = 1000 * t / len(blobs)
+    for pages in (1, 3):
+        blobs = [resume_pdf(i, pages) for i in range(20)]
+        t = best_of(lambda: [extract_text_from_pdf(b, "r.pdf") for b in blobs], repeat)
+        results[f"pdf.generated_{pages}p.ms_per_file"] = 1000 * t / len(blobs)
+    return results
+
+
+def bench_llm(repeat: int) -> Dict[str, float]:
+    from app.services import llm_service
+
+    criteria = {"required_skills": ["Python", "SQL", "Docker"], "min_experience": 2,
+                "max_experience": 6, "role_level": "Mid"}
+    texts = [f"Person {i}\np{i}@example.com\n{i % 9} years Python SQL" for i in range(200)]
+    parsed = [llm_service.parse_resume(t) for t in texts]
+
+    def evaluate_uncached():
+        llm_service._EVAL_CACHE.clear()
+        for c in parsed:
+            llm_service.evaluate_candidate(criteria, c)
+
+    results = {
+        "llm.parse_resume.us_per_call": 1e6 * best_of(lambda: [llm_service.parse_resume(t) for t in texts], repeat) / len(texts),
+        "llm.evaluate_uncached.us_per_call": 1e6 * best_of(evaluate_uncached, repeat) / len(parsed),
+    }
+    results["llm.evaluate_cached.us_per_call"] = 1e6 * best_of(
+        lambda: [llm_service.evaluate_candidate(criteria, c) for c in parsed], repeat) / len(parsed)
+    return results
+
+
+def bench_analyze(repeat: int, sizes) -> Dict[str, float]:
+    from fastapi.testclient import TestClient
+    from app.main import SESSION_STORE, app
+    from app.services import llm_service
+
+    client = TestClient(app)
+    jd = make_pdf([JD_TEXT])
+    pool = [resume_pdf(i) for i in range(max(sizes))]
+    results = {}
+    for n in sizes:
+        files = [("jd_pdf", ("jd.pdf", jd, "application/pdf"))]
+        files += [("resumes", (f"Resume_{i}.pdf", pool[i], "application/pdf")) for i in range(n)]
+
+        def run():
+            llm_service._EVAL_CACHE.clear()
+            resp = client.post("/analyze", data={"job_title": "Backend Engineer"}, files=files)
+            assert resp.status_code == 200 and resp.json()["total_candidates"] == n, resp.text[:200]
+            SESSION_STORE.pop(resp.json()["session_id"], None)
+
+        results[f"analyze.{n}.seconds"] = best_of(run, repeat if n <= 100 else 1)
+    return results
+
+
+def bench_store(repeat: int) -> Dict[str, float]:
+    from app.services.session_store import CandidateTable
+    from benchmarks.bench_session_memory import make_candidates
+
+    rows = make_candidates(10_000)
+    table = CandidateTable(rows)
+    extra = make_candidates(200)
+
+    def insert():
+        t = CandidateTable(rows[:2000])
+        for c in extra:
+            t.insert_ranked(t.append(c))
+
+    return {
+        "store.build_10k.ms": 1000 * best_of(lambda: CandidateTable(rows), repeat),
+        "store.sort_10k.ms": 1000 * best_of(table.sort, repeat),
+        "store.filter_10k.ms": 1000 * best_of(lambda: table.ranked_rows(decision="Interview", verdict="Yes"), repeat),
+        "store.to_list_10k.ms": 1000 * best_of(table.to_list, repeat),
+        "store.insert_ranked_200.ms": 1000 * best_of(insert, repeat),
+    }
+
+
+def bench_startup(repeat: int) -> Dict[str, float]:
+    from benchmarks.startup import bench_startup as run
+    return run(repeat)
+
+
+# ── Baseline comparison ───────────────────────────────────────────────────────
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], tolerance: float,
+            overrides: Dict[str, float]) -> List[dict]:
+    """Metrics slower than baseline × (1 + tolerance); per-metric overrides win."""
+    regressions = []
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base is None or base <= 0:
+            continue
+        limit = overrides.get(name, tolerance)
+        if value > base * (1 + limit):
+            regressions.append({"metric": name, "baseline": base, "current": value,
+                                "change": value / base - 1, "tolerance": limit})
+    return regressions
+
+
+def _parse_overrides(items) -> Dict[str, float]:
+    out = {}
+    for item in items or []:
+        name, _, value = item.partition("=")
+        out[name] = float(value)
+    return out
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Analyze-pipeline benchmark suite.")
+    parser.add_argument("--only", default=",".join(GROUPS), help="comma-separated groups")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="/analyze resume counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--out", type=Path, default=DEFAULT_RESULTS)
+    parser.add_argument("--update", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--metric-tolerance", action="append", metavar="NAME=FRACTION")
+    parser.add_argument("--cassette", default="", help="replay model replies from this cassette file")
+    parser.add_argument("--record", action="store_true", help="record the cassette from Gemini (needs an API key)")
+    args = parser.parse_args(argv)
+    if args.record and not args.cassette:
+        parser.error("--record needs --cassette")
+
+    groups = [g.strip() for g in args.only.split(",") if g.strip()]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown group(s): {', '.join(sorted(unknown))}")
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    _configure_env(args.cassette, args.record)
+    import logging
+    logging.disable(logging.INFO)
+
+    results: Dict[str, float] = {}
+    runners = {
+        "pdf": lambda: bench_pdf(args.repeat),
+        "llm": lambda: bench_llm(args.repeat),
+        "analyze": lambda: bench_analyze(args.repeat, sizes),
+        "store": lambda: bench_store(args.repeat),
+        "startup": lambda: bench_startup(args.repeat),
+    }
+    for group in groups:
+        t0 = time.perf_counter()
+        group_results = runners[group]()
+        results.update(group_results)
+        for name, value in group_results.items():
+            print(f"{name:<40}{value:>14.3f}")
+        print(f"  ({group} took {time.perf_counter() - t0:.1f}s)")
+    if args.cassette:
+        from app.services.llm_providers import CASSETTE_CALLS
+        print("cassette: " + "  ".join(f"{r} {CASSETTE_CALLS.value(result=r):.0f}" for r in ("hit", "miss", "recorded")))
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": {k: round(v, 4) for k, v in results.items()},
+    }
+    args.out.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.update:
+        if args.baseline.exists():
+            merged = json.loads(args.baseline.read_text())
+            merged["results"].update(report["results"])
+            merged["meta"] = report["meta"]
+            report = merged
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --update to create one")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline["meta"].get("platform") != report["meta"]["platform"]:
+        print(f"note: baseline was recorded on {baseline['meta'].get('platform')}")
+    regressions = compare(results, baseline["results"], args.tolerance, _parse_overrides(args.metric_tolerance))
+    for r in regressions:
+        print(f"REGRESSION {r['metric']}: {r['baseline']:.3f} → {r['current']:.3f} "
+              f"(+{r['change']:.0%}, allowed +{r['tolerance']:.0%})")
+    if not regressions:
+        print(f"no regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,12 +3,16 @@ Pytest configuration and fixtures.
 Overrides DATABASE_URL to use an in-memory SQLite for all tests.
 """
 import os
+from unittest.mock import patch
+
 import pytest
 
 # Use SQLite in-memory for tests BEFORE the app is imported
 os.environ["DATABASE_URL"] = "sqlite:///./test.db"
 os.environ["GEMINI_API_KEY"] = "test-key"
 os.environ["SECRET_KEY"] = "test-secret-key-for-tests-only"
+os.environ["TALENT_POOL_PATH"] = ""
+os.environ["JOB_QUEUE_PATH"] = ""
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -16,6 +20,8 @@ from fastapi.testclient import TestClient
 
 from app.database import Base, get_db
 from app.main import app
+from app.services import llm_service
+from app.services.fake_llm import FakeGeminiModel, FakeLLMConfig
 
 SQLALCHEMY_TEST_URL = "sqlite:///./test.db"
 
@@ -43,3 +49,28 @@ def override_get_db():
 
 
 app.dependency_overrides[get_db] = override_get_db
+
+
+class FakeLLM:
+    """What `fake_llm` yields: llm_service calls `model`; use() swaps in another provider."""
+
+    def __init__(self, model):
+        self.model = model
+
+    def use(self, provider):
+        llm_service._EVAL_CACHE.clear()
+        llm_service._model = self.model = provider
+        return provider
+
+
+@pytest.fixture
+def fake_llm():
+    """llm_service wired to a deterministic FakeGeminiModel: no demo mode, no sleeps, empty eval cache."""
+    fake = FakeLLM(FakeGeminiModel(FakeLLMConfig(seed=3, latency_ms=0), sleep=lambda s: None))
+    llm_service._EVAL_CACHE.clear()
+    with (
+        patch.object(llm_service, "_model", fake.model),   # also restores whatever use() installed
+        patch.object(llm_service, "_demo", return_value=False),
+        patch.object(llm_service.settings, "LLM_BACKEND", "fake"),
+    ):
+        yield fake
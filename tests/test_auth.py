@@ -0,0 +1,134 @@
+"""
+Tests for the auth hot path: off-loop bcrypt, the token → recruiter cache and
+the async session path.  The auth router is mounted on a throwaway app next
+to one protected route; both DB paths point at the conftest SQLite file.
+"""
+import asyncio
+import uuid
+from unittest.mock import patch
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.auth import create_access_token, hash_password, verify_password_async
+from app.database import async_url, pool_stats
+from app.dependencies import RecruiterSnapshot, get_current_recruiter, recruiter_cache
+from app.metrics import REGISTRY
+from app.routers.auth import router
+from tests.conftest import TestingSessionLocal
+
+auth_app = FastAPI()
+auth_app.include_router(router)
+
+
+@auth_app.get("/me")
+def me(recruiter: RecruiterSnapshot = Depends(get_current_recruiter)):
+    return {"id": recruiter.id, "full_name": recruiter.full_name}
+
+
+client = TestClient(auth_app)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _one_event_loop():
+    # keep pooled async connections on a single loop for the whole module
+    with client:
+        yield
+
+
+def _bcrypt_works() -> bool:
+    # passlib 1.7 cannot drive bcrypt >= 4.1; the hashing tests need a working pair
+    try:
+        hash_password("probe")
+        return True
+    except Exception:
+        return False
+
+
+needs_bcrypt = pytest.mark.skipif(not _bcrypt_works(), reason="passlib/bcrypt versions incompatible")
+
+
+def make_recruiter() -> int:
+    db = TestingSessionLocal()
+    try:
+        recruiter = models.Recruiter(email=f"{uuid.uuid4().hex[:8]}@r.ai", hashed_password="x", full_name="Cache Tester")
+        db.add(recruiter)
+        db.commit()
+        return recruiter.id
+    finally:
+        db.close()
+
+
+def bearer(recruiter_id: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(recruiter_id)})}"}
+
+
+@needs_bcrypt
+def test_verify_password_async_runs_off_loop():
+    hashed = hash_password("s3cret")
+    assert asyncio.run(verify_password_async("s3cret", hashed)) is True
+    assert asyncio.run(verify_password_async("wrong", hashed)) is False
+
+
+@needs_bcrypt
+def test_register_login_and_wrong_password():
+    client.post("/auth/register", json={"email": "login@r.ai", "password": "Pass123!", "full_name": "L"})
+    ok = client.post("/auth/token", data={"username": "login@r.ai", "password": "Pass123!"})
+    assert ok.status_code == 200
+    resp = client.post("/auth/token", data={"username": "login@r.ai", "password": "nope"})
+    assert resp.status_code == 401
+
+
+def test_cached_recruiter_skips_db_lookup():
+    recruiter_cache.clear()
+    headers = bearer(make_recruiter())
+    assert client.get("/me", headers=headers).status_code == 200
+
+    with patch.object(AsyncSession, "get", side_effect=AssertionError("DB hit on cached token")):
+        resp = client.get("/me", headers=headers)
+    assert resp.status_code == 200
+    assert resp.json()["full_name"] == "Cache Tester"
+
+
+def test_orm_update_invalidates_cache():
+    recruiter_cache.clear()
+    recruiter_id = make_recruiter()
+    headers = bearer(recruiter_id)
+    assert client.get("/me", headers=headers).json()["full_name"] == "Cache Tester"
+
+    db = TestingSessionLocal()
+    try:
+        db.get(models.Recruiter, recruiter_id).full_name = "Renamed"
+        db.commit()
+    finally:
+        db.close()
+
+    assert client.get("/me", headers=headers).json()["full_name"] == "Renamed"
+
+
+def test_bad_token_is_rejected():
+    assert client.get("/me", headers={"Authorization": "Bearer garbage"}).status_code == 401
+
+
+def test_async_url_picks_async_driver():
+    assert async_url("sqlite:///./x.db") == "sqlite+aiosqlite:///./x.db"
+    assert async_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert async_url("postgresql+psycopg2://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+
+
+def test_pool_stats_report_async_checkouts():
+    headers = bearer(make_recruiter())
+    recruiter_cache.clear()
+    client.get("/me", headers=headers)
+    stats = pool_stats()
+    assert stats["async"]["checkouts"] >= 1
+    assert stats["async"]["checkedout"] == 0
+    assert {"size", "overflow", "avg_hold_ms"} <= stats["sync"].keys()
+
+    text = REGISTRY.render()   # what /metrics serves
+    assert 'recruiter_db_pool_connections{engine="async",state="checkedout"} 0' in text
+    assert 'recruiter_db_pool_connections{engine="sync",state="size"}' in text
+    assert 'recruiter_db_pool_checkouts_total{engine="async"}' in text
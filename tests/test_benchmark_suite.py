@@ -0,0 +1,32 @@
+"""
+Tests for the benchmark suite's regression gate and PDF generator.
+"""
+from app.services.pdf_service import extract_text_from_pdf
+from benchmarks.suite import compare, make_pdf, resume_pdf
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance():
+    baseline = {"a": 1.0, "b": 1.0, "c": 1.0, "new_in_baseline": 1.0}
+    results = {"a": 1.2, "b": 1.3, "c": 0.5, "not_in_baseline": 9.0}
+    regressions = compare(results, baseline, tolerance=0.25, overrides={})
+    assert [r["metric"] for r in regressions] == ["b"]
+    assert compare(results, baseline, 0.25, {"b": 0.5}) == []
+
+
+def test_generated_pdfs_are_extractable():
+    text = extract_text_from_pdf(make_pdf([["Hello (world)", "line two"], ["page two"]]))
+    assert text.splitlines() == ["Hello (world)", "line two", "page two"]
+    assert "candidate7@example.com" in extract_text_from_pdf(resume_pdf(7))
+
+
+def test_heaviest_imports_charges_package_entry_points():
+    from benchmarks.startup import heaviest_imports
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        100 |       starlette.types",
+        "import time:       200 |        300 |     starlette",
+        "import time:       500 |        800 |   fastapi",
+        "import time:        50 |         50 |   app.config",
+        "import time:        10 |        860 | app.main",
+    ])
+    assert heaviest_imports(stderr, 3) == [("app", 0.86), ("fastapi", 0.8), ("starlette", 0.3)]
@@ -0,0 +1,130 @@
+"""
+Tests for the Gemini circuit breaker and its /health report.
+"""
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import llm_service
+from app.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.services.llm_service import CircuitOpen, QuotaError
+
+client = TestClient(app)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FlakyProvider:
+    def __init__(self, error="429 Resource has been exhausted (e.g. check quota)."):
+        self.error = error
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        if self.error:
+            raise RuntimeError(self.error)
+        return SimpleNamespace(text='{"name": "Model Reply", "skills": ["Python"]}')
+
+
+@pytest.fixture
+def breaker(fake_llm):
+    clock = Clock()
+    b = CircuitBreaker(threshold=2, reset_seconds=30, clock=clock)
+    b.clock = clock
+    sleeps = []
+    with (
+        patch.object(llm_service, "BREAKER", b),
+        patch.object(llm_service.time, "sleep", sleeps.append),
+    ):
+        b.sleeps = sleeps
+        yield b
+
+
+def test_state_machine():
+    clock = Clock()
+    b = CircuitBreaker(threshold=2, reset_seconds=10, clock=clock)
+    b.record_failure("429")
+    assert b.state == CLOSED and b.allow()
+    b.record_failure("429")
+    assert b.state == OPEN and not b.allow() and b.rejected == 1
+    assert b.retry_in() == 10
+
+    clock.now = 10
+    assert b.allow() and b.state == HALF_OPEN
+    assert not b.allow()                      # only one probe at a time
+    b.release_probe()                         # probe timed out: next caller may probe
+    assert b.allow()
+    b.record_failure("429 again")
+    assert b.state == OPEN and b.opens == 2 and b.retry_in() == 10
+
+    clock.now = 25
+    assert b.allow()
+    b.record_success()
+    assert b.state == CLOSED and b.failures == 0 and b.allow()
+
+
+def test_open_breaker_fails_fast_without_retry_sleeps(breaker):
+    provider = FlakyProvider()
+    with patch.object(llm_service, "_model", provider):
+        with pytest.raises(QuotaError):
+            llm_service.parse_resume("text", "a.pdf")
+        assert breaker.state == OPEN and provider.calls == 2
+        assert breaker.sleeps == [llm_service.RETRY_DELAY]   # only before the breaker opened
+
+        with pytest.raises(CircuitOpen):
+            llm_service.parse_resume("text", "b.pdf")
+    assert provider.calls == 2 and breaker.sleeps == [llm_service.RETRY_DELAY]
+
+
+@pytest.mark.parametrize("policy", ["local", "mock"])
+def test_open_breaker_policy_scores_without_the_model(breaker, policy):
+    breaker.record_failure("429")
+    breaker.record_failure("429")
+    criteria = {"required_skills": ["Python"], "min_experience": 1, "max_experience": 5}
+    provider = FlakyProvider(error="")
+    with patch.object(llm_service, "_model", provider), \
+            patch.object(llm_service.settings, "LLM_BREAKER_POLICY", policy):
+        resume = llm_service.parse_resume("Jane Doe\n3 years Python", "Resume_Jane_Doe.pdf")
+        result = llm_service.evaluate_candidate(criteria, resume, "Resume_Jane_Doe.pdf")
+    assert provider.calls == 0
+    assert resume["name"] == "Jane Doe"
+    assert (result["flags"] == llm_service.BREAKER_FLAG) is (policy == "local")
+
+
+def test_auth_failures_trip_and_a_probe_closes_it(breaker):
+    provider = FlakyProvider(error="403 API key not valid. Please pass a valid API key.")
+    with patch.object(llm_service, "_model", provider):
+        with pytest.raises(CircuitOpen):
+            llm_service.parse_resume("text", "a.pdf")
+        assert breaker.state == OPEN
+
+        breaker.clock.now = 30
+        provider.error = ""
+        assert llm_service.parse_resume("text", "a.pdf")["name"] == "Model Reply"
+    assert breaker.state == CLOSED
+
+
+def test_other_errors_do_not_trip(breaker):
+    with patch.object(llm_service, "_model", FlakyProvider(error="500 Internal error")):
+        for _ in range(3):
+            llm_service.parse_resume("text", "Resume_X.pdf")   # mock fallback
+    assert breaker.state == CLOSED and breaker.failures == 0
+
+
+def test_health_reports_breaker_state(breaker):
+    assert client.get("/health").json()["llm_breaker"]["state"] == "closed"
+    breaker.record_failure("429 quota")
+    breaker.record_failure("429 quota")
+    body = client.get("/health").json()
+    assert body["status"] == "degraded"
+    assert body["llm_breaker"]["state"] == "open" and body["llm_breaker"]["retry_in_seconds"] == 30
+    assert "recruiter_llm_breaker_state 2" in client.get("/metrics").text
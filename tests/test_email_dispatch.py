@@ -0,0 +1,197 @@
+"""
+Tests for the outbound e-mail queue against a local aiosmtpd stand-in server.
+"""
+import asyncio
+import socket
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+pytest.importorskip("aiosmtplib")
+
+from fastapi.testclient import TestClient
+
+from app.services.email_dispatch import (
+    EmailDispatcher, OutboundEmail, QueueFullError, SMTPPool, idempotency_key,
+)
+
+
+class RecordingHandler:
+    """Accepts every message; optionally answers 451 (transient) for some recipients once."""
+
+    def __init__(self, flaky=()):
+        self.received = []
+        self.flaky = set(flaky)
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.flaky:
+            self.flaky.discard(address)
+            return "451 Try again later"
+        if address.startswith("bounce"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received.append((envelope.rcpt_tos[0], envelope.content.decode()))
+        return "250 Message accepted"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    def start(handler):
+        controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=_free_port())
+        controller.start()
+        servers.append(controller)
+        return controller
+    servers = []
+    yield start
+    for c in servers:
+        c.stop()
+
+
+def make_messages(n, prefix="user"):
+    return [
+        OutboundEmail(key=idempotency_key(prefix, str(i), "Interview"), to=f"{prefix}{i}@example.com",
+                      subject="Hi", body=f"Letter {i}", candidate_id=str(i), decision="Interview")
+        for i in range(n)
+    ]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_sends_in_batches_over_pooled_connections(smtp_server):
+    handler = RecordingHandler()
+    server = smtp_server(handler)
+
+    async def scenario():
+        dispatcher = EmailDispatcher(SMTPPool("127.0.0.1", server.port, size=2), "hr@example.com",
+                                     batch_size=25, rate_per_second=0)
+        batch_id = dispatcher.submit(make_messages(200))
+        await asyncio.wait_for(dispatcher.join(), 20)
+        report = dispatcher.batch_status(batch_id)
+        connects = dispatcher.pool.connects
+        await dispatcher.stop()
+        return report, connects
+
+    report, connects = run(scenario())
+    assert report["counts"]["sent"] == 200
+    assert len(handler.received) == 200
+    assert connects <= 2
+    assert "X-Idempotency-Key" in handler.received[0][1]
+
+
+def test_duplicate_keys_are_not_resent(smtp_server):
+    handler = RecordingHandler()
+    server = smtp_server(handler)
+
+    async def scenario():
+        dispatcher = EmailDispatcher(SMTPPool("127.0.0.1", server.port, size=1), "hr@example.com", rate_per_second=0)
+        dispatcher.submit(make_messages(5))
+        await dispatcher.join()
+        second = dispatcher.submit(make_messages(5))
+        await dispatcher.join()
+        report = dispatcher.batch_status(second)
+        await dispatcher.stop()
+        return report
+
+    report = run(scenario())
+    assert report["duplicates"] == 5
+    assert len(handler.received) == 5
+
+
+def test_finished_dispatches_are_forgotten_after_retention(smtp_server):
+    handler = RecordingHandler()
+    server = smtp_server(handler)
+
+    async def scenario():
+        dispatcher = EmailDispatcher(SMTPPool("127.0.0.1", server.port, size=1), "hr@example.com",
+                                     rate_per_second=0, retention_seconds=60)
+        first = dispatcher.submit(make_messages(3))
+        await dispatcher.join()
+        dispatcher._prune(force=True)   # still inside the window
+        kept = dispatcher.batch_status(first) is not None and len(dispatcher.statuses) == 3
+        with patch("app.services.email_dispatch.time.time", return_value=dispatcher.batches[first]["created_at"] + 61):
+            dispatcher._prune(force=True)
+        forgotten = dispatcher.batch_status(first) is None and not dispatcher.statuses
+        await dispatcher.stop()
+        return kept, forgotten
+
+    assert run(scenario()) == (True, True)
+
+
+def test_transient_failures_retry_and_permanent_failures_stop(smtp_server):
+    handler = RecordingHandler(flaky={"user0@example.com"})
+    server = smtp_server(handler)
+
+    async def scenario():
+        dispatcher = EmailDispatcher(SMTPPool("127.0.0.1", server.port, size=1), "hr@example.com",
+                                     rate_per_second=0, retry_backoff=0.01)
+        ok = dispatcher.submit(make_messages(2))
+        bad = dispatcher.submit(make_messages(1, prefix="bounce"))
+        await asyncio.wait_for(dispatcher.join(), 10)
+        reports = dispatcher.batch_status(ok), dispatcher.batch_status(bad)
+        await dispatcher.stop()
+        return reports
+
+    ok, bad = run(scenario())
+    assert ok["counts"]["sent"] == 2
+    assert ok["messages"][0]["attempts"] == 2
+    assert bad["counts"]["failed"] == 1
+    assert bad["messages"][0]["attempts"] == 1
+    assert bad["messages"][0]["error"].startswith("550")
+
+
+def test_backpressure_rejects_oversized_batches():
+    async def scenario():
+        dispatcher = EmailDispatcher(SMTPPool("127.0.0.1", 1, size=1), "hr@example.com", max_queue=3)
+        with pytest.raises(QueueFullError):
+            dispatcher.submit(make_messages(4))
+        await dispatcher.stop()
+
+    run(scenario())
+
+
+def test_finalize_queues_letters_and_returns_immediately(smtp_server):
+    from app import main
+    from app.services.session_store import CandidateTable, SessionData
+
+    handler = RecordingHandler()
+    server = smtp_server(handler)
+    rows = [{
+        "candidate_id": str(uuid.uuid4()), "filename": f"c{i}.pdf", "name": f"C{i}",
+        "email": f"c{i}@example.com" if i else None, "experience_years": 2, "skills": [],
+        "education": "", "total_score": 80, "skill_score": 0, "experience_score": 0,
+        "project_score": 0, "education_score": 0, "role_score": 0, "verdict": "Strong Yes",
+        "flags": "", "reasoning": "", "decision": "Interview",
+    } for i in range(4)]
+    sid = str(uuid.uuid4())
+    main.SESSION_STORE[sid] = SessionData("Dev", {}, CandidateTable(rows))
+
+    dispatcher = EmailDispatcher(SMTPPool("127.0.0.1", server.port, size=1), "hr@example.com", rate_per_second=0)
+    with (
+        patch.object(main, "EMAIL_DISPATCHER", dispatcher),
+        patch.object(main.settings, "EMAIL_SENDING_ENABLED", True),
+        TestClient(main.app) as client,
+    ):
+        body = client.post(f"/finalize/{sid}").json()
+        assert body["simulated"] is False
+        assert body["dispatch"]["queued"] == 3
+        assert body["dispatch"]["skipped_no_email"] == 1
+        client.portal.call(dispatcher.join)
+        status = client.get(f"/dispatch/{body['dispatch']['dispatch_id']}").json()
+        assert status["counts"]["sent"] == 3
+
+        again = client.post(f"/finalize/{sid}").json()
+        assert again["dispatch"]["duplicates"] == 3
+    assert len(handler.received) == 3
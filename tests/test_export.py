@@ -0,0 +1,96 @@
+"""
+Tests for streaming CSV / NDJSON / Parquet session exports.
+"""
+import csv
+import io
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app, SESSION_STORE
+from app.services import export
+from app.services.session_store import CandidateTable, SessionData
+
+client = TestClient(app)
+
+
+def make_session(n=7) -> str:
+    rows = [{
+        "candidate_id": str(uuid.uuid4()), "filename": f"c{i}.pdf", "name": f"Cand, {i}",
+        "email": f"c{i}@example.com", "experience_years": i, "skills": ["Python", "SQL"][: i % 3],
+        "education": "B.Sc.", "total_score": 50 + i, "skill_score": 30, "experience_score": 15,
+        "project_score": 10, "education_score": 7, "role_score": 10,
+        "verdict": "Yes" if i % 2 else "Maybe", "flags": "", "reasoning": "line one\nline two",
+        "decision": "Interview" if i % 2 else "Hold",
+    } for i in range(n)]
+    sid = str(uuid.uuid4())
+    SESSION_STORE[sid] = SessionData("Dev", {}, CandidateTable(rows))
+    return sid
+
+
+def test_csv_export_matches_session_order():
+    sid = make_session()
+    resp = client.get(f"/session/{sid}/export?format=csv")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert f"session-{sid}.csv" in resp.headers["content-disposition"]
+
+    records = list(csv.DictReader(io.StringIO(resp.text)))
+    expected = client.get(f"/session/{sid}").json()["candidates"]
+    assert [r["candidate_id"] for r in records] == [c["candidate_id"] for c in expected]
+    assert records[0]["name"] == "Cand, 6" and records[0]["reasoning"] == "line one\nline two"
+    assert records[-1]["skills"] == ""
+    assert list(records[0]) == list(export.EXPORT_COLUMNS)
+
+
+def test_ndjson_columns_and_filters():
+    sid = make_session()
+    resp = client.get(f"/session/{sid}/export?format=ndjson&columns=name,total_score&decision=Interview")
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert lines == [{"name": f"Cand, {i}", "total_score": 50 + i} for i in (5, 3, 1)]
+
+    by_verdict = client.get(f"/session/{sid}/export?format=ndjson&columns=verdict&verdict=Maybe").text
+    assert by_verdict.count("\n") == 4
+
+
+def test_streams_in_chunks(monkeypatch):
+    monkeypatch.setattr(export, "CHUNK_ROWS", 2)
+    sid = make_session()
+    table = SESSION_STORE[sid].candidates
+    chunks = list(export.iter_ndjson(table, table.ranked_rows(), ["name"]))
+    assert [c.count(b"\n") for c in chunks] == [2, 2, 2, 1]
+
+
+def test_parquet_export():
+    pq = pytest.importorskip("pyarrow.parquet")
+    sid = make_session()
+    resp = client.get(f"/session/{sid}/export?format=parquet&columns=candidate_id,skills,total_score",
+                      headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert "content-encoding" not in resp.headers
+    table = pq.read_table(io.BytesIO(resp.content))
+    assert table.column_names == ["candidate_id", "skills", "total_score"]
+    assert table.column("total_score").to_pylist() == list(range(56, 49, -1))
+    assert table.column("skills").to_pylist()[1] == ["Python", "SQL"]
+
+
+def test_parquet_row_groups(monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(export, "PARQUET_BATCH_ROWS", 3)
+    sid = make_session()
+    table = SESSION_STORE[sid].candidates
+    chunks = list(export.iter_parquet(table, table.ranked_rows(), ["name"]))
+    assert len(chunks) == 3
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert parquet.metadata.num_rows == 7 and parquet.num_row_groups == 3
+
+
+def test_bad_requests():
+    sid = make_session()
+    assert client.get(f"/session/{sid}/export?format=xml").status_code == 400
+    assert client.get(f"/session/{sid}/export?columns=name,password").status_code == 400
+    assert client.get(f"/session/{sid}/export?decision=Maybe").status_code == 400
+    assert client.get("/session/nope/export").status_code == 404
@@ -0,0 +1,95 @@
+"""
+Tests for the fake Gemini backend used for offline load testing.
+"""
+import json
+import statistics
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.services import llm_service
+from app.services.fake_llm import (
+    FakeGeminiModel, FakeLLMConfig, HTTPFakeModel, RateLimitedError, make_server, reply_for,
+)
+from app.services.json_repair import loads_lenient
+
+
+def fake(sleeps=None, **config):
+    return FakeGeminiModel(FakeLLMConfig(seed=1, **config), sleep=(sleeps.append if sleeps is not None else lambda s: None))
+
+
+def test_pipeline_runs_on_fake_model():
+    model = fake(latency_ms=0)
+    with (
+        patch.object(llm_service, "_model", model),
+        patch.object(llm_service, "_demo", return_value=False),
+        patch.object(llm_service.settings, "LLM_BACKEND", "fake"),
+    ):
+        criteria = llm_service.parse_jd("Backend role: Python, SQL and Docker required.")
+        candidate = llm_service.parse_resume("Jane Doe\njane@example.com\n5 years Python and SQL")
+        llm_service._EVAL_CACHE.clear()
+        scored = llm_service.evaluate_candidate(criteria, candidate)
+    assert criteria["required_skills"] == ["Python", "SQL", "Docker"]
+    assert candidate["name"] == "Jane Doe" and candidate["total_experience_years"] == 5
+    assert scored["skill_score"] == round(40 * 2 / 3)
+    assert model.stats["calls"] == 3
+
+
+def test_lognormal_latency_matches_median_and_p99():
+    sleeps = []
+    model = fake(sleeps, latency_ms=100, latency_p99_ms=400)
+    for _ in range(4000):
+        model.generate_content("Score candidate")
+    sleeps.sort()
+    assert statistics.median(sleeps) == pytest.approx(0.100, rel=0.1)
+    assert sleeps[int(0.99 * len(sleeps))] == pytest.approx(0.400, rel=0.2)
+
+
+def test_tokens_per_second_adds_reply_time():
+    sleeps = []
+    model = fake(sleeps, latency_ms=0, tokens_per_second=10)
+    text = model.generate_content("Score candidate: req=Python exp=1-2").text
+    assert sleeps == [pytest.approx(len(text) / 4 / 10)]
+
+
+def test_injected_429_surfaces_as_quota_error():
+    model = fake(latency_ms=0, rate_429=1.0)
+    with pytest.raises(RateLimitedError):
+        model.generate_content("x")
+    with patch.object(llm_service, "_model", model), patch.object(llm_service.time, "sleep"):
+        with pytest.raises(llm_service.QuotaError):
+            llm_service._call_gemini("x", "EVAL")
+
+
+def test_malformed_replies_need_repair():
+    model = fake(latency_ms=0, malformed_rate=1.0)
+    prompt = "Extract candidate info JSON only:\nResume: Jo\njo@example.com"
+    expected = reply_for(prompt)
+    outcomes = set()
+    for _ in range(30):
+        text = model.generate_content(prompt).text
+        with pytest.raises(ValueError):
+            json.loads(text)
+        value, repaired = loads_lenient(text)
+        assert repaired
+        outcomes.add(value == expected)
+    assert outcomes == {True, False}   # fenced / trailing-comma replies recover fully, truncated ones partly
+    assert model.stats["malformed"] == 30
+
+
+def test_http_server_round_trip():
+    server = make_server(fake(latency_ms=0), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = HTTPFakeModel(f"http://127.0.0.1:{server.server_port}")
+        prompt = "Extract hiring criteria JSON only:\nJD: React and TypeScript"
+        assert json.loads(client.generate_content(prompt).text) == reply_for(prompt)
+
+        server_limited = make_server(fake(latency_ms=0, rate_429=1.0), port=0)
+        threading.Thread(target=server_limited.serve_forever, daemon=True).start()
+        with pytest.raises(RateLimitedError):
+            HTTPFakeModel(f"http://127.0.0.1:{server_limited.server_port}").generate_content(prompt)
+        server_limited.shutdown()
+    finally:
+        server.shutdown()
@@ -0,0 +1,72 @@
+"""
+Tests for finalize, paginated e-mail previews and per-job templates.
+"""
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.main import app, SESSION_STORE
+from app.services.email_templates import TemplateError, compile_template
+from app.services.session_store import CandidateTable, SessionData
+
+import pytest
+
+client = TestClient(app)
+
+
+def make_session(decisions) -> str:
+    rows = [{
+        "candidate_id": str(uuid.uuid4()), "filename": f"c{i}.pdf", "name": f"Cand {i}" if i else None,
+        "email": f"c{i}@example.com", "experience_years": 3, "skills": ["Python"], "education": "B.Sc.",
+        "total_score": 90 - i, "skill_score": 30, "experience_score": 15, "project_score": 10,
+        "education_score": 7, "role_score": 10, "verdict": "Yes", "flags": "", "reasoning": "",
+        "decision": d,
+    } for i, d in enumerate(decisions)]
+    sid = str(uuid.uuid4())
+    SESSION_STORE[sid] = SessionData("Data Engineer", {}, CandidateTable(rows))
+    return sid
+
+
+def test_finalize_default_interview_letters():
+    sid = make_session(["Interview", "Hold", "Reject", "Interview"])
+    body = client.post(f"/finalize/{sid}").json()
+    assert body["summary"] == {"interview": 2, "hold": 1, "reject": 1}
+    assert body["previews_total"] == 2 and body["next_offset"] is None
+    first = body["email_previews"][0]
+    assert first["email_subject"] == "Interview Invitation — Data Engineer"
+    assert first["email_body"].startswith("Dear Candidate,\n\nThank you for your interest in the Data Engineer position.")
+    assert body["email_previews"][1]["name"] == "Cand 3"
+
+
+def test_previews_paginate_across_decisions():
+    sid = make_session(["Interview"] * 3 + ["Reject"] * 4)
+    page1 = client.get(f"/session/{sid}/email-previews?decision=Interview,Reject&limit=4").json()
+    assert [p["decision"] for p in page1["email_previews"]] == ["Interview"] * 3 + ["Reject"]
+    assert page1["previews_total"] == 7 and page1["next_offset"] == 4
+
+    page2 = client.get(f"/session/{sid}/email-previews?decision=Interview,Reject&offset=4&limit=4").json()
+    assert [p["name"] for p in page2["email_previews"]] == ["Cand 4", "Cand 5", "Cand 6"]
+    assert page2["next_offset"] is None
+    assert "not to move forward" in page2["email_previews"][0]["email_body"]
+
+
+def test_custom_templates_are_used_and_validated():
+    sid = make_session(["Hold"])
+    resp = client.put(f"/session/{sid}/templates", json={"Hold": {"subject": "{job_title}: on hold for {name}"}})
+    assert resp.status_code == 200
+    preview = client.get(f"/session/{sid}/email-previews?decision=Hold").json()["email_previews"][0]
+    assert preview["email_subject"] == "Data Engineer: on hold for Candidate"
+    assert "under review" in preview["email_body"]
+
+    bad = client.put(f"/session/{sid}/templates", json={"Hold": {"body": "Hi {salary}"}})
+    assert bad.status_code == 400
+
+
+def test_bad_decision_filter():
+    sid = make_session(["Hold"])
+    assert client.post(f"/finalize/{sid}?decision=Maybe").status_code == 400
+
+
+def test_compile_template_rejects_format_specs():
+    with pytest.raises(TemplateError):
+        compile_template("Dev", "{name:>10}", "")
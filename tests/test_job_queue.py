@@ -0,0 +1,159 @@
+"""
+Tests for the SQLite analysis job queue, the worker loop and the /jobs routes.
+"""
+import io
+import threading
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app import main, worker
+from app.main import app
+from app.services import analysis
+from app.services.job_queue import DONE, FAILED, QUEUED, RUNNING, JobQueue
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.db"), lease_seconds=60, max_attempts=2)
+
+
+def test_enqueue_claim_complete(queue):
+    assert queue.counts() == {}   # nothing on disk until first use
+    job_id = queue.enqueue("analyze", {"job_title": "Dev"}, [("jd.txt", b"JD"), ("r.txt", b"\x00resume")],
+                           session_id="s1", total=1)
+    job = queue.claim("w1")
+    assert job.id == job_id and job.status == RUNNING and job.attempts == 1 and job.session_id == "s1"
+    assert queue.claim("w2") is None
+    assert queue.files(job_id) == [("jd.txt", b"JD"), ("r.txt", b"\x00resume")]
+
+    assert queue.heartbeat(job_id, "w1", 1) and not queue.heartbeat(job_id, "w2", 1)
+    assert not queue.complete(job_id, "w2", {"x": 1})   # not w2's job
+    assert queue.complete(job_id, "w1", {"x": 1})
+    job = queue.get(job_id)
+    assert job.status == DONE and job.result == {"x": 1} and job.progress == 1
+    assert queue.files(job_id) == []   # uploads dropped once finished
+    assert queue.counts() == {DONE: 1}
+
+
+def test_expired_lease_is_reclaimed_then_given_up(queue):
+    job_id = queue.enqueue("analyze", {}, [("jd.txt", b"JD")])
+    with patch("app.services.job_queue.time.time", return_value=1e10):
+        queue.claim("w1")                           # w1 dies holding the job
+    assert queue.claim("w2") is None                # lease still valid for 60 s
+    with patch("app.services.job_queue.time.time", return_value=1e10 + 61):
+        assert queue.claim("w2").attempts == 2
+    assert not queue.complete(job_id, "w1", {})     # the stale worker can't overwrite
+    with patch("app.services.job_queue.time.time", return_value=1e10 + 200):
+        assert queue.claim("w3") is None            # max_attempts reached
+    assert queue.get(job_id).status == FAILED
+    assert queue.files(job_id) == []                # its uploads go with it
+
+
+def test_finished_jobs_are_pruned_after_retention(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"), retention_seconds=3600)
+    old, running = (queue.enqueue("analyze", {}, [("jd.txt", b"JD")]) for _ in range(2))
+    with patch("app.services.job_queue.time.time", return_value=1e10):
+        queue.claim("w1")
+        queue.complete(old, "w1", {"x": 1})
+        queue.claim("w1")
+    with patch("app.services.job_queue.time.time", return_value=1e10 + 3601):
+        assert queue.prune(force=True) == 1
+    assert queue.get(old) is None and queue.get(running).status == RUNNING
+
+
+def test_retryable_failure_requeues_until_max_attempts(queue):
+    job_id = queue.enqueue("analyze", {}, [("jd.txt", b"JD")])
+    queue.claim("w1")
+    queue.fail(job_id, "w1", "boom", retry=True)
+    assert queue.get(job_id).status == QUEUED
+    queue.claim("w1")
+    queue.fail(job_id, "w1", "boom again", retry=True)
+    job = queue.get(job_id)
+    assert job.status == FAILED and job.error == "boom again"
+
+
+def test_each_job_is_claimed_once(queue):
+    ids = {queue.enqueue("analyze", {}, [("jd.txt", b"JD")]) for _ in range(20)}
+    claimed, lock = [], threading.Lock()
+
+    def run(name):
+        while (job := queue.claim(name)) is not None:
+            with lock:
+                claimed.append(job.id)
+
+    threads = [threading.Thread(target=run, args=(f"w{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(claimed) == sorted(ids)
+
+
+def test_jobs_route_runs_on_a_worker_and_imports_the_session(queue, fake_llm):
+    files = [("jd_pdf", ("jd.txt", io.BytesIO(b"Backend: Python, SQL, 2-5 years"), "text/plain"))]
+    files += [("resumes", (f"r{i}.txt", io.BytesIO(f"Dev {i}\n3 years Python SQL".encode()), "text/plain"))
+              for i in range(3)]
+    with patch.object(main, "JOB_QUEUE", queue):
+        res = client.post("/jobs/analyze", data={"job_title": "Backend Dev"}, files=files)
+        assert res.status_code == 202
+        job_id, session_id = res.json()["job_id"], res.json()["session_id"]
+        body = client.get(f"/jobs/{job_id}").json()
+        assert body["status"] == "queued" and body["progress"] == {"done": 0, "total": 3}
+        assert client.get(f"/session/{session_id}").status_code == 404
+
+        assert worker.run_worker(queue, "test-worker", max_jobs=5) == 1
+
+        body = client.get(f"/jobs/{job_id}").json()
+        assert body["status"] == "done" and body["progress"]["done"] == 3
+        assert body["total_candidates"] == 3 and body["errors"] == []
+        assert body["token_usage"]["calls"] > 0
+        session = client.get(f"/session/{session_id}").json()
+        assert session["job_title"] == "Backend Dev" and len(session["candidates"]) == 3
+        assert 'recruiter_jobs{status="done"} 1' in client.get("/metrics").text
+        assert client.get("/jobs/unknown").status_code == 404
+    main.SESSION_STORE.pop(session_id, None)
+
+
+def test_finished_job_session_is_found_without_polling_the_job(queue, fake_llm):
+    files = [("jd_pdf", ("jd.txt", io.BytesIO(b"Backend: Python"), "text/plain")),
+             ("resumes", ("r.txt", io.BytesIO(b"Dev\n3 years Python"), "text/plain"))]
+    with patch.object(main, "JOB_QUEUE", queue):
+        session_id = client.post("/jobs/analyze", data={"job_title": "Dev"}, files=files).json()["session_id"]
+        assert worker.run_worker(queue, "test-worker", max_jobs=1) == 1
+        session = client.get(f"/session/{session_id}")   # no GET /jobs/{id} in between
+        assert session.status_code == 200 and len(session.json()["candidates"]) == 1
+        assert client.get("/session/unknown").status_code == 404
+    main.SESSION_STORE.pop(session_id, None)
+
+
+def test_unusable_jd_fails_without_retry(queue):
+    job_id = queue.enqueue("analyze", {"job_title": "Dev"}, [("jd.pdf", b"%PDF"), ("r.txt", b"R")])
+    unreadable = HTTPException(status_code=422, detail="'jd.pdf' has no extractable text.")
+    with patch("app.services.analysis.extract_text", side_effect=unreadable):
+        assert worker.run_worker(queue, "w1", max_jobs=1) == 1
+    job = queue.get(job_id)
+    assert job.status == FAILED and job.attempts == 1 and "no extractable text" in job.error
+
+
+def test_worker_stops_once_its_lease_is_taken_over(queue, fake_llm):
+    files = [("jd.txt", b"Backend: Python")] + [(f"r{i}.txt", b"Dev\n3 years Python") for i in range(3)]
+    job_id = queue.enqueue("analyze", {"job_title": "Dev"}, files, session_id="s-lease", total=3)
+    with (
+        patch.object(queue, "heartbeat", return_value=False),
+        patch("app.services.analysis.score_resume", wraps=analysis.score_resume) as score,
+    ):
+        worker.run_worker(queue, "w1", max_jobs=1)
+    assert score.call_count == 1                     # no model calls after the lease was lost
+    assert queue.get(job_id).status == RUNNING       # left for the worker that owns it now
+
+
+def test_jobs_routes_disabled_without_a_queue():
+    files = [("jd_pdf", ("jd.txt", io.BytesIO(b"JD"), "text/plain")),
+             ("resumes", ("r.txt", io.BytesIO(b"R"), "text/plain"))]
+    assert client.post("/jobs/analyze", data={"job_title": "X"}, files=files).status_code == 503
+    assert client.get("/jobs/abc").status_code == 503
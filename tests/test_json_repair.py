@@ -0,0 +1,39 @@
+"""
+Tests for tolerant JSON recovery of LLM replies.
+"""
+import pytest
+
+from app.services.json_repair import JSONRecoveryError, loads_lenient
+
+
+def test_clean_json_is_not_marked_repaired():
+    assert loads_lenient('{"a": 1}') == ({"a": 1}, False)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ('```json\n{"a": 1}\n```', {"a": 1}),
+    ('Here you go:\n{"a": 1}\nLet me know if you need more {help}.', {"a": 1}),
+    ('{"a": [1, 2,], "b": 3,}', {"a": [1, 2], "b": 3}),
+    ('{"ok": True, "none": None, // note\n "n": /* x */ 2}', {"ok": True, "none": None, "n": 2}),
+    ('{"text": "line one\nline two"}', {"text": "line one\nline two"}),
+    ('[{"a": 1}] trailing', [{"a": 1}]),
+])
+def test_repairs_common_malformations(raw, expected):
+    assert loads_lenient(raw) == (expected, True)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ('{"name": "Al", "skills": ["Py", "SQ', {"name": "Al", "skills": ["Py"]}),
+    ('{"name": "Al", "email', {"name": "Al"}),
+    ('{"name": "Al", "years": 1', {"name": "Al"}),          # 1 may be the start of 12
+    ('{"a": {"b": [1, {"c": "d"', {"a": {"b": [1, {"c": "d"}]}}),
+    ('{"q": "say \\"hi\\"", "r": "x\\', {"q": 'say "hi"'}),
+])
+def test_truncated_reply_is_cut_back_to_last_complete_value(raw, expected):
+    assert loads_lenient(raw) == (expected, True)
+
+
+@pytest.mark.parametrize("raw", ["no json at all", '{"a" 1}', '{"a": \'single\'}'])
+def test_unrecoverable(raw):
+    with pytest.raises(JSONRecoveryError):
+        loads_lenient(raw)
@@ -0,0 +1,141 @@
+"""
+Tests for per-call LLM deadlines and hedged calls.
+"""
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.metrics import LLM_DEADLINE_EXCEEDED, LLM_HEDGES
+from app.services import llm_scheduler, llm_service
+from app.services.llm_scheduler import FairScheduler
+from app.services.llm_service import LLMDeadlineExceeded, _HedgeBudget, _LatencyWindow
+
+
+class ScriptedProvider:
+    """Call n blocks until `release` is set if n is in `hang`; every reply is a parseable resume."""
+
+    def __init__(self, hang=()):
+        self.hang = set(hang)
+        self.release = threading.Event()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        if n in self.hang:
+            self.release.wait(5)
+        return SimpleNamespace(text=f'{{"name": "call {n}", "skills": []}}')
+
+
+@pytest.fixture
+def provider(request, fake_llm):
+    p = fake_llm.use(ScriptedProvider(getattr(request, "param", ())))
+    with patch.dict(llm_service._LATENCY, {"RESUME": _LatencyWindow()}):
+        yield p
+    p.release.set()
+
+
+@pytest.mark.parametrize("provider", [(1, 2)], indirect=True)
+def test_hung_call_is_abandoned_at_the_deadline(provider):
+    before = LLM_DEADLINE_EXCEEDED.value(label="RESUME")
+    with patch.object(llm_service.settings, "LLM_DEADLINE_RESUME_SECONDS", 0.05):
+        t0 = time.perf_counter()
+        parsed = llm_service.parse_resume("Jane Doe\n4 years Python", "Resume_Jane_Doe.pdf")
+        elapsed = time.perf_counter() - t0
+    assert elapsed < 1
+    assert parsed["name"] == "Jane Doe"   # both attempts timed out → mock fallback
+    assert LLM_DEADLINE_EXCEEDED.value(label="RESUME") == before + 2
+
+
+@pytest.mark.parametrize("provider", [(1,)], indirect=True)
+def test_deadline_retry_gets_the_second_reply(provider):
+    with patch.object(llm_service.settings, "LLM_DEADLINE_RESUME_SECONDS", 0.05):
+        assert llm_service.parse_resume("x", "r.pdf")["name"] == "call 2"
+
+
+@pytest.mark.parametrize("provider", [(1,)], indirect=True)
+def test_slow_call_is_hedged_and_the_hedge_wins(provider):
+    for _ in range(20):
+        llm_service._LATENCY["RESUME"].add(0.01)
+    won = LLM_HEDGES.value(label="RESUME", outcome="won")
+    with (
+        patch.object(llm_service.settings, "LLM_HEDGE_ENABLED", True),
+        patch.object(llm_service, "_HEDGE_BUDGET", _HedgeBudget(ratio=1)),
+    ):
+        resp, _ = llm_service._generate_with_deadline("prompt", "RESUME")
+    assert resp.text.startswith('{"name": "call 2"')
+    assert LLM_HEDGES.value(label="RESUME", outcome="won") == won + 1
+
+
+@pytest.mark.parametrize("provider", [(1,)], indirect=True)
+def test_no_hedge_without_budget(provider):
+    for _ in range(20):
+        llm_service._LATENCY["RESUME"].add(0.01)
+    over = LLM_HEDGES.value(label="RESUME", outcome="over_budget")
+    with (
+        patch.object(llm_service.settings, "LLM_HEDGE_ENABLED", True),
+        patch.object(llm_service.settings, "LLM_DEADLINE_RESUME_SECONDS", 0.2),
+        patch.object(llm_service, "_HEDGE_BUDGET", _HedgeBudget(ratio=0)),
+        pytest.raises(LLMDeadlineExceeded),
+    ):
+        llm_service._generate_with_deadline("prompt", "RESUME")
+    assert provider.calls == 1
+    assert LLM_HEDGES.value(label="RESUME", outcome="over_budget") == over + 1
+
+
+@pytest.mark.parametrize("provider", [(1,)], indirect=True)
+def test_abandoned_call_keeps_its_slot_until_it_returns(provider):
+    scheduler = FairScheduler(slots=2)
+    with (
+        patch.object(llm_scheduler, "SCHEDULER", scheduler),
+        patch.object(llm_service.settings, "LLM_DEADLINE_RESUME_SECONDS", 0.05),
+        pytest.raises(LLMDeadlineExceeded),
+    ):
+        llm_service._generate_with_deadline("prompt", "RESUME")
+    assert scheduler.busy == 1          # the hung call still counts against the limit
+    provider.release.set()
+    for _ in range(100):
+        if scheduler.busy == 0:
+            break
+        time.sleep(0.01)
+    assert scheduler.busy == 0
+
+
+@pytest.mark.parametrize("provider", [(1,)], indirect=True)
+def test_hedge_needs_an_idle_slot(provider):
+    for _ in range(20):
+        llm_service._LATENCY["RESUME"].add(0.01)
+    no_slot = LLM_HEDGES.value(label="RESUME", outcome="no_slot")
+    with (
+        patch.object(llm_scheduler, "SCHEDULER", FairScheduler(slots=1)),
+        patch.object(llm_service.settings, "LLM_HEDGE_ENABLED", True),
+        patch.object(llm_service.settings, "LLM_DEADLINE_RESUME_SECONDS", 0.2),
+        patch.object(llm_service, "_HEDGE_BUDGET", _HedgeBudget(ratio=1)),
+        pytest.raises(LLMDeadlineExceeded),
+    ):
+        llm_service._generate_with_deadline("prompt", "RESUME")
+    assert provider.calls == 1
+    assert LLM_HEDGES.value(label="RESUME", outcome="no_slot") == no_slot + 1
+
+
+def test_hedge_budget_and_latency_window():
+    budget = _HedgeBudget(ratio=0.25, burst=2)
+    for _ in range(3):
+        budget.earn()
+    assert not budget.take()
+    budget.earn()
+    assert budget.take() and not budget.take()
+    for _ in range(20):
+        budget.earn()
+    assert budget.take() and budget.take() and not budget.take()   # banked credit is capped
+
+    window = _LatencyWindow(size=100)
+    for ms in range(1, 101):
+        window.add(ms / 1000)
+    assert window.quantile(0.95, min_samples=20) == pytest.approx(0.096)
+    assert _LatencyWindow().quantile(0.95, min_samples=20) is None
@@ -0,0 +1,120 @@
+"""
+Tests for LLM provider selection and the record/replay cassette.
+"""
+import io
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import SESSION_STORE, app
+from app.metrics import LLM_FALLBACKS
+from app.services import llm_service
+from app.services.llm_providers import (
+    CASSETTE_CALLS, Cassette, CassetteMiss, CassetteProvider, build_provider,
+)
+
+client = TestClient(app)
+
+
+def _no_provider():
+    raise AssertionError("replay must not build the wrapped provider")
+
+
+def _analyze(n=3):
+    files = [("jd_pdf", ("jd.txt", io.BytesIO(b"Backend: Python, SQL, Docker. 2-5 years."), "text/plain"))]
+    files += [("resumes", (f"r{i}.txt", io.BytesIO(f"Person {i}\n{i + 1} years Python, SQL".encode()),
+                           "text/plain")) for i in range(n)]
+    resp = client.post("/analyze", data={"job_title": "Dev"}, files=files)
+    assert resp.status_code == 200
+    body = resp.json()
+    SESSION_STORE.pop(body["session_id"], None)
+    return [(c["name"], c["skills"], c["total_score"], c["verdict"]) for c in body["candidates"]]
+
+
+def test_analyze_replays_a_recorded_run_offline(tmp_path, fake_llm):
+    path = str(tmp_path / "run.jsonl")
+    fake = fake_llm.model
+    fake_llm.use(CassetteProvider(Cassette(path), "record", lambda: fake))
+    recorded = _analyze()
+    assert fake.stats["calls"] == len(Cassette(path)) == 1 + 3 + 3   # JD, resumes, evaluations
+
+    fake_llm.use(CassetteProvider(Cassette(path), "replay", _no_provider))
+    assert _analyze() == recorded
+
+
+def test_replay_serves_recorded_token_counts(tmp_path):
+    meta = SimpleNamespace(prompt_token_count=12, candidates_token_count=5)
+    inner = SimpleNamespace(generate_content=lambda p: SimpleNamespace(text='{"a": 1}', usage_metadata=meta))
+    CassetteProvider(Cassette(str(tmp_path / "c.jsonl")), "record", lambda: inner).generate_content("hi")
+
+    reply = CassetteProvider(Cassette(str(tmp_path / "c.jsonl")), "replay", _no_provider).generate_content("hi")
+    assert reply.text == '{"a": 1}'
+    assert (reply.usage_metadata.prompt_token_count, reply.usage_metadata.candidates_token_count) == (12, 5)
+    (line,) = (tmp_path / "c.jsonl").read_text().splitlines()
+    assert "hi" not in json.loads(line).values()   # prompts are stored as hashes only
+
+
+def test_replay_miss_falls_back_without_retrying(tmp_path, fake_llm):
+    player = CassetteProvider(Cassette(str(tmp_path / "empty.jsonl")), "replay", _no_provider)
+    with pytest.raises(CassetteMiss):
+        player.generate_content("never recorded")
+
+    misses = CASSETTE_CALLS.value(result="miss")
+    fallbacks = LLM_FALLBACKS.value(label="RESUME")
+    fake_llm.use(player)
+    with patch.object(llm_service.time, "sleep", side_effect=AssertionError("no retry sleep")):
+        parsed = llm_service.parse_resume("Jane Doe\n4 years Python", "Resume_Jane_Doe.pdf")
+    assert parsed["name"] == "Jane Doe"   # mock fallback
+    assert CASSETTE_CALLS.value(result="miss") == misses + 1
+    assert LLM_FALLBACKS.value(label="RESUME") == fallbacks + 1
+
+
+def test_auto_mode_replays_hits_and_records_misses(tmp_path):
+    calls = []
+    inner = SimpleNamespace(generate_content=lambda p: calls.append(p) or SimpleNamespace(text=p.upper()))
+    cassette = Cassette(str(tmp_path / "c.jsonl"))
+    cassette.put("seen", "SEEN-RECORDED")
+    provider = CassetteProvider(cassette, "auto", lambda: inner)
+    assert provider.generate_content("seen").text == "SEEN-RECORDED"
+    assert provider.generate_content("new").text == "NEW"
+    assert provider.generate_content("new").text == "NEW"
+    assert calls == ["new"]
+
+
+def test_cassette_skips_torn_lines_and_last_write_wins(tmp_path):
+    path = tmp_path / "c.jsonl"
+    cassette = Cassette(str(path))
+    cassette.put("p", "old")
+    cassette.put("p", "new")
+    with open(path, "a") as fh:
+        fh.write('{"k": "abc", "t": "cut sh')
+    reloaded = Cassette(str(path))
+    assert len(reloaded) == 1 and reloaded.get("p").text == "new"
+
+
+def test_build_provider_selection(tmp_path):
+    settings = SimpleNamespace(LLM_BACKEND="fake", LLM_CASSETTE="", LLM_CASSETTE_MODE="replay")
+    with patch("app.services.fake_llm.build_fake_model", return_value="fake-model"):
+        assert build_provider(settings) == "fake-model"
+        settings.LLM_CASSETTE = str(tmp_path / "c.jsonl")
+        wrapped = build_provider(settings)
+        assert isinstance(wrapped, CassetteProvider) and wrapped.mode == "replay"
+    for backend in ("mock", "openai"):
+        settings.LLM_BACKEND = backend
+        with pytest.raises(ValueError):
+            build_provider(settings)
+    with pytest.raises(ValueError):
+        CassetteProvider(Cassette(str(tmp_path / "c.jsonl")), "rewind", _no_provider)
+
+
+def test_mock_backend_is_demo_mode():
+    with patch.object(llm_service.settings, "LLM_BACKEND", "mock"), \
+            patch.object(llm_service.settings, "DEMO_MODE", False), \
+            patch.object(llm_service, "RESUME_PROCESSING_DELAY", 0), patch.object(llm_service, "_model", None):
+        assert llm_service._demo()
+        assert llm_service.parse_resume("x", "Resume_Ali_Raza.pdf")["name"] == "Ali Raza"
+        llm_service.warm_up()
+        assert llm_service._model is None
@@ -0,0 +1,100 @@
+"""
+Tests for fair-share scheduling of model calls.
+"""
+import contextvars
+import io
+import threading
+import time
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import llm_scheduler
+from app.services.llm_scheduler import FairScheduler, llm_scope, scheduled_slot
+
+client = TestClient(app)
+
+
+def _run_queued(scheduler, callers):
+    """Hold the only slot, queue `callers` [(name, tenant, interactive, weight)], then record grant order."""
+    order, lock = [], threading.Lock()
+
+    def call(name, tenant, interactive, weight):
+        with scheduler.slot(tenant, interactive, weight):
+            with lock:
+                order.append(name)
+
+    with scheduler.slot("holder"):
+        threads = []
+        for n, caller in enumerate(callers, 1):
+            threads.append(threading.Thread(target=call, args=caller))
+            threads[-1].start()
+            while sum(scheduler.depth().values()) < n:   # enqueue in a known order
+                time.sleep(0.001)
+    for t in threads:
+        t.join(5)
+    return order
+
+
+def test_interactive_lane_first_then_fair_across_tenants():
+    scheduler = FairScheduler(slots=1)
+    order = _run_queued(scheduler, [
+        ("bulk-a1", "a", False, 1), ("bulk-a2", "a", False, 1), ("bulk-a3", "a", False, 1),
+        ("bulk-c1", "c", False, 1),
+        ("small-b1", "b", True, 1),
+    ])
+    assert order == ["small-b1", "bulk-a1", "bulk-c1", "bulk-a2", "bulk-a3"]
+    assert scheduler.busy == 0 and scheduler.dispatched == {"interactive": 1, "bulk": 5}
+
+
+def test_bulk_lane_gets_every_nth_slot():
+    scheduler = FairScheduler(slots=1, bulk_every=3)
+    callers = [(f"bulk{i}", "a", False, 1) for i in range(2)] + [(f"small{i}", f"s{i}", True, 1) for i in range(6)]
+    order = _run_queued(scheduler, callers)
+    assert order == ["small0", "small1", "bulk0", "small2", "small3", "bulk1", "small4", "small5"]
+
+    strict = _run_queued(FairScheduler(slots=1, bulk_every=0), callers)
+    assert strict[-2:] == ["bulk0", "bulk1"]
+
+
+def test_weights_share_slots_proportionally():
+    scheduler = FairScheduler(slots=1)
+    callers = [(f"heavy{i}", "heavy", False, 2) for i in range(6)] + [(f"light{i}", "light", False, 1) for i in range(6)]
+    order = _run_queued(scheduler, callers)
+    assert sum(name.startswith("heavy") for name in order[:9]) == 6   # 2:1 while both are queued
+
+
+def test_free_slots_are_used_without_queueing():
+    scheduler = FairScheduler(slots=2)
+    with scheduler.slot("a") as w1, scheduler.slot("a") as w2:
+        assert scheduler.busy == 2 and w1 < 0.01 and w2 < 0.01
+    assert scheduler.busy == 0
+    with FairScheduler(slots=0).slot("a") as waited:   # unlimited
+        assert waited == 0.0
+
+
+def test_scope_follows_threads():
+    seen = []
+    scheduler = FairScheduler(slots=1)
+    with patch.object(llm_scheduler, "SCHEDULER", scheduler), llm_scope("session-1", interactive=True):
+        def worker():
+            with scheduled_slot():
+                seen.append(dict(scheduler.dispatched))
+        t = threading.Thread(target=contextvars.copy_context().run, args=(worker,))
+        t.start()
+        t.join()
+    assert seen == [{"interactive": 1, "bulk": 0}]
+
+
+def test_analyze_calls_go_through_the_scheduler(fake_llm):
+    scheduler = FairScheduler(slots=4)
+    files = [("jd_pdf", ("jd.txt", io.BytesIO(b"Backend: Python, SQL"), "text/plain"))]
+    files += [("resumes", (f"r{i}.txt", io.BytesIO(f"R {i}\n2 years Python".encode()), "text/plain")) for i in range(2)]
+    with patch.object(llm_scheduler, "SCHEDULER", scheduler):
+        assert client.post("/analyze", data={"job_title": "Dev"}, files=files).status_code == 200
+    assert scheduler.dispatched == {"interactive": 5, "bulk": 0}   # 2-resume batch → priority lane
+
+    health = client.get("/health").json()["llm_scheduler"]
+    assert set(health) == {"slots", "busy", "queued", "tenants_waiting", "dispatched"}
+    assert 'recruiter_llm_queue_depth{lane="bulk"}' in client.get("/metrics").text
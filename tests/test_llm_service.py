@@ -0,0 +1,78 @@
+"""
+Tests for llm_service helpers that don't need a live Gemini key.
+"""
+from unittest.mock import patch
+
+from app.services import llm_service
+
+CRITERIA = {"required_skills": ["Python"], "min_experience": 2, "max_experience": 5, "role_level": "Mid"}
+CANDIDATE = {"name": "Jane", "skills": ["Python"], "total_experience_years": 3, "education": "B.Sc."}
+GEMINI_EVAL = {
+    "skill_score": 30, "experience_score": 15, "project_score": 10, "education_score": 7,
+    "role_score": 10, "total_score": 0, "verdict": "No", "flags": "", "reasoning": "ok",
+}
+
+
+def test_evaluate_candidate_memoises_by_prompt():
+    llm_service._EVAL_CACHE.clear()
+    with (
+        patch.object(llm_service, "_demo", return_value=False),
+        patch.object(llm_service, "_call_gemini", return_value=dict(GEMINI_EVAL)) as mock_call,
+    ):
+        first = llm_service.evaluate_candidate(CRITERIA, CANDIDATE, filename="a.pdf")
+        second = llm_service.evaluate_candidate(CRITERIA, CANDIDATE, filename="b.pdf")
+        llm_service.evaluate_candidate({**CRITERIA, "role_level": "Senior"}, CANDIDATE, filename="a.pdf")
+    assert first == second
+    assert first["total_score"] == 72 and first["verdict"] == "Yes"
+    assert mock_call.call_count == 2
+
+
+def test_evaluate_candidate_tolerates_null_skill_lists():
+    llm_service._EVAL_CACHE.clear()
+    criteria, candidate = {**CRITERIA, "required_skills": None}, {**CANDIDATE, "skills": None}
+    with (
+        patch.object(llm_service, "_demo", return_value=False),
+        patch.object(llm_service, "_call_gemini", return_value=dict(GEMINI_EVAL)),
+    ):
+        assert llm_service.evaluate_candidate(criteria, candidate)["total_score"] == 72
+    with patch.object(llm_service, "_demo", return_value=True):
+        assert "total_score" in llm_service.evaluate_candidate(criteria, candidate)
+
+
+class _Reply:
+    def __init__(self, text):
+        self.text = text
+
+
+def _model_replying(*texts):
+    model = type("FakeModel", (), {})()
+    replies = iter(texts)
+    model.generate_content = lambda prompt: _Reply(next(replies))
+    return model
+
+
+def test_call_gemini_repairs_instead_of_retrying():
+    before = llm_service.JSON_STATS.snapshot()
+    with (
+        patch.object(llm_service, "_model", _model_replying('Sure!\n```json\n{"name": "Al", "skills": [],}\n```')),
+        patch.object(llm_service.time, "sleep") as sleep,
+    ):
+        result = llm_service._call_gemini("p", "RESUME", required=("name", "skills"))
+    assert result == {"name": "Al", "skills": []}
+    sleep.assert_not_called()
+    after = llm_service.JSON_STATS.snapshot()
+    assert after["repaired"] == before["repaired"] + 1 and after["retried"] == before["retried"]
+
+
+def test_call_gemini_retries_partial_reply_without_sleeping():
+    before = llm_service.JSON_STATS.snapshot()
+    full = '{"skill_score": 30, "experience_score": 15, "project_score": 10, "education_score": 7, "role_score": 10}'
+    with (
+        patch.object(llm_service, "_model", _model_replying('{"skill_score": 30, "experience_sc', full)),
+        patch.object(llm_service.time, "sleep") as sleep,
+    ):
+        result = llm_service._call_gemini("p", "EVAL", required=llm_service.EVAL_SCORE_KEYS)
+    assert result["role_score"] == 10
+    sleep.assert_not_called()
+    after = llm_service.JSON_STATS.snapshot()
+    assert after["retried"] == before["retried"] + 1 and after["clean"] == before["clean"] + 1
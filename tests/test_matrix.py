@@ -0,0 +1,127 @@
+"""
+Tests for POST /analyze/matrix: M JDs × N resumes in one request.
+LLM and PDF calls are mocked at the app.main import site.
+"""
+import io
+import threading
+import time
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.main import app, SESSION_STORE
+
+client = TestClient(app)
+
+JDS = {
+    "backend.txt": {"required_skills": ["Python"], "nice_to_have_skills": [], "min_experience": 2,
+                    "max_experience": 6, "role_level": "Mid"},
+    "frontend.txt": {"required_skills": ["React"], "nice_to_have_skills": [], "min_experience": 1,
+                     "max_experience": 5, "role_level": "Mid"},
+}
+PEOPLE = {
+    "py.txt": {"name": "Pia", "email": "pia@example.com", "total_experience_years": 4,
+               "skills": ["Python"], "education": "B.Sc."},
+    "js.txt": {"name": "Jon", "email": "jon@example.com", "total_experience_years": 3,
+               "skills": ["React"], "education": "B.A."},
+    "both.txt": {"name": "Bo", "email": "bo@example.com", "total_experience_years": 5,
+                 "skills": ["Python", "React"], "education": "M.Sc."},
+}
+
+
+def _evaluation(total: int) -> dict:
+    verdict = "Strong Yes" if total >= 80 else "Yes" if total >= 65 else "Maybe" if total >= 50 else "No"
+    return {"skill_score": 0, "experience_score": 0, "project_score": 0, "education_score": 0,
+            "role_score": 0, "total_score": total, "verdict": verdict, "flags": "", "reasoning": ""}
+
+
+def fake_evaluate(criteria, candidate, filename="resume"):
+    hits = len(set(criteria["required_skills"]) & set(candidate["skills"]))
+    return _evaluation(40 + 40 * hits + (5 if len(candidate["skills"]) > 1 else 0))
+
+
+def upload(names):
+    return [(field, (n, io.BytesIO(n.encode()), "text/plain")) for field, n in names]
+
+
+def post_matrix(jds=("backend.txt", "frontend.txt"), resumes=tuple(PEOPLE), data=None, **mocks):
+    files = upload([("jd_pdfs", n) for n in jds] + [("resumes", n) for n in resumes])
+    with (
+        patch("app.main.extract_text", side_effect=lambda content, filename: filename),
+        patch("app.main.parse_jd", mocks.get("parse_jd") or (lambda text, filename: dict(JDS[text]))),
+        patch("app.main.parse_resume", mocks.get("parse_resume") or (lambda text, filename: dict(PEOPLE[text]))),
+        patch("app.main.evaluate_candidate", mocks.get("evaluate") or fake_evaluate),
+    ):
+        return client.post("/analyze/matrix", files=files, data=data or {})
+
+
+def test_matrix_ranks_per_job_and_picks_best_fit():
+    calls = {"jd": 0, "resume": 0, "eval": 0}
+
+    def count(kind, fn):
+        def wrapper(*a, **kw):
+            calls[kind] += 1
+            return fn(*a, **kw)
+        return wrapper
+
+    resp = post_matrix(
+        data={"job_titles": ["Backend", "Frontend"]},
+        parse_jd=count("jd", lambda text, filename: dict(JDS[text])),
+        parse_resume=count("resume", lambda text, filename: dict(PEOPLE[text])),
+        evaluate=count("eval", fake_evaluate),
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert calls == {"jd": 2, "resume": 3, "eval": 6}
+
+    backend, frontend = body["jobs"]
+    assert backend["job_title"] == "Backend" and frontend["jd_filename"] == "frontend.txt"
+    assert [c["name"] for c in backend["candidates"]] == ["Bo", "Pia", "Jon"]
+    assert [c["name"] for c in frontend["candidates"]] == ["Bo", "Jon", "Pia"]
+
+    fits = {c["name"]: c["best_fit"]["job_title"] for c in body["candidates"]}
+    assert fits == {"Pia": "Backend", "Jon": "Frontend", "Bo": "Backend"}
+    bo = body["candidates"][0]
+    assert bo["name"] == "Bo" and bo["scores"] == {backend["session_id"]: 85, frontend["session_id"]: 85}
+
+    # each job is a regular session sharing candidate ids
+    ids = {c["candidate_id"] for c in backend["candidates"]}
+    assert ids == {c["candidate_id"] for c in frontend["candidates"]}
+    assert len(SESSION_STORE[frontend["session_id"]].candidates) == 3
+
+
+def test_matrix_evaluations_run_concurrently():
+    in_flight, peak = 0, 0
+    lock = threading.Lock()
+
+    def slow_evaluate(criteria, candidate, filename="resume"):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return fake_evaluate(criteria, candidate)
+
+    with patch("app.main.settings.MATRIX_CONCURRENCY", 4):
+        assert post_matrix(evaluate=slow_evaluate).status_code == 200
+    assert 1 < peak <= 4
+
+
+def test_matrix_collects_per_file_errors():
+    def parse_resume(text, filename):
+        if text == "js.txt":
+            raise ValueError("unreadable")
+        return dict(PEOPLE[text])
+
+    body = post_matrix(resumes=("py.txt", "js.txt", "bad.doc"), parse_resume=parse_resume).json()
+    assert {e["filename"] for e in body["errors"]} == {"js.txt", "bad.doc"}
+    assert [c["name"] for c in body["candidates"]] == ["Pia"]
+    assert body["candidates"][0]["best_fit"]["job_title"] == "backend"
+
+
+def test_matrix_validation():
+    assert post_matrix(data={"job_titles": ["Only one"]}).status_code == 400
+    with patch("app.main.settings.MATRIX_MAX_JOBS", 1):
+        assert post_matrix().status_code == 400
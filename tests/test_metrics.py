@@ -0,0 +1,119 @@
+"""
+Tests for the Prometheus registry and the GET /metrics endpoint.
+"""
+import io
+import re
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.metrics import (
+    EVAL_CACHE, LLM_CALL_SECONDS, LLM_FALLBACKS, LLM_RATE_LIMITED, LLM_RETRIES, STAGE_SECONDS,
+    Counter, Histogram, Registry,
+)
+from app.services import llm_service
+
+client = TestClient(app)
+
+CRITERIA = {"required_skills": ["Python"], "nice_to_have_skills": [], "min_experience": 1,
+            "max_experience": 5, "role_level": "Mid"}
+
+
+def _value(text: str, sample: str) -> float:
+    m = re.search(rf"^{re.escape(sample)} (\S+)$", text, re.M)
+    assert m, f"{sample} not in /metrics output"
+    return float(m.group(1))
+
+
+def test_histogram_renders_cumulative_buckets():
+    reg = Registry()
+    h = reg.histogram("t_seconds", "test", ("stage",), buckets=(0.1, 1))
+    for v in (0.05, 0.5, 0.5, 3):
+        h.observe(v, stage='a"b')
+    text = reg.render()
+    assert '# TYPE t_seconds histogram' in text
+    assert 't_seconds_bucket{stage="a\\"b",le="0.1"} 1' in text
+    assert 't_seconds_bucket{stage="a\\"b",le="1"} 3' in text
+    assert 't_seconds_bucket{stage="a\\"b",le="+Inf"} 4' in text
+    assert 't_seconds_sum{stage="a\\"b"} 4.05' in text
+    assert 't_seconds_count{stage="a\\"b"} 4' in text
+
+
+def test_counter_and_failing_gauge():
+    reg = Registry()
+    c = reg.register(Counter("t_total", "test", ("reason",)))
+    c.inc(reason="x")
+    c.inc(2, reason="x")
+    reg.gauge("t_broken", "raises", lambda: 1 / 0)
+    reg.gauge("t_ok", "fine", lambda: 7)
+    text = reg.render()
+    assert 't_total{reason="x"} 3' in text
+    assert "t_broken" not in text and "t_ok 7" in text
+
+
+def test_observe_is_cheap():
+    import time
+    h = Histogram("t", "test", ("label",))
+    start = time.perf_counter()
+    for _ in range(20000):
+        h.observe(0.2, label="EVAL")
+    assert (time.perf_counter() - start) / 20000 < 50e-6
+
+
+def test_call_gemini_records_latency_retries_and_429():
+    model = MagicMock()
+    model.generate_content.side_effect = [Exception("429 quota"), MagicMock(text='{"ok": 1}')]
+    calls, limited = LLM_CALL_SECONDS.count(label="T429"), LLM_RATE_LIMITED.value(label="T429")
+    retries = LLM_RETRIES.value(label="T429", reason="rate_limit")
+    with patch.object(llm_service, "_model", model), patch.object(llm_service.time, "sleep"):
+        assert llm_service._call_gemini("x", "T429") == {"ok": 1}
+    assert LLM_CALL_SECONDS.count(label="T429") == calls + 2
+    assert LLM_RATE_LIMITED.value(label="T429") == limited + 1
+    assert LLM_RETRIES.value(label="T429", reason="rate_limit") == retries + 1
+
+
+def test_eval_cache_and_fallback_counters():
+    llm_service._EVAL_CACHE.clear()
+    hits, misses = EVAL_CACHE.value(result="hit"), EVAL_CACHE.value(result="miss")
+    fallbacks = LLM_FALLBACKS.value(label="EVAL")
+    with (
+        patch.object(llm_service, "_demo", return_value=False),
+        patch.object(llm_service, "_call_gemini", side_effect=RuntimeError("down")),
+    ):
+        llm_service.evaluate_candidate(CRITERIA, {"skills": ["Python"]}, filename="a.pdf")
+    with patch.object(llm_service, "_demo", return_value=True):
+        llm_service.evaluate_candidate(CRITERIA, {"skills": ["Go"]}, filename="b.pdf")
+        llm_service.evaluate_candidate(CRITERIA, {"skills": ["Go"]}, filename="b.pdf")
+    assert LLM_FALLBACKS.value(label="EVAL") == fallbacks + 1
+    assert EVAL_CACHE.value(result="miss") == misses + 2
+    assert EVAL_CACHE.value(result="hit") == hits + 1
+
+
+def test_metrics_endpoint_after_analyze():
+    before = {s: STAGE_SECONDS.count(stage=s) for s in ("upload_read", "extract_text", "parse_jd", "parse_resume", "evaluate")}
+    with (
+        patch("app.services.analysis.parse_jd", return_value=CRITERIA),
+        patch("app.services.analysis.parse_resume", return_value={"name": "A", "skills": ["Python"]}),
+        patch("app.services.analysis.evaluate_candidate", wraps=llm_service.evaluate_candidate),
+        patch.object(llm_service, "_demo", return_value=True),
+    ):
+        resp = client.post(
+            "/analyze",
+            data={"job_title": "Dev"},
+            files=[("jd_pdf", ("jd.txt", io.BytesIO(b"Python dev"), "text/plain")),
+                   ("resumes", ("a.txt", io.BytesIO(b"A\nPython"), "text/plain"))],
+        )
+    assert resp.status_code == 200
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+    assert STAGE_SECONDS.count(stage="upload_read") == before["upload_read"] + 2
+    assert STAGE_SECONDS.count(stage="extract_text") == before["extract_text"] + 2
+    assert STAGE_SECONDS.count(stage="evaluate") == before["evaluate"] + 1
+    assert _value(text, "recruiter_sessions") >= 1
+    assert _value(text, "recruiter_session_candidates") >= 1
+    assert "# TYPE recruiter_llm_json_replies_total counter" in text
+    assert 'recruiter_pipeline_stage_seconds_count{stage="evaluate"}' in text
@@ -0,0 +1,51 @@
+"""
+Tests for the opt-in per-request sampling profiler.
+"""
+import os
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.profiling import PROFILE_ID_HEADER, ProfilingMiddleware
+
+
+def _busy_handler_work(seconds: float) -> int:
+    end, n = time.perf_counter() + seconds, 0
+    while time.perf_counter() < end:
+        n += 1
+    return n
+
+
+def _client(tmp_path) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/slow")
+    def slow():
+        return {"n": _busy_handler_work(0.1)}
+
+    app.add_middleware(ProfilingMiddleware, directory=str(tmp_path), interval_ms=1)
+    return TestClient(app)
+
+
+def test_flagged_request_writes_folded_profile(tmp_path):
+    client = _client(tmp_path)
+    for kwargs in ({"headers": {"X-Profile": "1"}}, {"params": {"profile": "1"}}):
+        resp = client.get("/slow", **kwargs)
+        assert resp.status_code == 200
+        profile_id = resp.headers[PROFILE_ID_HEADER]
+        path = tmp_path / f"{profile_id}.folded"
+        lines = path.read_text().splitlines()
+        assert lines
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0 and ";" in stack
+        busy = sum(int(l.rsplit(" ", 1)[1]) for l in lines if "test_profiling:_busy_handler_work" in l)
+        assert busy >= 10
+
+
+def test_unflagged_request_is_untouched(tmp_path):
+    resp = _client(tmp_path).get("/slow")
+    assert resp.status_code == 200
+    assert PROFILE_ID_HEADER not in resp.headers
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,129 @@
+"""
+Tests for the keyset-paginated ranking query over resumes/evaluations/approvals.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models
+from app.database import Base
+from app.services.ranking import InvalidCursor, encode_cursor, rank_candidates, rank_candidates_async, ranking_query
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def seed(db, n=25):
+    job, other = models.Job(job_title="Dev"), models.Job(job_title="Other")
+    db.add_all([job, other])
+    db.flush()
+    for i in range(n):
+        resume = models.Resume(job_id=job.id, name=f"C{i}", email=f"c{i}@x.com")
+        resume.evaluation = models.Evaluation(total_score=(i * 7) % 10 * 10, verdict="Yes")
+        if i % 3 == 0:
+            resume.approval = models.Approval(final_decision="Interview")
+        db.add(resume)
+    db.add(models.Resume(job_id=job.id, name="Unscored"))
+    db.add(models.Resume(job_id=other.id, name="Elsewhere", evaluation=models.Evaluation(total_score=100)))
+    db.commit()
+    return job.id
+
+
+def count_statements(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *a: statements.append(a[2]))
+    return statements
+
+
+def test_ranked_by_score_then_id(db):
+    job_id = seed(db)
+    page = rank_candidates(db, job_id, limit=100)
+    keys = [(-c.total_score, c.candidate_id) for c in page.candidates]
+    assert keys == sorted(keys)
+    assert len(page.candidates) == 25
+    assert page.next_cursor is None
+    assert {c.name for c in page.candidates}.isdisjoint({"Unscored", "Elsewhere"})
+    assert page.candidates[0].final_decision in ("Interview", None)
+
+
+def test_keyset_pages_cover_everything_once_with_one_query_each(db):
+    job_id = seed(db)
+    everything = [c.candidate_id for c in rank_candidates(db, job_id, limit=100).candidates]
+
+    statements = count_statements(db)
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = rank_candidates(db, job_id, limit=4, cursor=cursor)
+        seen += [c.candidate_id for c in page.candidates]
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == everything
+    assert len(statements) == pages
+
+
+@pytest.mark.parametrize("cursor", [None, encode_cursor(50, 10)])
+@pytest.mark.parametrize("decision", [None, "Interview"])
+def test_pages_read_the_ranking_index_without_sorting(db, cursor, decision):
+    job_id = seed(db)
+    assert db.query(models.Evaluation).filter_by(job_id=job_id).count() == 25   # job_id copied on insert
+    stmt = ranking_query(job_id, 10, cursor, decision).compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+    plan = " | ".join(row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {stmt}")))
+    assert "ix_evaluations_job_id_total_score_resume_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_evaluation_inserted_by_resume_id_gets_its_job(db):
+    job_id = seed(db, n=2)
+    resume = models.Resume(job_id=job_id, name="Late")
+    db.add(resume)
+    db.commit()
+    db.add(models.Evaluation(resume_id=resume.id, total_score=5))
+    db.commit()
+    evaluation = db.query(models.Evaluation).filter_by(resume_id=resume.id).one()
+    assert evaluation.job_id == job_id
+
+
+def test_decision_filter(db):
+    job_id = seed(db)
+    page = rank_candidates(db, job_id, limit=100, decision="Interview")
+    assert len(page.candidates) == 9
+    assert all(c.final_decision == "Interview" for c in page.candidates)
+
+
+def test_bad_cursor(db):
+    with pytest.raises(InvalidCursor):
+        rank_candidates(db, 1, cursor="nope")
+
+
+def test_async_variant_matches(tmp_path):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    url = f"sqlite:///{tmp_path}/rank.db"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(sync_engine)
+    with sessionmaker(bind=sync_engine)() as session:
+        job_id = seed(session, n=10)
+        expected = rank_candidates(session, job_id, limit=3).to_dict()
+    sync_engine.dispose()
+
+    async def scenario():
+        engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+        async with AsyncSession(engine) as session:
+            page = await rank_candidates_async(session, job_id, limit=3)
+        await engine.dispose()
+        return page.to_dict()
+
+    assert asyncio.run(scenario()) == expected
@@ -0,0 +1,70 @@
+"""
+Tests for orjson responses, negotiated compression and ?compact= payloads.
+"""
+import gzip
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.main import app, SESSION_STORE
+from app.responses import brotli, negotiate_encoding
+from app.services.session_store import CandidateTable, SessionData
+
+client = TestClient(app)
+
+
+def make_session(n: int = 50) -> str:
+    rows = [{
+        "candidate_id": str(uuid.uuid4()), "filename": f"c{i}.pdf", "name": f"C {i}",
+        "email": f"c{i}@example.com", "experience_years": 3, "skills": ["Python", "SQL"],
+        "education": "B.Sc.", "total_score": 60 + i % 30, "skill_score": 30, "experience_score": 15,
+        "project_score": 10, "education_score": 7, "role_score": 10, "verdict": "Yes",
+        "flags": "", "reasoning": "Solid candidate with most required skills present.",
+        "decision": "Interview",
+    } for i in range(n)]
+    sid = str(uuid.uuid4())
+    SESSION_STORE[sid] = SessionData("Dev", {"required_skills": ["Python"]}, CandidateTable(rows))
+    return sid
+
+
+def test_negotiate_encoding_prefers_brotli_and_honours_q():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("br, gzip") == ("br" if brotli else "gzip")
+
+
+def test_large_session_is_gzipped():
+    sid = make_session()
+    resp = client.get(f"/session/{sid}", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert len(resp.json()["candidates"]) == 50
+
+
+def test_small_response_is_not_compressed():
+    resp = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in resp.headers
+
+
+def test_compact_mode_drops_reasoning_and_skills_unless_included():
+    sid = make_session(3)
+    compact = client.get(f"/session/{sid}?compact=true").json()["candidates"][0]
+    assert "reasoning" not in compact and "skills" not in compact
+    assert compact["total_score"] >= 60
+
+    with_skills = client.get(f"/session/{sid}?compact=true&include=skills").json()["candidates"][0]
+    assert with_skills["skills"] == ["Python", "SQL"]
+    assert "reasoning" not in with_skills
+
+    full = client.get(f"/session/{sid}").json()["candidates"][0]
+    assert full["reasoning"]
+
+
+def test_gzip_round_trip_matches_identity_body():
+    sid = make_session()
+    raw = client.get(f"/session/{sid}", headers={"Accept-Encoding": "identity"}).content
+    streamed = client.stream("GET", f"/session/{sid}", headers={"Accept-Encoding": "gzip"})
+    with streamed as resp:
+        compressed = b"".join(resp.iter_raw())
+    assert gzip.decompress(compressed) == raw
@@ -0,0 +1,60 @@
+"""
+Tests for the columnar CandidateTable backing SESSION_STORE.
+"""
+import uuid
+
+from app.services.session_store import CandidateTable, SessionData
+
+
+def make_candidate(name, total, verdict="Yes", decision="Interview", exp=3, skills=("Python",)):
+    return {
+        "candidate_id": str(uuid.uuid4()), "filename": f"{name}.pdf", "name": name,
+        "email": f"{name}@example.com", "experience_years": exp, "skills": list(skills),
+        "education": "B.Sc.", "total_score": total, "skill_score": 30, "experience_score": 15,
+        "project_score": 10, "education_score": 7, "role_score": 10, "verdict": verdict,
+        "flags": "", "reasoning": "Good fit.", "decision": decision,
+    }
+
+
+def test_round_trip_preserves_public_shape():
+    c = make_candidate("ann", 72, exp=None, skills=("Python", "SQL"))
+    table = CandidateTable([c])
+    assert table.to_list() == [c]
+    assert list(table.row_dict(0)) == list(c)
+
+
+def test_sort_is_stable_and_insert_keeps_ties_after_existing():
+    a, b, c = make_candidate("a", 70), make_candidate("b", 90), make_candidate("c", 70)
+    table = CandidateTable([a, b, c])
+    assert [x["name"] for x in table] == ["b", "a", "c"]
+    table.insert_ranked(table.append(make_candidate("d", 70)))
+    table.insert_ranked(table.append(make_candidate("e", 95)))
+    assert [x["name"] for x in table] == ["e", "b", "a", "c", "d"]
+
+
+def test_filters_counts_and_overrides():
+    rows = [
+        make_candidate("a", 85, "Strong Yes", "Interview"),
+        make_candidate("b", 55, "Maybe", "Hold"),
+        make_candidate("c", 40, "No", "Reject"),
+        make_candidate("d", 66, "Yes", "Interview"),
+    ]
+    session = SessionData("Dev", {}, CandidateTable(rows))
+    table = session.candidates
+    assert table.count_decisions() == {"Interview": 2, "Hold": 1, "Reject": 1}
+    assert [table.text(r, "name") for r in table.ranked_rows(decision="Interview")] == ["a", "d"]
+    assert [table.text(r, "name") for r in table.ranked_rows(verdict="Maybe")] == ["b"]
+
+    row = table.find(rows[2]["candidate_id"])
+    table.set_decision(row, "Hold", overridden=True)
+    assert session.to_dict()["overrides"] == {rows[2]["candidate_id"]: "Hold"}
+    assert table.count_decisions()["Hold"] == 2
+    assert table.find("not-a-uuid") is None
+
+
+def test_experience_strings_are_coerced_or_kept():
+    table = CandidateTable([
+        make_candidate("a", 80, exp="5"), make_candidate("b", 70, exp=" 3.5 "),
+        make_candidate("c", 60, exp="5+"), make_candidate("d", 50, exp=None),
+    ])
+    assert [r["experience_years"] for r in table] == [5, 3.5, "5+", None]
@@ -0,0 +1,177 @@
+"""
+Tests for the in-memory session flow: /analyze, /override and session re-ranking.
+LLM and PDF calls are mocked where app.main / app.services.analysis import them.
+"""
+import asyncio
+import io
+import json
+import time
+
+import httpx
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from app.main import app, SESSION_STORE
+
+client = TestClient(app)
+
+MOCK_JD_CRITERIA = {
+    "required_skills": ["Python", "FastAPI"],
+    "nice_to_have_skills": ["Docker"],
+    "min_experience": 2,
+    "max_experience": 6,
+    "role_level": "Mid",
+}
+
+PARSED = {
+    "alice.pdf": {"name": "Alice", "email": "alice@example.com", "total_experience_years": 5,
+                  "skills": ["Python", "FastAPI"], "education": "B.Sc. CS"},
+    "bob.pdf":   {"name": "Bob", "email": "bob@example.com", "total_experience_years": 1,
+                  "skills": ["Java"], "education": "B.E."},
+    "cara.pdf":  {"name": "Cara", "email": "cara@example.com", "total_experience_years": 3,
+                  "skills": ["Python"], "education": "M.Sc."},
+}
+
+
+def _evaluation(total: int) -> dict:
+    verdict = "Strong Yes" if total >= 80 else "Yes" if total >= 65 else "Maybe" if total >= 50 else "No"
+    return {
+        "skill_score": 0, "experience_score": 0, "project_score": 0,
+        "education_score": 0, "role_score": 0, "total_score": total,
+        "verdict": verdict, "flags": "", "reasoning": "",
+    }
+
+
+def fake_parse_resume(text, filename="resume"):
+    return PARSED[filename]
+
+
+def fake_evaluate(criteria, candidate, filename="resume"):
+    # Score = 40 + 20 per required skill the candidate has
+    hits = len(set(criteria["required_skills"]) & set(candidate["skills"]))
+    return _evaluation(40 + 20 * hits)
+
+
+def run_analyze(filenames=("alice.pdf", "bob.pdf")):
+    with (
+        patch("app.services.analysis.extract_text", return_value="text"),
+        patch("app.services.analysis.parse_jd", return_value=dict(MOCK_JD_CRITERIA)),
+        patch("app.services.analysis.parse_resume", side_effect=fake_parse_resume),
+        patch("app.services.analysis.evaluate_candidate", side_effect=fake_evaluate),
+    ):
+        resp = client.post(
+            "/analyze",
+            data={"job_title": "Backend Dev"},
+            files=[("jd_pdf", ("jd.pdf", io.BytesIO(b"%PDF"), "application/pdf"))]
+            + [("resumes", (f, io.BytesIO(b"%PDF"), "application/pdf")) for f in filenames],
+        )
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def test_analyze_ranks_candidates():
+    data = run_analyze()
+    assert [c["name"] for c in data["candidates"]] == ["Alice", "Bob"]
+    assert data["candidates"][0]["decision"] == "Interview"
+    assert data["candidates"][1]["decision"] == "Reject"
+    assert data["session_id"] in SESSION_STORE
+
+
+def test_override_updates_decision():
+    data = run_analyze()
+    bob = data["candidates"][1]
+    resp = client.post("/override", json={
+        "session_id": data["session_id"], "candidate_id": bob["candidate_id"], "decision": "Hold",
+    })
+    assert resp.status_code == 200
+    session = client.get(f"/session/{data['session_id']}").json()
+    assert session["candidates"][1]["decision"] == "Hold"
+
+
+def test_rerank_with_edited_criteria_reorders_without_reparse():
+    data = run_analyze()
+    sid = data["session_id"]
+    alice_id = data["candidates"][0]["candidate_id"]
+    client.post("/override", json={"session_id": sid, "candidate_id": alice_id, "decision": "Hold"})
+
+    with (
+        patch("app.main.parse_resume") as mock_parse,
+        patch("app.main.evaluate_candidate", side_effect=fake_evaluate),
+    ):
+        resp = client.post(
+            f"/session/{sid}/rerank",
+            data={"criteria": json.dumps({"required_skills": ["Java"]})},
+        )
+    assert resp.status_code == 200
+    mock_parse.assert_not_called()
+    body = resp.json()
+    assert body["criteria"]["required_skills"] == ["Java"]
+    assert body["criteria"]["role_level"] == "Mid"
+    assert [c["name"] for c in body["candidates"]] == ["Bob", "Alice"]
+    # Alice's recruiter override survives the drop to "No"; Bob follows his new verdict
+    assert body["candidates"][1]["verdict"] == "No"
+    assert body["candidates"][1]["decision"] == "Hold"
+    assert body["candidates"][0]["verdict"] == "Maybe"
+    assert body["candidates"][0]["decision"] == "Hold"
+
+
+def test_rerank_rejects_bad_criteria():
+    sid = run_analyze()["session_id"]
+    resp = client.post(f"/session/{sid}/rerank", data={"criteria": json.dumps({"min_experience": "lots"})})
+    assert resp.status_code == 400
+
+
+def test_rerank_missing_session():
+    resp = client.post("/session/nope/rerank", data={"criteria": "{}"})
+    assert resp.status_code == 404
+
+
+def test_append_resumes_merges_by_score_and_keeps_overrides():
+    data = run_analyze()
+    sid = data["session_id"]
+    bob_id = data["candidates"][1]["candidate_id"]
+    client.post("/override", json={"session_id": sid, "candidate_id": bob_id, "decision": "Interview"})
+
+    with (
+        patch("app.services.analysis.extract_text", return_value="text"),
+        patch("app.services.analysis.parse_jd") as mock_jd,
+        patch("app.services.analysis.parse_resume", side_effect=fake_parse_resume),
+        patch("app.services.analysis.evaluate_candidate", side_effect=fake_evaluate),
+    ):
+        resp = client.post(
+            f"/session/{sid}/resumes",
+            files=[("resumes", ("cara.pdf", io.BytesIO(b"%PDF"), "application/pdf"))],
+        )
+    assert resp.status_code == 200
+    mock_jd.assert_not_called()
+    body = resp.json()
+    assert body["added"] == 1
+    assert [c["name"] for c in body["candidates"]] == ["Alice", "Cara", "Bob"]
+    assert body["candidates"][2]["decision"] == "Interview"
+
+
+def test_append_during_rerank_is_scored_against_the_new_criteria():
+    sid = run_analyze()["session_id"]
+
+    def slow_evaluate(criteria, candidate, filename="resume"):
+        time.sleep(0.05)
+        return fake_evaluate(criteria, candidate, filename)
+
+    async def both():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+            return await asyncio.gather(
+                ac.post(f"/session/{sid}/rerank", data={"criteria": json.dumps({"required_skills": ["Java"]})}),
+                ac.post(f"/session/{sid}/resumes",
+                        files=[("resumes", ("cara.pdf", io.BytesIO(b"%PDF"), "application/pdf"))]),
+            )
+
+    with (
+        patch("app.services.analysis.extract_text", return_value="text"),
+        patch("app.services.analysis.parse_resume", side_effect=fake_parse_resume),
+        patch("app.services.analysis.evaluate_candidate", side_effect=slow_evaluate),
+        patch("app.main.evaluate_candidate", side_effect=slow_evaluate),
+    ):
+        rerank, append = asyncio.run(both())
+    assert rerank.status_code == append.status_code == 200
+    scores = {c["name"]: c["total_score"] for c in client.get(f"/session/{sid}").json()["candidates"]}
+    assert scores == {"Bob": 60, "Alice": 40, "Cara": 40}   # all three scored for required_skills=["Java"]
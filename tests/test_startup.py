@@ -0,0 +1,41 @@
+"""
+Tests for lazy SDK loading and the startup warm-up hook.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.lazy import LazyModule
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_importing_the_app_does_not_load_heavy_sdks():
+    code = ("import sys, app.main; "
+            "print(int('google.generativeai' in sys.modules), int('pdfplumber' in sys.modules))")
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "TALENT_POOL_PATH": ""}
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout.split()
+    assert out == ["0", "0"]
+
+
+def test_lazy_module_loads_on_first_attribute():
+    mod = LazyModule("colorsys")
+    assert not mod.loaded
+    assert mod.rgb_to_hsv(1, 0, 0)[0] == 0
+    assert mod.loaded
+
+
+def test_lifespan_blocking_warm_up(monkeypatch):
+    calls = []
+    monkeypatch.setattr(main.settings, "WARM_UP", "blocking")
+    monkeypatch.setattr(main.pdf_service, "warm_up", lambda: calls.append("pdf"))
+    monkeypatch.setattr(main.llm_service, "warm_up", lambda: calls.append("llm"))
+    monkeypatch.setitem(main.WARM, "done", False)
+    with TestClient(main.app) as client:
+        assert calls == ["pdf", "llm"]
+        assert client.get("/health").json()["warm"] is True
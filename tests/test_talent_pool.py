@@ -0,0 +1,116 @@
+"""
+Tests for the cross-session talent pool and its /talent-pool/match endpoint.
+"""
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.main import app
+from app.services import talent_pool
+from app.services.talent_pool import TalentPool, normalize_skill
+
+client = TestClient(app)
+
+CANDIDATES = [
+    {"name": "Jane Doe", "email": "jane@example.com", "experience_years": 4,
+     "skills": ["Python", "FastAPI", "Docker"], "education": "B.Sc. CS", "filename": "jane.pdf"},
+    {"name": "Raj Patel", "email": "raj@example.com", "experience_years": 9,
+     "skills": ["python", "PyTorch", "SQL"], "education": "M.Tech. ML", "filename": "raj.pdf"},
+    {"name": "Ann Lee", "email": "", "experience_years": None,
+     "skills": ["React", "JavaScript"], "education": "B.E.", "filename": "ann.pdf"},
+]
+
+
+def test_normalize_skill():
+    assert normalize_skill("  Machine   Learning ") == "machine learning"
+
+
+def test_match_ranks_by_required_hits():
+    pool = TalentPool()
+    pool.add_many(CANDIDATES, session_id="s1", job_title="Dev")
+    ranked = pool.match(["Python", "TensorFlow/PyTorch"], nice_to_have_skills=["Docker"])
+    assert [c["name"] for c in ranked] == ["Raj Patel", "Jane Doe"]
+    assert ranked[0]["required_matched"] == 2
+    assert ranked[1]["nice_matched"] == 1
+
+
+def test_match_within_experience_filters_buckets():
+    pool = TalentPool()
+    pool.add_many(CANDIDATES)
+    ranked = pool.match(["Python"], min_experience=2, max_experience=6, within_experience=True)
+    assert [c["name"] for c in ranked] == ["Jane Doe"]
+
+
+def test_upsert_reindexes_same_candidate():
+    pool = TalentPool()
+    pool.add_many(CANDIDATES[:1])
+    pool.add_many([{**CANDIDATES[0], "skills": ["Go"]}])
+    assert len(pool) == 1
+    assert pool.match(["Python"]) == []
+    assert pool.match(["go"])[0]["name"] == "Jane Doe"
+
+
+def test_pool_replays_log(tmp_path):
+    path = str(tmp_path / "pool.jsonl")
+    TalentPool(path).add_many(CANDIDATES)
+    reloaded = TalentPool(path)
+    assert len(reloaded) == 3
+    assert reloaded.match(["React"])[0]["name"] == "Ann Lee"
+
+
+def test_log_is_compacted_when_mostly_superseded(tmp_path):
+    path = tmp_path / "pool.jsonl"
+    with patch.object(talent_pool, "COMPACT_MIN_LINES", 6):
+        pool = TalentPool(str(path))
+        for _ in range(5):   # the same three people re-added again and again
+            pool.add_many(CANDIDATES)
+        assert len(path.read_text().splitlines()) <= 6
+        reloaded = TalentPool(str(path))
+    assert len(reloaded) == 3 and reloaded.match(["React"])[0]["name"] == "Ann Lee"
+
+
+def test_oversized_log_is_compacted_on_load(tmp_path):
+    path = tmp_path / "pool.jsonl"
+    TalentPool(str(path)).add_many(CANDIDATES * 4)   # 12 lines, 3 candidates
+    with patch.object(talent_pool, "COMPACT_MIN_LINES", 6):
+        assert len(TalentPool(str(path))) == 3
+    assert len(path.read_text().splitlines()) == 3
+
+
+@pytest.fixture
+def pool():
+    """A fresh in-memory pool for the endpoint, whatever earlier tests added to the global one."""
+    fresh = TalentPool(path="")
+    with patch.object(main, "TALENT_POOL", fresh):
+        yield fresh
+
+
+def test_match_endpoint_uses_criteria(pool):
+    pool.add_many(CANDIDATES[:2], session_id="s-endpoint")
+    resp = client.post("/talent-pool/match", json={"required_skills": ["FastAPI"], "limit": 5})
+    assert resp.status_code == 200
+    assert resp.json()["candidates"][0]["email"] == "jane@example.com"
+
+
+def test_match_endpoint_requires_criteria():
+    resp = client.post("/talent-pool/match", json={})
+    assert resp.status_code == 400
+
+
+def test_match_endpoint_coerces_experience_bounds(pool):
+    pool.add_many(CANDIDATES[:2], session_id="s-endpoint")
+    body = {"required_skills": ["Python"], "within_experience": True}
+    resp = client.post("/talent-pool/match", json={**body, "min_experience": "5", "max_experience": 10})
+    assert [c["name"] for c in resp.json()["candidates"]] == ["Raj Patel"]
+    assert client.post("/talent-pool/match", json={**body, "min_experience": "3+"}).status_code == 400
+
+    criteria = {"required_skills": ["Python"], "min_experience": "3+", "max_experience": "5"}
+    main.SESSION_STORE["s-odd"] = main.SessionData("Dev", criteria, main.CandidateTable([]))
+    try:
+        resp = client.post("/talent-pool/match", json={"session_id": "s-odd", "within_experience": True})
+    finally:
+        main.SESSION_STORE.pop("s-odd")
+    assert resp.status_code == 200   # unusable LLM value is ignored, "5" still caps the range
+    assert [c["name"] for c in resp.json()["candidates"]] == ["Jane Doe"]
@@ -0,0 +1,122 @@
+"""
+Tests for LLM token accounting and per-request token budgets.
+"""
+import io
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.config import Settings
+from app.main import app
+from app.services import llm_service
+from app.services.token_usage import (
+    BudgetExhausted, TokenBudget, TokenLedger, estimate_tokens, token_scope, usage_from_reply,
+)
+
+client = TestClient(app)
+
+JD = b"Backend role: Python, SQL and Docker required. 2-5 years."
+
+
+def _files(n):
+    files = [("jd_pdf", ("jd.txt", io.BytesIO(JD), "text/plain"))]
+    files += [
+        ("resumes", (f"p{i}.txt", io.BytesIO(f"Person {i}\np{i}@example.com\n{i + 2} years Python, SQL".encode()),
+                     "text/plain"))
+        for i in range(n)
+    ]
+    return files
+
+
+def test_usage_prefers_metadata_then_estimates():
+    meta = SimpleNamespace(prompt_token_count=12, candidates_token_count=5)
+    assert usage_from_reply(SimpleNamespace(text="{}", usage_metadata=meta), "p" * 100) == (12, 5, False)
+    assert usage_from_reply(SimpleNamespace(text="x" * 9), "p" * 100) == (25, 3, True)
+    assert estimate_tokens("") == 0
+
+
+def test_ledger_rolls_up_by_label_day_and_scope():
+    ledger = TokenLedger()
+    budget = TokenBudget(100)
+    with token_scope("s1", budget):
+        ledger.record("RESUME", 40, 10)
+        ledger.record("EVAL", 30, 5, estimated=True)
+    ledger.record("EVAL", 1, 1)   # outside any scope
+    s1 = ledger.scope("s1")
+    assert s1["total"]["total_tokens"] == 85 and s1["total"]["calls"] == 2
+    assert s1["by_label"]["EVAL"]["estimated_calls"] == 1
+    assert ledger.day()["total"]["total_tokens"] == 87
+    assert ledger.summary()["by_label"]["EVAL"]["calls"] == 2
+    assert budget.spent == 85 and not budget.exhausted
+
+
+def test_ledger_keeps_the_most_recent_scopes():
+    ledger = TokenLedger(keep_scopes=2)
+    for key in ("a", "b", "a", "c"):
+        with token_scope(key):
+            ledger.record("EVAL", 10, 1)
+    assert ledger.scope("a")["total"]["calls"] == 2 and ledger.scope("c")["total"]["calls"] == 1
+    assert ledger.scope("b")["total"]["calls"] == 0   # least recently used, dropped
+
+
+def test_analyze_reports_session_usage(fake_llm):
+    resp = client.post("/analyze", data={"job_title": "Backend"}, files=_files(2))
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["token_usage"]["calls"] == 5          # 1 JD + 2 × (parse + eval)
+    assert body["token_usage"]["total_tokens"] > 0
+    assert "token_budget" not in body
+
+    usage = client.get("/usage/tokens", params={"session_id": body["session_id"]}).json()
+    assert set(usage["by_label"]) == {"JD", "RESUME", "EVAL"}
+    assert client.get(f"/session/{body['session_id']}").json()["token_usage"]["total"] == usage["total"]
+    assert client.get("/usage/tokens").json()["today"]["total"]["calls"] >= 5
+
+
+def test_budget_switches_to_local_scoring(fake_llm):
+    with patch.object(llm_service.settings, "TOKEN_BUDGET_MODE", "local"):
+        resp = client.post("/analyze", data={"job_title": "Backend"}, files=_files(4),
+                           params={"token_budget": 1})
+    body = resp.json()
+    assert resp.status_code == 200 and body["total_candidates"] == 4
+    assert body["token_usage"]["calls"] == 1          # only the JD reached the model
+    assert body["token_budget"]["exhausted"] and body["token_budget"]["skipped_calls"] == 8
+    row = body["candidates"][0]
+    assert row["flags"] == llm_service.LOCAL_FLAG
+    assert {"Python", "SQL"} <= set(row["skills"]) and row["email"].endswith("@example.com")
+    assert row["skill_score"] == round(40 * 2 / 3)
+
+
+def test_budget_stop_mode_skips_remaining_resumes(fake_llm):
+    with patch.object(llm_service.settings, "TOKEN_BUDGET_MODE", "stop"):
+        resp = client.post("/analyze", data={"job_title": "Backend"}, files=_files(3),
+                           params={"token_budget": 1})
+    body = resp.json()
+    assert body["total_candidates"] == 0
+    assert [e["filename"] for e in body["errors"]] == ["p0.txt", "p1.txt", "p2.txt"]
+    assert all(e["error"].startswith("Skipped: Token budget") for e in body["errors"])
+
+
+def test_evaluate_raises_in_stop_mode_but_serves_cache():
+    llm_service._EVAL_CACHE.clear()
+    criteria = {"required_skills": ["Python"], "min_experience": 1, "max_experience": 3}
+    with patch.object(llm_service, "_demo", return_value=False):
+        with patch.object(llm_service, "_call_gemini", return_value={k: 5 for k in llm_service.EVAL_SCORE_KEYS}):
+            llm_service.evaluate_candidate(criteria, {"skills": ["Python"]})
+        budget = TokenBudget(1, mode="stop")
+        budget.charge(1)
+        with token_scope("s", budget):
+            assert llm_service.evaluate_candidate(criteria, {"skills": ["Python"]})["total_score"] == 25
+            with pytest.raises(BudgetExhausted):
+                llm_service.evaluate_candidate(criteria, {"skills": ["Go"]})
+
+
+@pytest.mark.parametrize("field, value", [
+    ("TOKEN_BUDGET_MODE", "stopp"), ("LLM_BREAKER_POLICY", "ignore"), ("WARM_UP", "lazy"),
+])
+def test_unknown_modes_are_rejected_at_settings_load(field, value):
+    with pytest.raises(ValidationError, match=field):
+        Settings(GEMINI_API_KEY="x", **{field: value})
@@ -0,0 +1,107 @@
+"""
+Tests for span tracing through /analyze and the OTLP/JSON exporters.
+"""
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import tracing
+from app.main import app
+from app.services import llm_service
+from app.tracing import FileExporter, InMemoryExporter, parse_traceparent, span
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def exporter():
+    exp = InMemoryExporter()
+    tracing.configure(exp)
+    yield exp
+    tracing.configure(None)
+
+
+def _files(n):
+    files = [("jd_pdf", ("jd.txt", io.BytesIO(b"Backend: Python, SQL, Docker"), "text/plain"))]
+    files += [("resumes", (f"r{i}.txt", io.BytesIO(f"R {i}\n3 years Python".encode()), "text/plain"))
+              for i in range(n)]
+    return files
+
+
+def test_analyze_span_tree(exporter, fake_llm):
+    parent = "00-" + "ab" * 16 + "-" + "cd" * 8 + "-01"
+    resp = client.post("/analyze", data={"job_title": "Dev"}, files=_files(2), headers={"traceparent": parent})
+    assert resp.status_code == 200
+    trace_id = resp.headers["X-Trace-Id"]
+    assert trace_id == "ab" * 16
+
+    spans = [s for s in exporter.spans if s.trace_id == trace_id]
+    by_id = {s.span_id: s for s in spans}
+    root = next(s for s in spans if s.kind == tracing.KIND_SERVER)
+    assert root.name == "POST /analyze" and root.parent_id == "cd" * 8
+    assert root.attributes["http.status_code"] == 200 and root.attributes["resumes"] == 2
+
+    resumes = [s for s in spans if s.name == "resume"]
+    assert [s.attributes["filename"] for s in resumes] == ["r0.txt", "r1.txt"]
+    for r in resumes:
+        children = {s.name for s in spans if s.parent_id == r.span_id}
+        assert children == {"upload_read", "extract_text", "parse_resume", "evaluate"}
+        assert r.parent_id == root.span_id
+
+    evaluate = next(s for s in spans if s.name == "evaluate")
+    assert evaluate.attributes["cache_hit"] is False and evaluate.attributes["prompt_chars"] > 0
+    call = next(s for s in spans if s.name == "llm_call" and by_id[s.parent_id].name == "parse_resume")
+    assert call.attributes["label"] == "RESUME" and call.attributes["tokens"] > 0
+    assert all(s.end_ns >= s.start_ns for s in spans)
+
+
+def test_retries_are_recorded_on_the_stage_span(exporter):
+    replies = iter(['{"name": "A"', '{"name": "A", "skills": []}'])   # first reply is unusable
+    model = type("M", (), {"generate_content": lambda self, p: type("R", (), {"text": next(replies)})()})()
+    with patch.object(llm_service, "_model", model), span("root"):
+        with span("parse_resume") as stage:
+            llm_service._call_gemini("prompt", "RESUME", required=("name", "skills"))
+    assert stage.attributes["retries"] == 1
+    calls = [s for s in exporter.spans if s.name == "llm_call"]
+    assert [c.error is not None for c in calls] == [True, False]
+
+
+def test_file_exporter_writes_one_otlp_line_per_trace(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracing.configure(FileExporter(str(path)))
+    try:
+        with span("root", job="x"):
+            with span("child", n=3, hit=True, ratio=0.5):
+                pass
+    finally:
+        tracing.configure(None)
+    (line,) = path.read_text().splitlines()
+    spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    child, root = spans
+    assert child["parentSpanId"] == root["spanId"] and "parentSpanId" not in root
+    assert {a["key"]: a["value"] for a in child["attributes"]} == {
+        "n": {"intValue": "3"}, "hit": {"boolValue": True}, "ratio": {"doubleValue": 0.5},
+    }
+
+
+def test_in_memory_exporter_keeps_the_latest_spans():
+    exp = InMemoryExporter(max_spans=2)
+    exp.export(["a", "b"])
+    exp.export(["c"])
+    assert list(exp.spans) == ["b", "c"]
+
+
+def test_disabled_tracing_is_a_noop():
+    with span("x") as s:
+        s.set_attribute("a", 1)
+    assert s is tracing.NOOP_SPAN
+    assert "X-Trace-Id" not in client.get("/health").headers
+
+
+def test_parse_traceparent():
+    assert parse_traceparent("00-" + "1" * 32 + "-" + "2" * 16 + "-01") == ("1" * 32, "2" * 16)
+    assert parse_traceparent("00-" + "0" * 32 + "-" + "2" * 16 + "-01") is None
+    assert parse_traceparent("garbage") is None